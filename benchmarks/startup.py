@@ -0,0 +1,61 @@
+import argparse
+import subprocess
+import sys
+
+# modules a packing process needs, and modules it must not load
+CORE_MODULES = ['py3dbp.item', 'py3dbp.bin', 'py3dbp.packer']
+HEAVY_MODULES = ['matplotlib', 'mpl_toolkits', 'pandas']
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, ' '.join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(module: str) -> tuple[float, list[str]]:
+    """
+    Imports a module in a fresh interpreter.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        tuple: The import time in seconds and the heavy modules it loaded.
+    """
+    output = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                            capture_output=True, text=True, check=True).stdout.split()
+    return float(output[0]), output[1:]
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Checks that the packing core imports within a time budget and without the visualization dependencies.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Defaults to `sys.argv`.
+
+    Returns:
+        int: 0 if every module is within budget, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget', type=float, default=0.3, help='seconds allowed per import')
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters per module, the best run counts')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in CORE_MODULES:
+        runs = [measure(module) for _ in range(args.repeat)]
+        elapsed = min(seconds for seconds, _ in runs)
+        loaded = sorted({name for _, names in runs for name in names})
+        ok = elapsed <= args.budget and not loaded
+        failed = failed or not ok
+        print('{:<16} {:7.3f}s  {}{}'.format(module, elapsed, 'ok' if ok else 'FAIL',
+                                             '  loaded ' + ', '.join(loaded) if loaded else ''))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
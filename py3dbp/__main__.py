@@ -0,0 +1,42 @@
+import argparse
+import json
+import sys
+
+from .batch import pack_orders, read_orders
+
+
+def main(argv: list[str] = None):
+    """
+    Packs orders read as JSONL or CSV and writes the results as NDJSON.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Defaults to `sys.argv`.
+    """
+    parser = argparse.ArgumentParser(prog='python -m py3dbp', description=main.__doc__.strip().splitlines()[0])
+    parser.add_argument('input', nargs='?', default='-', help="order file, '-' for stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="result file, '-' for stdout (default)")
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'],
+                        help="order format, guessed from the input file extension by default")
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help="worker processes, 0 packs in this process (default: CPU count)")
+    parser.add_argument('-c', '--chunksize', type=int, default=64, help="orders sent to a worker at once")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help="chunks in flight at once (default: twice the workers)")
+    args = parser.parse_args(argv)
+
+    format = args.format or ('csv' if args.input.endswith('.csv') else 'jsonl')
+    source = sys.stdin if args.input == '-' else open(args.input, newline='')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        results = pack_orders(read_orders(source, format), args.workers, args.chunksize, args.max_pending)
+        for result in results:
+            target.write(json.dumps(result) + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == '__main__':
+    main()
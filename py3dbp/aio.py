@@ -0,0 +1,180 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+
+
+class PackCancelled(Exception):
+    """
+    Raised inside a packing run when its job was cancelled.
+    """
+
+
+class _Throttle:
+    """
+    A progress hook forwarding at most one event per interval, plus the last event of every bin.
+    """
+
+    def __init__(self, send, interval: float, cancelled: threading.Event = None):
+        self.send = send
+        self.interval = interval
+        self.cancelled = cancelled
+        self.last = 0.0
+
+    def __call__(self, bin_index: int, attempted: int, total: int):
+        if self.cancelled is not None and self.cancelled.is_set():
+            raise PackCancelled()
+        now = time.monotonic()
+        if attempted == total or now - self.last >= self.interval:
+            self.last = now
+            self.send((bin_index, attempted, total))
+
+
+def _pack_in_process(packer, kwargs: dict, interval: float, conn):
+    """
+    Packs in a child process, sending progress events and the result through a pipe.
+
+    Args:
+        packer (Packer): A copy of the packer.
+        kwargs (dict): The `pack` options.
+        interval (float): Minimum seconds between two progress events.
+        conn (Connection): The child end of the pipe.
+    """
+    try:
+        packer.pack(progress=_Throttle(lambda event: conn.send(('progress', event)), interval), **kwargs)
+        conn.send(('done', packer))
+    except Exception as e:
+        conn.send(('error', e))
+    finally:
+        conn.close()
+
+
+class PackJob:
+    """
+    A class to run `Packer.pack` off the event loop.
+
+    A job is awaitable, returning the packer once packed, and asynchronously
+    iterable, yielding progress events until the packing ends.
+    """
+
+    _END = object()
+
+    def __init__(self, packer, executor: str = 'thread', progress_interval: float = 0.1, kwargs: dict = None):
+        """
+        Initializes a PackJob object and starts packing.
+
+        Args:
+            packer (Packer): The packer holding the bins and items.
+            executor (str): 'thread' to pack in a worker thread, 'process' to pack in a child process.
+            progress_interval (float): Minimum seconds between two progress events.
+            kwargs (dict, optional): The `pack` options.
+        """
+        if executor not in ('thread', 'process'):
+            raise ValueError("unknown executor: {}".format(executor))
+        self.packer = packer
+        self.executor = executor
+        self.progress_interval = progress_interval
+        self.kwargs = kwargs or {}
+        self.loop = asyncio.get_running_loop()
+        self.events = asyncio.Queue()
+        self.cancelled = threading.Event()
+        self.task = self.loop.create_task(self._run())
+
+    def __await__(self):
+        return self.task.__await__()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self.events.get()
+        if event is self._END:
+            self.events.put_nowait(self._END)
+            raise StopAsyncIteration
+        return event
+
+    def cancel(self) -> bool:
+        """
+        Cancels the job.
+
+        Returns:
+            bool: True if the job was still running.
+        """
+        return self.task.cancel()
+
+    def _emit(self, event):
+        """
+        Queues a progress event from any thread.
+        """
+        self.loop.call_soon_threadsafe(self.events.put_nowait, event)
+
+    async def _run(self):
+        """
+        Packs with the configured executor and returns the packer.
+        """
+        try:
+            if self.executor == 'thread':
+                await self._run_thread()
+            else:
+                await self._run_process()
+            return self.packer
+        finally:
+            self.events.put_nowait(self._END)
+
+    async def _run_thread(self):
+        """
+        Packs in the loop's default thread pool. On cancellation the packing
+        stops at the next progress hook.
+        """
+        hook = _Throttle(self._emit, self.progress_interval, self.cancelled)
+        future = self.loop.run_in_executor(None, lambda: self.packer.pack(progress=hook, **self.kwargs))
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            try:
+                await future
+            except PackCancelled:
+                pass
+            raise
+
+    async def _run_process(self):
+        """
+        Packs in a child process. On cancellation the process is terminated.
+        The packer receives the packed copies of its bins and items.
+        """
+        context = multiprocessing.get_context()
+        parent, child = context.Pipe(duplex=False)
+        process = context.Process(target=_pack_in_process,
+                                  args=(self.packer, self.kwargs, self.progress_interval, child), daemon=True)
+        process.start()
+        child.close()
+        outcome = self.loop.create_future()
+
+        def read():
+            try:
+                while True:
+                    kind, payload = parent.recv()
+                    if kind == 'progress':
+                        self._emit(payload)
+                    else:
+                        break
+            except EOFError:
+                kind, payload = 'error', RuntimeError('packing process exited unexpectedly')
+            self.loop.call_soon_threadsafe(lambda: outcome.done() or outcome.set_result((kind, payload)))
+
+        reader = threading.Thread(target=read, daemon=True)
+        reader.start()
+        try:
+            kind, payload = await outcome
+        except asyncio.CancelledError:
+            process.terminate()
+            raise
+        finally:
+            await self.loop.run_in_executor(None, process.join)
+            await self.loop.run_in_executor(None, reader.join)
+            parent.close()
+
+        if kind == 'error':
+            raise payload
+        vars(self.packer).update(vars(payload))
@@ -0,0 +1,193 @@
+import csv
+import json
+import os
+from collections import OrderedDict
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+from .packer import Packer
+from .serialization import bin_from_dict, item_from_dict, to_dict
+from .session import PackSession
+
+PACK_OPTIONS = ['bigger_first', 'distribute_items', 'fix_point', 'check_stable', 'support_surface_ratio', 'binding',
+                'placement', 'score', 'beam_width', 'pivot_restart', 'bin_selection']
+
+# sessions kept per worker process, keyed by the bins of the order
+MAX_SESSIONS = 64
+_sessions = OrderedDict()
+
+
+def read_orders(stream: TextIO, format: str = 'jsonl') -> Iterator[dict]:
+    """
+    Reads orders one per line, each with its bins, items and packing options.
+
+    A JSONL order looks like
+    `{"id": "A1", "bins": [{"name": "box", "whd": [30, 10, 15], "max_weight": 99}],
+    "items": [{"partno": "p1", "whd": [9, 8, 7], "weight": 1}], "options": {"bigger_first": true}}`.
+    A CSV order has the columns `id,bins,items,options`, with JSON in the last three.
+
+    A line that cannot be read does not stop the stream: it is yielded as
+    `{"id": None, "line": <line number>, "error": <message>}`, which
+    `pack_order` passes through as its result.
+
+    Args:
+        stream (TextIO): The input stream.
+        format (str): Either 'jsonl' or 'csv'.
+
+    Yields:
+        dict: The orders, in file order.
+    """
+    if format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            try:
+                yield {
+                    'id': row.get('id'),
+                    'bins': json.loads(row['bins']),
+                    'items': json.loads(row['items']),
+                    'options': json.loads(row['options']) if row.get('options') else {},
+                }
+            except (KeyError, TypeError, json.JSONDecodeError) as e:
+                yield _read_error(reader.line_num, e, row.get('id'))
+    elif format == 'jsonl':
+        for number, line in enumerate(stream, 1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield _read_error(number, e)
+    else:
+        raise ValueError("unknown order format: {}".format(format))
+
+
+def _read_error(line: int, error: Exception, order_id: str = None) -> dict:
+    """
+    Builds the record of an order that could not be read.
+
+    Args:
+        line (int): The line number in the input.
+        error (Exception): The parsing error.
+        order_id (str, optional): The order id, when it could be read.
+
+    Returns:
+        dict: The error record.
+    """
+    return {'id': order_id, 'line': line, 'error': '{}: {}'.format(type(error).__name__, error)}
+
+
+def _session(bins: list[dict]) -> PackSession:
+    """
+    Returns the session of this process for a set of empty bins, creating it on first use.
+
+    Args:
+        bins (list[dict]): The bins of an order.
+
+    Returns:
+        PackSession: The session.
+    """
+    key = json.dumps(bins, sort_keys=True)
+    session = _sessions.get(key)
+    if session is None:
+        session = _sessions[key] = PackSession([bin_from_dict(bin) for bin in bins])
+        if len(_sessions) > MAX_SESSIONS:
+            _sessions.popitem(last=False)
+    _sessions.move_to_end(key)
+    return session
+
+
+def pack_order(order: dict) -> dict:
+    """
+    Packs a single order. Never raises: an order that cannot be packed,
+    including a value that is not an order at all, gives an error result.
+
+    Orders whose bins are empty are packed in a session reused by later
+    orders with the same bins.
+
+    Args:
+        order (dict): The order, as read by `read_orders`.
+
+    Returns:
+        dict: The serialized packing result tagged with the order id, or the
+        error message if the order could not be packed.
+    """
+    order_id = order.get('id') if isinstance(order, dict) else None
+    if isinstance(order, dict) and 'error' in order and 'items' not in order:
+        # an order `read_orders` could not read
+        return dict(order)
+    try:
+        if not isinstance(order, dict):
+            raise TypeError("an order must be an object, not {}".format(type(order).__name__))
+        items = [item_from_dict(item) for item in order['items']]
+        options = order.get('options') or {}
+        options = {key: options[key] for key in PACK_OPTIONS if key in options}
+        if any(bin.get('items') or bin.get('unfitted_items') for bin in order['bins']):
+            packer = Packer()
+            packer.add_bins([bin_from_dict(bin) for bin in order['bins']])
+            packer.add_items(items)
+            packer.pack(**options)
+        else:
+            packer = _session(order['bins']).solve(items, **options)
+        result = to_dict(packer.bins, packer.unfit_items)
+    except Exception as e:
+        return {'id': order_id, 'error': '{}: {}'.format(type(e).__name__, e)}
+    result['id'] = order_id
+    return result
+
+
+def pack_chunk(orders: list[dict]) -> list[dict]:
+    """
+    Packs a chunk of orders in one worker call.
+
+    Args:
+        orders (list[dict]): The orders.
+
+    Returns:
+        list[dict]: The results, in the order of the chunk.
+    """
+    return [pack_order(order) for order in orders]
+
+
+def pack_orders(orders: Iterable[dict], workers: int = None, chunksize: int = 64,
+                max_pending: int = None) -> Iterator[dict]:
+    """
+    Packs a stream of orders across a process pool.
+
+    Orders are sent to the workers in chunks and at most `max_pending` chunks
+    are in flight at once, so memory stays bounded however long the input is.
+    Results are yielded as soon as their chunk completes.
+
+    Args:
+        orders (Iterable[dict]): The orders.
+        workers (int, optional): The number of worker processes, 0 packs in this process. Defaults to the CPU count.
+        chunksize (int): The number of orders sent to a worker at once.
+        max_pending (int, optional): The maximum number of chunks in flight. Defaults to twice the workers.
+
+    Yields:
+        dict: The results, in completion order.
+    """
+    orders = iter(orders)
+    chunks = iter(lambda: list(islice(orders, chunksize)), [])
+
+    if workers == 0:
+        for chunk in chunks:
+            yield from pack_chunk(chunk)
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    workers = workers or os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 2 * workers
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(pack_chunk, chunk))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
@@ -0,0 +1,202 @@
+import copy
+import time
+
+import numpy as np
+
+from .bin import Bin
+from .bounds import volume_upper_bound
+from .item import Item
+from .placement import SCORES, rank_placements
+
+
+class BinState:
+    """
+    A class to hold the geometry of a partly packed bin in preallocated arrays,
+    so that a search can clone it with a few memory copies instead of copying
+    `Item` objects.
+    """
+
+    def __init__(self, bin: Bin, capacity: int):
+        """
+        Initializes a BinState object from a bin and what it already holds.
+
+        Args:
+            bin (Bin): The bin.
+            capacity (int): The number of items the state can receive.
+        """
+        count = len(bin.fit_items)
+        self.bounds = np.array([bin.width, bin.height, bin.depth], dtype=float)
+        self.max_weight = bin.max_weight
+        self.rows = np.empty((count + capacity, 6))
+        self.rows[:count] = bin.fit_items
+        self.stackable = np.ones(count + capacity, dtype=bool)
+        self.stackable[1:count] = [item.stackable for item in bin.items]
+        self.count = count
+        self.placed = np.empty(capacity, dtype=np.int32)
+        self.rotations = np.empty(capacity, dtype=np.int8)
+        self.placed_count = 0
+        self.weight = bin.get_total_weight()
+        self.free_volume = float(bin.get_volume()) - float(np.prod(bin.fit_items[1:, 1::2] - bin.fit_items[1:, 0::2],
+                                                                   axis=1).sum())
+        self.volume = 0.0
+
+    def clone(self):
+        """
+        Copies the state.
+
+        Returns:
+            BinState: An independent copy.
+        """
+        state = copy.copy(self)
+        state.rows = self.rows.copy()
+        state.stackable = self.stackable.copy()
+        state.placed = self.placed.copy()
+        state.rotations = self.rotations.copy()
+        return state
+
+    def place(self, index: int, item: Item, position: list[float], rotation: int):
+        """
+        Records the placement of an item.
+
+        Args:
+            index (int): The index of the item in the searched item list.
+            item (Item): The item.
+            position (list[float]): Its position.
+            rotation (int): Its rotation type.
+        """
+        w, h, d = item.get_dimension(rotation)
+        x, y, z = position
+        self.rows[self.count] = [x, x + w, y, y + h, z, z + d]
+        self.stackable[self.count] = item.stackable
+        self.count += 1
+        self.placed[self.placed_count] = index
+        self.rotations[self.placed_count] = rotation
+        self.placed_count += 1
+        self.weight += item.weight
+        self.volume += float(item.get_volume())
+        self.free_volume -= float(item.get_volume())
+
+    def key(self) -> bytes:
+        """
+        Returns a key equal for states holding the same boxes in the same places.
+
+        Returns:
+            bytes: The key.
+        """
+        return self.rows[:self.count].tobytes()
+
+
+def volume_bound(state: BinState, remaining_volume: float) -> float:
+    """
+    Bounds the volume a state can reach: what it holds plus what is left to
+    decide, capped by its free space.
+
+    Args:
+        state (BinState): The state.
+        remaining_volume (float): The volume of the items not yet decided.
+
+    Returns:
+        float: The optimistic packed volume.
+    """
+    return state.volume + min(state.free_volume, remaining_volume)
+
+
+def beam_fill(bin: Bin, items: list[Item], beam_width: int = 8, expand: int = 3, fix_point: bool = True,
+              check_stable: bool = True, support_surface_ratio: float = 0.75, score: str = 'height',
+              deadline: float = None, progress=None) -> int:
+    """
+    Fills a bin with a beam search over placement decisions.
+
+    Items are decided in order. Every state of the beam is expanded with the
+    `expand` best placements of the next item, as ranked by `rank_placements`,
+    and with leaving the item out. The `beam_width` children with the best
+    bound on their final packed volume are kept, more packed volume breaking
+    ties. The best final state is then committed to the bin and the items it
+    left out go to `bin.unfitted_items`.
+
+    When a deadline is given the beam narrows as soon as the remaining items
+    would not be searched in time at the current width, down to a greedy
+    best-fit, and stops at the deadline with the best state so far. The
+    search also stops, with every item decided, once a state packs as much
+    volume as `bounds.volume_upper_bound` allows.
+
+    Args:
+        bin (Bin): The bin to fill.
+        items (list[Item]): The items, in the order to decide them.
+        beam_width (int): The number of states kept.
+        expand (int): The number of placements tried per state and item.
+        fix_point (bool): If True, settles items and applies the stacking rules.
+        check_stable (bool): If True, applies the support rules.
+        support_surface_ratio (float): Minimum acceptable surface support ratio.
+        score (str): The placement score, one of `placement.SCORES`.
+        deadline (float, optional): The `time.monotonic()` value to stop at.
+        progress (callable, optional): Called as `progress(attempted, total)` after each item.
+
+    Returns:
+        int: The number of items decided, less than `len(items)` if the deadline was reached.
+    """
+    if score not in SCORES:
+        raise ValueError("unknown placement score: {}".format(score))
+    bin.fix_point = fix_point
+    bin.check_stable = check_stable
+    bin.support_surface_ratio = support_surface_ratio
+    if bin.corner != 0 and not bin.items:
+        for i, corner in enumerate(bin.add_corners()):
+            bin.put_corner(i, corner)
+
+    remaining = np.cumsum([float(item.get_volume()) for item in items][::-1])[::-1].tolist() + [0.0]
+    target = float(volume_upper_bound(items, bin))
+    beam = [BinState(bin, len(items))]
+    per_state = None
+    attempted = 0
+    for index, item in enumerate(items):
+        if deadline is not None:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            # narrow the beam when the remaining items would not be searched in time at the last step's pace
+            if per_state:
+                beam_width = max(1, min(beam_width, int((deadline - now) / (per_state * (len(items) - index)))))
+                beam = beam[:beam_width]
+
+        children = []
+        start = time.monotonic()
+        for state in beam:
+            if state.weight + item.weight <= state.max_weight:
+                for position, rotation in rank_placements(
+                        state.rows[:state.count], state.stackable[:state.count], state.bounds, item, fix_point,
+                        check_stable, support_surface_ratio, score, expand):
+                    child = state.clone()
+                    child.place(index, item, position, rotation)
+                    children.append(child)
+            children.append(state)
+        per_state = (time.monotonic() - start) / len(beam)
+
+        seen = set()
+        beam = []
+        for child in sorted(children, key=lambda state: (volume_bound(state, remaining[index + 1]), state.volume),
+                            reverse=True):
+            key = child.key()
+            if key not in seen:
+                seen.add(key)
+                beam.append(child)
+                if len(beam) == beam_width:
+                    break
+        attempted = index + 1
+        # no state can pack more: the items left are out
+        done = max(state.volume for state in beam) >= target - 1e-9
+        if done:
+            attempted = len(items)
+        if progress is not None:
+            progress(attempted, len(items))
+        if done:
+            break
+
+    best = max(beam, key=lambda state: state.volume)
+    first = best.count - best.placed_count
+    for row, index, rotation in zip(best.rows[first:best.count], best.placed[:best.placed_count].tolist(),
+                                    best.rotations[:best.placed_count].tolist()):
+        bin.load_items([items[index].placed_at(row[0::2].tolist(), rotation)])
+    placed = set(best.placed[:best.placed_count].tolist())
+    bin.unfitted_items.extend(item for index, item in enumerate(items[:attempted]) if index not in placed)
+    return attempted
@@ -1,11 +1,12 @@
-import copy
-
 import numpy as np
 
-from .auxiliary_methods import intersect, rect_overlap
+from .auxiliary_methods import box_intersect, rect_overlap
 from .constants import Type
 from .item import Item
 
+# rows preallocated for `fit_items`, the buffer doubles when full
+FIT_CAPACITY = 32
+
 
 class Bin:
     """
@@ -30,7 +31,22 @@ class Bin:
         self.max_weight = max_weight
         self.corner = corner
         self.items = []
-        self.fit_items = np.array([[0, whd[0], 0, whd[1], 0, 0]])
+        self.total_weight = 0
+        self._fit_buffer = np.empty((FIT_CAPACITY, 6))
+        self._fit_count = 0
+        self._corners = None
+        self._log = None
+        # bumped by every change of the placed items, see `failed_searches`
+        self.version = 0
+        # search keys that failed at `_failed_version`, and search key -> where the last search succeeded
+        self.failed_searches = set()
+        self._failed_version = 0
+        self.last_pivots = {}
+        # (dimension, pivot) -> (settled pivot, lower and upper corner of the region the settling looked at)
+        self._settled = {}
+        self.settle_hits = 0
+        self.settle_misses = 0
+        self.fit_items = [[0, whd[0], 0, whd[1], 0, 0]]
         self.unfitted_items = []
         self.fix_point = False
         self.check_stable = False
@@ -50,6 +66,63 @@ class Bin:
             f"max_weight:{self.max_weight}) vol({self.get_volume()})"
         )
 
+    @property
+    def fit_items(self) -> np.ndarray:
+        """
+        Returns the [x0, x1, y0, y1, z0, z1] rows of the floor and of the placed items.
+
+        Returns:
+            np.ndarray: A view of the bin's row buffer, valid until the bin is cleared.
+        """
+        return self._fit_buffer[:self._fit_count]
+
+    @fit_items.setter
+    def fit_items(self, rows):
+        self._fit_count = 0
+        self._append_fit_rows(rows)
+        self._settled.clear()
+
+    def _append_fit_rows(self, rows):
+        """
+        Appends rows to `fit_items`, growing the row buffer when it is full.
+
+        Args:
+            rows (array-like): The [x0, x1, y0, y1, z0, z1] rows.
+        """
+        rows = np.asarray(rows, dtype=float).reshape(-1, 6)
+        count = self._fit_count + len(rows)
+        if count > len(self._fit_buffer):
+            buffer = np.empty((max(count, 2 * len(self._fit_buffer)), 6))
+            buffer[:self._fit_count] = self._fit_buffer[:self._fit_count]
+            self._fit_buffer = buffer
+        self._fit_buffer[self._fit_count:count] = rows
+        self._fit_count = count
+        self.version += 1
+
+    def search_failed(self, key) -> bool:
+        """
+        Checks whether a search already failed against the current state of the bin.
+
+        Args:
+            key (tuple): The search key: the item signature and the placement options.
+
+        Returns:
+            bool: True if the same search failed since the last change of the placed items.
+        """
+        return self._failed_version == self.version and key in self.failed_searches
+
+    def fail_search(self, key):
+        """
+        Records a failed search. The failures recorded at an older version are dropped.
+
+        Args:
+            key (tuple): The search key: the item signature and the placement options.
+        """
+        if self._failed_version != self.version:
+            self.failed_searches.clear()
+            self._failed_version = self.version
+        self.failed_searches.add(key)
+
     def get_volume(self):
         """
         Calculates the volume of the bin.
@@ -61,18 +134,126 @@ class Bin:
 
     def get_total_weight(self):
         """
-        Calculates the total weight of the items in the bin.
+        Returns the total weight of the items in the bin, kept up to date as items are put and removed.
 
         Returns:
             float: The total weight of the items in the bin.
         """
-        total_weight = sum(item.weight for item in self.items)
-        return total_weight
+        return self.total_weight
+
+    def _add_items(self, items: list[Item], rows):
+        """
+        Appends placed items and their `fit_items` rows, logging the change while a checkpoint is open.
+
+        Args:
+            items (list[Item]): The placed items.
+            rows (array-like): Their [x0, x1, y0, y1, z0, z1] rows.
+        """
+        if self._log is not None:
+            self._log.append(('add', len(items), self.total_weight))
+        self.items.extend(items)
+        self._append_fit_rows(rows)
+        self._forget_settled(rows)
+        for item in items:
+            self.total_weight += item.weight
+
+    def checkpoint(self) -> int:
+        """
+        Starts recording changes so that the bin can be rolled back to its current state.
+
+        Checkpoints nest: a later checkpoint can be rolled back or committed
+        while an earlier one stays open.
+
+        Returns:
+            int: The token to pass to `rollback` or `commit`.
+        """
+        if self._log is None:
+            self._log = []
+        self._log.append(('checkpoint', self.unfitted_items, len(self.unfitted_items), self.version,
+                          set(self.failed_searches), self._failed_version))
+        return len(self._log) - 1
+
+    def rollback(self, token: int):
+        """
+        Undoes every change made since a checkpoint, in time proportional to the
+        changes undone. The checkpoint stays open.
+
+        Args:
+            token (int): The token returned by `checkpoint`.
+        """
+        log = self._log
+        while len(log) > token + 1:
+            entry = log.pop()
+            if entry[0] == 'add':
+                _, count, self.total_weight = entry
+                del self.items[len(self.items) - count:]
+                self._fit_count -= count
+            elif entry[0] == 'remove':
+                _, index, item, row_index, row, self.total_weight = entry
+                self.items.insert(index, item)
+                self._append_fit_rows(row)
+                self._fit_buffer[row_index + 1:self._fit_count] = self._fit_buffer[row_index:self._fit_count - 1]
+                self._fit_buffer[row_index] = row
+            elif entry[0] == 'clear':
+                _, self.items, rows, self.total_weight = entry
+                self.fit_items = rows
+        _, unfitted_items, count, self.version, failed_searches, self._failed_version = log[token]
+        del unfitted_items[count:]
+        self.unfitted_items = unfitted_items
+        # the bin is back in the state of the checkpoint, and so are the searches that failed against it
+        self.failed_searches = set(failed_searches)
+        self._settled.clear()
+
+    def commit(self, token: int):
+        """
+        Keeps the changes made since a checkpoint and closes it. Recording stops
+        once the outermost checkpoint is committed.
+
+        Args:
+            token (int): The token returned by `checkpoint`.
+        """
+        if token == 0:
+            self._log = None
+
+    def remove_items(self, items: list[Item]) -> list[Item]:
+        """
+        Takes placed items out of the bin, with their `fit_items` rows.
+
+        Args:
+            items (list[Item]): The items to remove, matched by id.
+
+        Returns:
+            list[Item]: The removed placed items.
+        """
+        ids = {item.id for item in items}
+        removed = []
+        for index in range(len(self.items) - 1, -1, -1):
+            item = self.items[index]
+            if item.id not in ids:
+                continue
+            w, h, d = item.get_dimension()
+            x, y, z = item.position
+            row = np.array([x, x + w, y, y + h, z, z + d], dtype=float)
+            row_index = int(np.flatnonzero((self.fit_items == row).all(axis=1))[-1])
+            if self._log is not None:
+                self._log.append(('remove', index, item, row_index, row, self.total_weight))
+            del self.items[index]
+            self._fit_buffer[row_index:self._fit_count - 1] = self._fit_buffer[row_index + 1:self._fit_count]
+            self._fit_count -= 1
+            self.total_weight -= item.weight
+            self.version += 1
+            self._forget_settled(row)
+            removed.append(item)
+        removed.reverse()
+        return removed
 
     def put_item(self, item: Item, pivot: list[int, int, int]):
         """
         Attempts to place an item in the bin at the specified pivot point.
 
+        Neither the item nor the pivot is modified: the bin stores a placed copy
+        of the item, so the same items can be probed in several bins at once.
+
         Args:
             item (Item): The item to be placed in the bin.
             pivot (list): The pivot point for placing the item.
@@ -82,19 +263,17 @@ class Bin:
         """
 
         fit = False
-        valid_item_position = item.position
-        item.position = pivot
+        pivot = list(pivot)
 
         for rotation in item.rotations:
-            item.rotation = rotation
-            dimension = item.get_dimension()
+            dimension = item.get_dimension(rotation)
 
             if self._exceed_boundaries(dimension, pivot):
                 continue
 
             fit = True
             for current_item_in_bin in self.items:
-                if intersect(current_item_in_bin, item):
+                if box_intersect(current_item_in_bin.position, current_item_in_bin.get_dimension(), pivot, dimension):
                     fit = False
                     break
 
@@ -106,38 +285,20 @@ class Bin:
                     dimension, pivot = self._adjust_pivot(dimension, pivot)
 
                     if self. _check_overlap(dimension, pivot, item.stackable):
-                        item.position = valid_item_position
                         return False
 
                     if self.check_stable:
                         if not self._check_stability(dimension, pivot):
-                            item.position = valid_item_position
                             return False
 
-                self.fit_items = np.append(
-                    self.fit_items,
-                    np.array([
-                        [pivot[0], pivot[0] + dimension[0],
-                         pivot[1], pivot[1] + dimension[1],
-                         pivot[2], pivot[2] + dimension[2]]
-                    ]),
-                    axis=0
-                )
-
-                item.position = [
-                    pivot[0],
-                    pivot[1],
-                    pivot[2]
-                ]
-                if fit:
-                    self.items.append(copy.deepcopy(item))
-
-            else:
-                item.position = valid_item_position
+                self._add_items([item.placed_at(pivot, rotation)], [
+                    pivot[0], pivot[0] + dimension[0],
+                    pivot[1], pivot[1] + dimension[1],
+                    pivot[2], pivot[2] + dimension[2]
+                ])
 
             return fit
 
-        item.position = valid_item_position
         return fit
 
     def _exceed_weight_limit(self, item: Item):
@@ -172,6 +333,9 @@ class Bin:
         """
         Adjusts the pivot point based on the dimensions of the item.
 
+        Settled pivots are cached until an item is put in or taken out of the
+        region their settling looked at, see `settle_stats`.
+
         Args:
             dimension (list): The dimensions of the item.
             pivot (list): The pivot point for placing the item.
@@ -179,6 +343,16 @@ class Bin:
         Returns:
             tuple: The adjusted dimensions and pivot point.
         """
+        key = (tuple(dimension), tuple(pivot))
+        cached = self._settled.get(key)
+        if cached is not None:
+            self.settle_hits += 1
+            pivot[:] = cached[0]
+            return dimension, pivot
+        self.settle_misses += 1
+
+        lo = list(pivot)
+        hi = [pivot[i] + dimension[i] for i in range(3)]
         for _ in range(3):
             pivot[1] = self.check_height([
                 pivot[0], pivot[0] + dimension[0],
@@ -195,8 +369,50 @@ class Bin:
                 pivot[1], pivot[1] + dimension[1],
                 pivot[2], pivot[2] + dimension[2]
             ])
+            for i in range(3):
+                lo[i] = min(lo[i], pivot[i])
+                hi[i] = max(hi[i], pivot[i] + dimension[i])
+        self._settled[key] = (list(pivot), lo, hi)
         return dimension, pivot
 
+    def _forget_settled(self, rows):
+        """
+        Drops the cached settled pivots that a box put in or taken out can change.
+
+        Each `check_*` step scans the whole axis it moves along, among the boxes
+        overlapping the item on the two other axes. A box can only change a
+        settling if it overlaps the region the settling looked at on two axes.
+
+        Args:
+            rows (array-like): The [x0, x1, y0, y1, z0, z1] rows of the boxes.
+        """
+        if not self._settled:
+            return
+        for row in np.asarray(rows, dtype=float).reshape(-1, 6).tolist():
+            # integer ranges, as the `check_*` methods compare boxes
+            box = [(int(row[0]), int(row[1])), (int(row[2]), int(row[3])), (int(row[4]), int(row[5]))]
+            stale = [
+                key for key, (_, lo, hi) in self._settled.items()
+                if sum(max(a0, int(l)) < min(a1, int(h)) for (a0, a1), l, h in zip(box, lo, hi)) >= 2
+            ]
+            for key in stale:
+                del self._settled[key]
+
+    def settle_stats(self) -> dict:
+        """
+        Returns the counters of the settled pivot cache.
+
+        Returns:
+            dict: The number of hits and misses, the hit rate and the number of cached pivots.
+        """
+        probes = self.settle_hits + self.settle_misses
+        return {
+            'hits': self.settle_hits,
+            'misses': self.settle_misses,
+            'hit_rate': self.settle_hits / probes if probes else 0.0,
+            'size': len(self._settled),
+        }
+
     def _check_stability(self, dimension: list[int, int, int], pivot: list[int, int, int]):
         """
         Checks the stability of the item at the specified pivot point.
@@ -330,14 +546,17 @@ class Bin:
 
     def add_corners(self) -> list[Item]:
         """
-        Adds corners to the bin.
+        Adds corners to the bin. The corner items are built once and reused
+        every time the bin is filled again.
 
         Returns:
             list: A list of corners.
         """
         if self.corner != 0:
             corner = self.corner
-            return [Item(
+            if self._corners is not None and self._corners[0].width == corner:
+                return self._corners
+            self._corners = [Item(
                 partno='corner{}'.format(i),
                 group='corner',
                 type=Type.CUBE,
@@ -348,6 +567,7 @@ class Bin:
                 loadbear=0,
                 upsidedown=True,
                 color='gray') for i in range(8)]
+            return self._corners
 
     def  _check_overlap(self, dimension: tuple[int, int, int], pivot: list[int, int, int], stackable: bool) -> bool:
         """
@@ -397,17 +617,43 @@ class Bin:
         z = self.depth - self.corner
         pos = [[0, 0, 0], [0, 0, z], [0, y, z], [0, y, 0], [x, y, 0], [x, 0, 0], [x, 0, z], [x, y, z]]
         item.position = pos[index]
-        self.items.append(item)
 
         corner = [float(item.position[0]), float(item.position[0]) + float(self.corner), float(item.position[1]),
                   float(item.position[1]) + float(self.corner), float(item.position[2]),
                   float(item.position[2]) + float(self.corner)]
 
-        self.fit_items = np.append(self.fit_items, np.array([corner]), axis=0)
+        self._add_items([item], corner)
+
+    def load_items(self, items: list[Item], rows: np.ndarray = None):
+        """
+        Puts items that already carry their position and rotation in the bin, as
+        when restoring a saved or cached packing.
+
+        Args:
+            items (list[Item]): The placed items.
+            rows (np.ndarray, optional): Their `fit_items` rows, computed from the items if omitted.
+        """
+        if rows is None:
+            rows = [
+                [item.position[0], item.position[0] + w, item.position[1], item.position[1] + h,
+                 item.position[2], item.position[2] + d]
+                for item in items
+                for w, h, d in [item.get_dimension()]
+            ]
+        if len(rows):
+            self._add_items(items, rows)
 
     def clear_bin(self):
         """
-        Clears the items in the bin.
+        Clears the items in the bin and its search caches, keeping its row buffer for the next fill.
         """
+        if self._log is not None:
+            self._log.append(('clear', self.items, self.fit_items.copy(), self.total_weight))
         self.items = []
-        self.fit_items = np.array([[0, self.width, 0, self.height, 0, 0]])
+        self.total_weight = 0
+        self._fit_buffer[0] = [0, self.width, 0, self.height, 0, 0]
+        self._fit_count = 1
+        self.version += 1
+        self.failed_searches.clear()
+        self.last_pivots.clear()
+        self._settled.clear()
@@ -0,0 +1,217 @@
+import numpy as np
+
+from .bin import Bin
+from .item import Item
+from .placement import WHD_ORDER
+
+
+def _rotated_dims(items: list[Item]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the dimensions of the items in every rotation.
+
+    Args:
+        items (list[Item]): The items.
+
+    Returns:
+        tuple: An (n, 6, 3) array of the dimensions in each `RotationType` and an (n, 6) mask of the allowed ones.
+    """
+    whd = np.array([[item.width, item.height, item.depth] for item in items], dtype=float).reshape(-1, 3)
+    allowed = np.zeros((len(items), len(WHD_ORDER)), dtype=bool)
+    for i, item in enumerate(items):
+        allowed[i, item.rotations] = True
+    return whd[:, WHD_ORDER], allowed
+
+
+def _bin_arrays(bins: list[Bin]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Builds the dimensions, volumes and weight limits of the bins.
+
+    Args:
+        bins (list[Bin]): The bins, or any objects with `width`, `height`, `depth` and `max_weight`.
+
+    Returns:
+        tuple: An (m, 3) array of dimensions, an (m,) array of volumes and an (m,) array of weight limits.
+    """
+    dims = np.array([[bin.width, bin.height, bin.depth] for bin in bins], dtype=float).reshape(-1, 3)
+    return dims, dims.prod(axis=1), np.array([bin.max_weight for bin in bins], dtype=float)
+
+
+def oversized(items: list[Item], bins: list[Bin]) -> np.ndarray:
+    """
+    Finds the items that fit in none of the bins, even alone, in any allowed rotation or by weight.
+
+    Args:
+        items (list[Item]): The items.
+        bins (list[Bin]): The bins.
+
+    Returns:
+        np.ndarray: An (n,) mask of the items no bin can hold.
+    """
+    if not items:
+        return np.zeros(0, dtype=bool)
+    dims, allowed = _rotated_dims(items)
+    bin_dims, _, max_weight = _bin_arrays(bins)
+    weights = np.array([item.weight for item in items], dtype=float)
+    # (items, rotations, bins)
+    inside = np.all(dims[:, :, None, :] <= bin_dims[None, None, :, :], axis=3) & allowed[:, :, None]
+    inside &= weights[:, None, None] <= max_weight[None, None, :]
+    return ~inside.any(axis=(1, 2))
+
+
+def min_bins(capacities: np.ndarray, demand: float) -> int:
+    """
+    Returns the fewest bins whose capacities can add up to a demand, taking the largest first.
+
+    Args:
+        capacities (np.ndarray): The capacity of every bin.
+        demand (float): The total demand.
+
+    Returns:
+        int: The number of bins, `len(capacities) + 1` if all of them are not enough.
+    """
+    if demand <= 0:
+        return 0
+    total = np.cumsum(np.sort(np.asarray(capacities, dtype=float))[::-1])
+    return int(np.searchsorted(total, demand, side='left')) + 1
+
+
+def volume_bound(items: list[Item], bins: list[Bin]) -> int:
+    """
+    Bounds the number of bins needed by the volume of the items.
+
+    Args:
+        items (list[Item]): The items.
+        bins (list[Bin]): The bins available.
+
+    Returns:
+        int: The minimum number of bins.
+    """
+    _, volumes, _ = _bin_arrays(bins)
+    return min_bins(volumes, sum(float(item.get_volume()) for item in items))
+
+
+def weight_bound(items: list[Item], bins: list[Bin]) -> int:
+    """
+    Bounds the number of bins needed by the weight of the items.
+
+    Args:
+        items (list[Item]): The items.
+        bins (list[Bin]): The bins available.
+
+    Returns:
+        int: The minimum number of bins.
+    """
+    _, _, max_weight = _bin_arrays(bins)
+    return min_bins(max_weight, sum(float(item.weight) for item in items))
+
+
+def dimension_bound(items: list[Item], bin: Bin) -> int:
+    """
+    Bounds the number of bins of one size needed by the large items, after
+    Martello, Pisinger and Vigo.
+
+    Two items longer than half the bin on both axes of a face cannot be put
+    side by side on that face, so they are stacked along the third axis: in
+    every bin their extents on that axis add up to at most the bin's. An
+    item counts only if it is that large in every allowed rotation, with
+    its smallest extent on the third axis. The bound of the 1D problem that
+    remains is the larger of the total extent over the bin's and the
+    number of items longer than half of it.
+
+    Args:
+        items (list[Item]): The items.
+        bin (Bin): The bin size.
+
+    Returns:
+        int: The minimum number of bins.
+    """
+    if not items:
+        return 0
+    dims, allowed = _rotated_dims(items)
+    size = np.array([bin.width, bin.height, bin.depth], dtype=float)
+    bound = 0
+    for axis, (a, b) in ((2, (0, 1)), (1, (0, 2)), (0, (1, 2))):
+        large = (dims[:, :, a] > size[a] / 2) & (dims[:, :, b] > size[b] / 2)
+        stacked = np.all(large | ~allowed, axis=1)
+        extent = np.where(allowed, dims[:, :, axis], np.inf).min(axis=1)[stacked]
+        if len(extent):
+            bound = max(bound, int(np.ceil(extent.sum() / size[axis] - 1e-9)),
+                        int(np.count_nonzero(extent > size[axis] / 2)))
+    return bound
+
+
+def lower_bound(items: list[Item], bins: list[Bin]) -> int:
+    """
+    Bounds the number of bins needed to hold the items, leaving out the items
+    that fit in none of the bins. The dimension bound is only used when all
+    the bins have the same size.
+
+    Args:
+        items (list[Item]): The items.
+        bins (list[Bin]): The bins available.
+
+    Returns:
+        int: The minimum number of bins, more than `len(bins)` if they cannot hold the items.
+    """
+    if not bins:
+        return 0 if not items else 1
+    items = [item for item, skip in zip(items, oversized(items, bins)) if not skip]
+    bound = max(volume_bound(items, bins), weight_bound(items, bins))
+    if len({(bin.width, bin.height, bin.depth) for bin in bins}) == 1:
+        bound = max(bound, dimension_bound(items, bins[0]))
+    return bound
+
+
+def volume_upper_bound(items: list[Item], bin: Bin) -> float:
+    """
+    Bounds the volume of items a bin can still receive: its free volume, and
+    the fractional knapsack of the items by volume per weight within the
+    weight it can still take.
+
+    Args:
+        items (list[Item]): The candidate items.
+        bin (Bin): The bin, possibly partly packed.
+
+    Returns:
+        float: The largest volume the bin can receive from the items.
+    """
+    volumes = np.array([float(item.get_volume()) for item in items])
+    weights = np.array([float(item.weight) for item in items])
+    free = float(bin.get_volume()) - sum(float(item.get_volume()) for item in bin.items)
+    room = float(bin.max_weight) - float(bin.get_total_weight())
+    if room < 0 or not len(items):
+        return 0.0
+    weightless = weights <= 0
+    order = np.argsort(-volumes[~weightless] / weights[~weightless], kind='stable')
+    volumes_sorted = volumes[~weightless][order]
+    weights_sorted = weights[~weightless][order]
+    taken = np.cumsum(weights_sorted)
+    full = taken <= room
+    knapsack = volumes[weightless].sum() + volumes_sorted[full].sum()
+    rest = np.flatnonzero(~full)
+    if len(rest):
+        i = rest[0]
+        knapsack += volumes_sorted[i] * (room - (taken[i] - weights_sorted[i])) / weights_sorted[i]
+    return min(max(free, 0.0), float(knapsack))
+
+
+def is_optimal(items: list[Item], bins: list[Bin], bound: int = None) -> bool:
+    """
+    Checks that a packing provably uses the fewest bins: every item any bin
+    can hold is packed, in as many bins as the lower bound.
+
+    Args:
+        items (list[Item]): The items of the order.
+        bins (list[Bin]): The packed bins.
+        bound (int, optional): The `lower_bound` of the items and bins, when already known.
+
+    Returns:
+        bool: True if no packing can use fewer bins.
+    """
+    packed = {item.id for bin in bins for item in bin.items}
+    packable = [item for item, skip in zip(items, oversized(items, bins)) if not skip]
+    if any(item.id not in packed for item in packable):
+        return False
+    if bound is None:
+        bound = lower_bound(items, bins)
+    return sum(1 for bin in bins if any(item.group != 'corner' for item in bin.items)) <= bound
@@ -0,0 +1,255 @@
+import hashlib
+import inspect
+import json
+import os
+from collections import OrderedDict
+
+from .bin import Bin
+from .item import Item
+from .packer import Packer
+
+# defaults of every `Packer.pack` option, so omitted and explicit defaults hash alike
+PACK_DEFAULTS = {
+    name: parameter.default
+    for name, parameter in inspect.signature(Packer.pack).parameters.items()
+    if name != 'self'
+}
+
+# options that do not change the packing and are left out of the fingerprint
+UNHASHED_OPTIONS = {'progress'}
+
+
+def item_signature(item: Item) -> tuple:
+    """
+    Builds the signature of an item from every attribute that affects packing.
+
+    Two items with the same signature are interchangeable: partno, color and id
+    are left out.
+
+    Args:
+        item (Item): The item.
+
+    Returns:
+        tuple: The item's signature.
+    """
+    return (item.type, item.width, item.height, item.depth, item.weight, item.priority, item.loadbear,
+            item.upsidedown, item.stackable, tuple(item.rotations), item.group, tuple(item.position))
+
+
+def bin_signature(bin: Bin) -> tuple:
+    """
+    Builds the signature of an empty bin.
+
+    Args:
+        bin (Bin): The bin.
+
+    Returns:
+        tuple: The bin's signature.
+    """
+    return bin.width, bin.height, bin.depth, bin.max_weight, bin.corner, bin.put_type
+
+
+class PackCache:
+    """
+    A class to cache packing results keyed by a canonical fingerprint of the order.
+
+    Orders are canonicalized by sorting the items and the bins by signature, so
+    a repeat of an order with the items in another order or with other part
+    numbers hits the cache and gets the stored placement remapped onto its own
+    items.
+    """
+
+    def __init__(self, max_size: int = 1024, directory: str = None):
+        """
+        Initializes a PackCache object.
+
+        Args:
+            max_size (int): The maximum number of results kept in memory.
+            directory (str, optional): A directory where results are also stored on disk.
+        """
+        self.max_size = max_size
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'bypassed': 0}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Returns the share of lookups answered from memory or disk.
+
+        Returns:
+            float: The hit rate, 0 before the first lookup.
+        """
+        lookups = self.stats['hits'] + self.stats['disk_hits'] + self.stats['misses']
+        return (self.stats['hits'] + self.stats['disk_hits']) / lookups if lookups else 0.0
+
+    def fingerprint(self, packer: Packer, options: dict) -> tuple[str, list[Item], list[Bin]]:
+        """
+        Canonicalizes the order of a packer.
+
+        Args:
+            packer (Packer): The packer holding the bins and items.
+            options (dict): The complete `Packer.pack` options.
+
+        Returns:
+            tuple: The hash of the order, and its items and bins in canonical order.
+        """
+        items = sorted(packer.items, key=item_signature)
+        bins = sorted(packer.bins, key=bin_signature)
+        canonical = json.dumps([
+            [item_signature(item) for item in items],
+            [bin_signature(bin) for bin in bins],
+            sorted((key, value) for key, value in options.items() if key not in UNHASHED_OPTIONS),
+        ], default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest(), items, bins
+
+    def pack(self, packer: Packer, **options):
+        """
+        Packs the items of a packer, answering from the cache when the same order was packed before.
+
+        Takes the same options as `Packer.pack`. Bins that already hold items
+        and time-limited packings are packed without the cache.
+
+        Args:
+            packer (Packer): The packer holding the bins and items.
+            **options: The `Packer.pack` options.
+        """
+        options = dict(PACK_DEFAULTS, **options)
+        if options['binding'] is None:
+            options['binding'] = []
+
+        # partial results of a time-limited packing are not reproducible
+        if any(bin.items for bin in packer.bins) or options['time_limit'] is not None or options['deadline'] is not None:
+            self.stats['bypassed'] += 1
+            packer.pack(**options)
+            return
+
+        order = list(packer.items)
+        key, items, bins = self.fingerprint(packer, options)
+        entry = self._get(key)
+        if entry is not None:
+            self._restore(packer, entry, items, bins)
+        else:
+            self.stats['misses'] += 1
+            packer.items = items
+            packer.bins = list(bins)
+            packer.total_items = len(items)
+            packer.pack(**options)
+            self._put(key, self._record(packer, items, bins))
+        # the order as it was given, not in canonical order
+        packer.packed_items = order
+
+    def _get(self, key: str):
+        """
+        Looks an entry up in memory, then on disk.
+
+        Args:
+            key (str): The order hash.
+
+        Returns:
+            dict: The stored entry, None on a miss.
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+        if self.directory:
+            path = os.path.join(self.directory, key + '.json')
+            if os.path.exists(path):
+                with open(path) as f:
+                    entry = json.load(f)
+                self.stats['disk_hits'] += 1
+                self._remember(key, entry)
+                return entry
+        return None
+
+    def _put(self, key: str, entry: dict):
+        """
+        Stores an entry in memory and on disk.
+
+        Args:
+            key (str): The order hash.
+            entry (dict): The recorded result.
+        """
+        self._remember(key, entry)
+        if self.directory:
+            path = os.path.join(self.directory, key + '.json')
+            with open(path + '.tmp', 'w') as f:
+                json.dump(entry, f)
+            os.replace(path + '.tmp', path)
+
+    def _remember(self, key: str, entry: dict):
+        """
+        Stores an entry in memory, evicting the least recently used ones beyond `max_size`.
+
+        Args:
+            key (str): The order hash.
+            entry (dict): The recorded result.
+        """
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    @staticmethod
+    def _record(packer: Packer, items: list[Item], bins: list[Bin]) -> dict:
+        """
+        Records a packing result as indexes into the canonical items and bins.
+
+        Args:
+            packer (Packer): The packer after packing.
+            items (list[Item]): The items in canonical order.
+            bins (list[Bin]): The bins in canonical order.
+
+        Returns:
+            dict: The JSON-compatible entry.
+        """
+        item_index = {item.id: idx for idx, item in enumerate(items)}
+        bin_index = {id(bin): idx for idx, bin in enumerate(bins)}
+        return {
+            'bins': [{
+                'bin': bin_index[id(bin)],
+                # corners are recorded by their corner number, items by canonical index
+                'items': [
+                    [None, int(item.partno[len('corner'):]), None, None] if item.group == 'corner'
+                    else [item_index[item.id], None, list(item.position), item.rotation]
+                    for item in bin.items
+                ],
+                'unfitted_items': [item_index[item.id] for item in bin.unfitted_items],
+                'gravity': bin.gravity,
+                'settings': [bin.fix_point, bin.check_stable, bin.support_surface_ratio],
+            } for bin in packer.bins],
+            'unfit_items': [item_index[item.id] for item in packer.unfit_items],
+        }
+
+    def _restore(self, packer: Packer, entry: dict, items: list[Item], bins: list[Bin]):
+        """
+        Applies a recorded result to the items and bins of a packer.
+
+        Args:
+            packer (Packer): The packer holding the bins and items.
+            entry (dict): The recorded result.
+            items (list[Item]): The items in canonical order.
+            bins (list[Bin]): The bins in canonical order.
+        """
+        packer.bins = []
+        for record in entry['bins']:
+            bin = bins[record['bin']]
+            bin.clear_bin()
+            bin.fix_point, bin.check_stable, bin.support_surface_ratio = record['settings']
+            corners = bin.add_corners()
+            for idx, corner, position, rotation in record['items']:
+                if idx is None:
+                    bin.put_corner(corner, corners[corner])
+                    continue
+                bin.load_items([items[idx].placed_at(position, rotation)])
+            bin.unfitted_items = [items[idx] for idx in record['unfitted_items']]
+            bin.gravity = record['gravity']
+            packer.bins.append(bin)
+        packer.unfit_items = [items[idx] for idx in entry['unfit_items']]
+        packer.items = packer.unfit_items
@@ -0,0 +1,223 @@
+import time
+from uuid import uuid4
+
+from .bin import Bin
+from .constants import RotationType, START_POSITION
+from .improve import unplaced
+from .item import Item
+from .placement import SCORES, best_placement
+from .validator import Violation, validate_bin
+
+
+def _new_instance(item: Item) -> Item:
+    """
+    Copies an item as a new instance of the same line, with its own id.
+
+    Args:
+        item (Item): An instance of the line.
+
+    Returns:
+        Item: The new unplaced instance.
+    """
+    instance = item.placed_at(START_POSITION, RotationType.WHD)
+    instance.id = uuid4()
+    return instance
+
+
+def resolve_quantities(packer, quantities: dict) -> tuple[list[Item], set]:
+    """
+    Turns quantity changes into items to add and ids to remove.
+
+    Surplus instances are taken from the unfit items first, then from the
+    placed ones, last placed first. Missing instances copy an existing one.
+
+    Args:
+        packer (Packer): The packed result.
+        quantities (dict): The new number of instances by part number.
+
+    Returns:
+        tuple: The items to add and the ids of the items to remove.
+    """
+    added = []
+    removed = set()
+    for partno, quantity in quantities.items():
+        if quantity < 0:
+            raise ValueError("negative quantity for {}".format(partno))
+        unfit = [item for item in packer.unfit_items if item.partno == partno]
+        placed = [item for bin in packer.bins for item in reversed(bin.items)
+                  if item.partno == partno and item.group != 'corner']
+        instances = unfit + placed
+        if quantity > len(instances):
+            if not instances:
+                raise ValueError("unknown part number: {}".format(partno))
+            added.extend(_new_instance(instances[0]) for _ in range(quantity - len(instances)))
+        else:
+            removed.update(item.id for item in instances[:len(instances) - quantity])
+    return added, removed
+
+
+def take_out(bin: Bin, items: list[Item]) -> list[Item]:
+    """
+    Removes items from a bin together with the items that lose their support,
+    by the rules of `validator.validate_bin`, once they are gone.
+
+    Args:
+        bin (Bin): The bin.
+        items (list[Item]): The items to remove.
+
+    Returns:
+        list[Item]: The removed placed items, the requested ones first.
+    """
+    unsupported = {violation.items[0].id for violation in validate_bin(bin) if violation.kind == Violation.SUPPORT}
+    taken = bin.remove_items(items)
+    while True:
+        falling = [violation.items[0] for violation in validate_bin(bin)
+                   if violation.kind == Violation.SUPPORT and violation.items[0].id not in unsupported]
+        if not falling:
+            return taken
+        taken.extend(bin.remove_items(falling))
+
+
+def _place(bins: list[Bin], item: Item, score: str):
+    """
+    Puts an item at its best placement in the first bin that can hold it.
+
+    Args:
+        bins (list[Bin]): The bins, in the order to try them.
+        item (Item): The item.
+        score (str): The placement score.
+
+    Returns:
+        Bin: The bin the item went to, None if it fits in none.
+    """
+    for bin in bins:
+        found = best_placement(bin, item, score)
+        if found is not None:
+            bin.load_items([item.placed_at(*found)])
+            return bin
+    return None
+
+
+def _repack(bin: Bin, pending: list[Item], score: str) -> list[Item]:
+    """
+    Repacks a bin with pending items, all its movable items taken out and put
+    back largest first. Kept only if every item it held is put back.
+
+    Args:
+        bin (Bin): The bin.
+        pending (list[Item]): The items that found no free space.
+        score (str): The placement score.
+
+    Returns:
+        list[Item]: The pending items still unplaced.
+    """
+    token = bin.checkpoint()
+    held = bin.remove_items([item for item in bin.items if item.group != 'corner'])
+    left = []
+    for item in sorted(held + pending, key=lambda item: item.get_volume(), reverse=True):
+        if _place([bin], item, score) is None:
+            left.append(item)
+    packed = {item.id for item in bin.items}
+    if len(left) >= len(pending) or not all(item.id in packed for item in held):
+        bin.rollback(token)
+        bin.commit(token)
+        return pending
+    bin.commit(token)
+    return left
+
+
+def repack_delta(packer, added: list[Item] = None, removed: list = None, quantities: dict = None,
+                 score: str = 'height', repack: bool = True, time_limit: float = None,
+                 deadline: float = None) -> list[Bin]:
+    """
+    Updates a packed result for an amended order instead of packing it again.
+
+    Placements of the items still ordered are kept. Removed items leave holes
+    and the items that would lose their support are taken out with them, see
+    `take_out`. The taken out items, the added items and the previous
+    unfit items are then inserted largest first into the free space of the
+    bins at their best placement by `score`, the previous unfit items only
+    into the bins that lost items. Only when some still fit
+    nowhere are the bins they could go to repacked, one at a time, keeping
+    every item such a bin held. The items that still fit nowhere are listed
+    in `packer.unfit_items`.
+
+    The work is proportional to the change: untouched bins and placements
+    are not packed again.
+
+    Args:
+        packer (Packer): The result of `pack` with `distribute_items=True`, updated in place.
+        added (list[Item], optional): The new items.
+        removed (list, optional): The items to remove, as items or ids.
+        quantities (dict, optional): The new number of instances by part number, see `resolve_quantities`.
+        score (str): The placement score, one of `placement.SCORES`.
+        repack (bool): Whether to repack bins for the items that find no free space.
+        time_limit (float): Seconds the repacking may take. Once over, the remaining items stay unfit.
+        deadline (float): Same as `time_limit`, as an absolute `time.monotonic()` value.
+
+    Returns:
+        list[Bin]: The bins that changed.
+    """
+    if score not in SCORES:
+        raise ValueError("unknown placement score: {}".format(score))
+    if time_limit is not None:
+        deadline = min(time.monotonic() + time_limit, deadline if deadline is not None else float('inf'))
+    added = list(added or [])
+    removed_ids = {item.id if isinstance(item, Item) else item for item in removed or []}
+    if quantities:
+        more, fewer = resolve_quantities(packer, quantities)
+        added.extend(more)
+        removed_ids.update(fewer)
+
+    changed = []
+    pending = []
+    for bin in packer.bins:
+        gone = [item for item in bin.items if item.id in removed_ids]
+        if not gone:
+            continue
+        taken = take_out(bin, gone)
+        pending.extend(unplaced(item) for item in taken if item.id not in removed_ids)
+        changed.append(bin)
+
+    # items unfit before can only go where items were taken out
+    unfit = [item for item in packer.unfit_items if item.id not in removed_ids]
+    unfit_ids = {item.id for item in unfit}
+    freed = list(changed)
+    left = []
+    for item in sorted(pending + added + unfit, key=lambda item: item.get_volume(), reverse=True):
+        if deadline is not None and time.monotonic() >= deadline:
+            left.append(item)
+            continue
+        bin = _place(freed if item.id in unfit_ids else packer.bins, item, score)
+        if bin is None:
+            left.append(item)
+        elif bin not in changed:
+            changed.append(bin)
+
+    if repack and left:
+        # bins already touched first, then the others that have room for at least one item left
+        smallest = min(float(item.get_volume()) for item in left)
+        lightest = min(item.weight for item in left)
+        for bin in changed + [bin for bin in packer.bins if bin not in changed]:
+            if not left or (deadline is not None and time.monotonic() >= deadline):
+                break
+            free = float(bin.get_volume()) - sum(float(item.get_volume()) for item in bin.items)
+            if free < smallest or bin.get_total_weight() + lightest > bin.max_weight:
+                continue
+            count = len(left)
+            left = _repack(bin, left, score)
+            if len(left) < count and bin not in changed:
+                changed.append(bin)
+
+    # the items left are recorded once, in `packer.unfit_items`
+    packed = {item.id for bin in packer.bins for item in bin.items if item.group != 'corner'}
+    for bin in packer.bins:
+        bin.unfitted_items = [item for item in bin.unfitted_items
+                              if item.id not in packed and item.id not in removed_ids]
+        if bin in changed:
+            bin.gravity = packer.gravity_center(bin)
+    packer.unfit_items = left
+    packer.items = packer.unfit_items
+    packer.total_items = len(packed) + len(left)
+    packer.packed_items = [item for item in packer.packed_items if item.id not in removed_ids] + added
+    return changed
@@ -0,0 +1,303 @@
+import heapq
+import time
+from collections import Counter
+
+from .bin import Bin
+from .bounds import dimension_bound, min_bins, oversized
+from .item import Item
+from .packer import Packer
+
+
+class BinType:
+    """
+    A class to represent a kind of container or truck that can be hired, with its cost.
+    """
+
+    def __init__(self, name: str, whd: tuple[float], max_weight: float, cost: float, corner: int = 0,
+                 count: int = None):
+        """
+        Initializes a BinType object.
+
+        Args:
+            name (str): The name of the type, used to name its bins.
+            whd (tuple[float]): A tuple representing width (W), height (H), and depth (D).
+            max_weight (float): The maximum weight a bin of this type can hold.
+            cost (float): The cost of one bin of this type.
+            corner (int, optional): The corner size of its bins. Defaults to 0.
+            count (int, optional): The number of bins of this type available. Defaults to unlimited.
+        """
+        self.name = name
+        self.whd = tuple(whd)
+        self.width, self.height, self.depth = self.whd
+        self.max_weight = max_weight
+        self.cost = cost
+        self.corner = corner
+        self.count = count
+
+    def __str__(self):
+        return "%s(%sx%sx%s, max_weight:%s) cost(%s)" % (self.name, *self.whd, self.max_weight, self.cost)
+
+    def make(self, index: int) -> Bin:
+        """
+        Builds an empty bin of this type.
+
+        Args:
+            index (int): The number of the bin among the bins of its type.
+
+        Returns:
+            Bin: The bin.
+        """
+        return Bin('{}-{}'.format(self.name, index), self.whd, self.max_weight, self.corner)
+
+    def get_volume(self) -> float:
+        """
+        Calculates the volume of a bin of this type.
+
+        Returns:
+            float: The volume.
+        """
+        return float(self.whd[0]) * float(self.whd[1]) * float(self.whd[2])
+
+    def holds(self, item: Item) -> bool:
+        """
+        Checks that an item, alone, could fit in a bin of this type in one of its allowed rotations.
+
+        Args:
+            item (Item): The item.
+
+        Returns:
+            bool: False if the item is too heavy or too large for this type.
+        """
+        return not oversized([item], [self])[0]
+
+
+def _item_key(item: Item) -> tuple:
+    """
+    Returns what the packer tells identical items apart by: their signature, priority and group.
+
+    Args:
+        item (Item): The item.
+
+    Returns:
+        tuple: The key.
+    """
+    return item.signature(), item.priority, item.group
+
+
+class FleetOracle:
+    """
+    A class to check mixes of bin types by packing them, one bin at a time.
+
+    A mix is packed largest bin first, every bin receiving what the previous
+    ones left. The packing of one bin only depends on the size, weight limit
+    and corners of its type and on the multiset of items it is offered, so it
+    is memoized on them: mixes sharing bins are only packed once up to where
+    they differ.
+    """
+
+    def __init__(self, items: list[Item], options: dict):
+        """
+        Initializes a FleetOracle object.
+
+        Args:
+            items (list[Item]): The items of the order.
+            options (dict): The `Packer.pack` options of every packing.
+        """
+        self.items = items
+        self.options = options
+        self.keys = {item.id: _item_key(item) for item in items}
+        # key -> a representative item, the packings are computed on representatives
+        self.samples = {}
+        for item in items:
+            self.samples.setdefault(self.keys[item.id], item)
+        self.memo = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _pack_one(self, bin_type: BinType, offered: Counter) -> tuple[list, Counter]:
+        """
+        Packs one bin of a type with a multiset of items.
+
+        Args:
+            bin_type (BinType): The type of the bin.
+            offered (Counter): The number of items offered, by key.
+
+        Returns:
+            tuple: The placements as (key, position, rotation) and the items left, by key.
+        """
+        memo_key = (bin_type.whd, bin_type.max_weight, bin_type.corner, frozenset(offered.items()))
+        found = self.memo.get(memo_key)
+        if found is not None:
+            self.hits += 1
+            return found
+        self.misses += 1
+
+        items = []
+        for key in sorted(offered, key=repr):
+            items.extend([self.samples[key]] * offered[key])
+        packer = Packer()
+        packer.add_bin(bin_type.make(0))
+        packer.add_items(items)
+        packer.pack(**self.options)
+        placements = [(self.keys[item.id], item.position, item.rotation)
+                      for item in packer.bins[0].items if item.id in self.keys]
+        left = offered - Counter(key for key, _, _ in placements)
+        self.memo[memo_key] = found = (placements, left)
+        return found
+
+    def check(self, mix: list[BinType]) -> bool:
+        """
+        Checks whether a mix of bin types holds every item.
+
+        Args:
+            mix (list[BinType]): The bin types, one entry per bin.
+
+        Returns:
+            bool: True if the packing of the mix leaves no item out.
+        """
+        left = Counter(self.keys.values())
+        for bin_type in sorted(mix, key=lambda bin_type: bin_type.get_volume(), reverse=True):
+            if not left:
+                break
+            _, left = self._pack_one(bin_type, left)
+        return not left
+
+    def build(self, mix: list[BinType]) -> Packer:
+        """
+        Packs the order into a mix of bin types, with the memoized packings.
+
+        Args:
+            mix (list[BinType]): The bin types, one entry per bin.
+
+        Returns:
+            Packer: A packer holding the bins and the unfit items.
+        """
+        pool = {}
+        for item in self.items:
+            pool.setdefault(self.keys[item.id], []).append(item)
+        left = Counter(self.keys.values())
+        numbers = Counter()
+        packer = Packer()
+        for bin_type in sorted(mix, key=lambda bin_type: bin_type.get_volume(), reverse=True):
+            numbers[bin_type.name] += 1
+            bin = bin_type.make(numbers[bin_type.name])
+            packer.add_bin(bin)
+            placements, left = self._pack_one(bin_type, left)
+            if bin.corner:
+                for i, corner in enumerate(bin.add_corners()):
+                    bin.put_corner(i, corner)
+            bin.load_items([pool[key].pop().placed_at(position, rotation) for key, position, rotation in placements])
+            bin.gravity = packer.gravity_center(bin)
+        packer.unfit_items = [item for items in pool.values() for item in items]
+        packer.items = packer.unfit_items
+        packer.total_items = len(self.items)
+        packer.packed_items = self.items
+        return packer
+
+
+def _bound_ok(mix: list[BinType], volume: float, weight: float, items: list[Item], dimension_bounds: dict) -> bool:
+    """
+    Checks the lower bounds of `bounds` for a mix: enough volume and weight
+    in total, a bin large and strong enough for every item and, for a mix of
+    a single type, as many bins as its dimension bound.
+
+    Args:
+        mix (list[BinType]): The bin types, one entry per bin.
+        volume (float): The total volume of the items.
+        weight (float): The total weight of the items.
+        items (list[Item]): The items, one per key.
+        dimension_bounds (dict): The `bounds.dimension_bound` of the items, by bin type.
+
+    Returns:
+        bool: False if the mix cannot hold the items.
+    """
+    if min_bins([bin_type.get_volume() for bin_type in mix], volume) > len(mix):
+        return False
+    if min_bins([bin_type.max_weight for bin_type in mix], weight) > len(mix):
+        return False
+    types = list(set(mix))
+    if len(types) == 1 and dimension_bounds[types[0]] > len(mix):
+        return False
+    return not oversized(items, types).any()
+
+
+def select_fleet(items: list[Item], bin_types: list[BinType], time_limit: float = 10.0, deadline: float = None,
+                 max_bins: int = None, **options) -> tuple[float, Packer]:
+    """
+    Finds the cheapest mix of bin types that holds every item.
+
+    Mixes are explored cheapest first with a branch and bound search, each
+    mix built by adding bins of types at or after the last one added, so that
+    every multiset is seen once. A mix is packed by the `FleetOracle` only if
+    it passes the lower bounds of `bounds`, and mixes no cheaper than
+    the best feasible mix found are pruned. A greedy mix, repeating the type
+    with the lowest cost per volume, gives the first feasible mix.
+
+    Args:
+        items (list[Item]): The items of the order. They are not modified.
+        bin_types (list[BinType]): The bin types available, with distinct names.
+        time_limit (float): Seconds the search may take. The best mix found so far is returned once over.
+        deadline (float, optional): Same as `time_limit`, as an absolute `time.monotonic()` value.
+        max_bins (int, optional): The maximum number of bins in a mix. Defaults to the number of items.
+        **options: The `Packer.pack` options of the packings.
+
+    Returns:
+        tuple: The cost of the cheapest mix found and a packer holding its packed bins, (None, None) if no mix was
+        found in time.
+    """
+    names = Counter(bin_type.name for bin_type in bin_types)
+    if any(count > 1 for count in names.values()):
+        raise ValueError("duplicate bin type names: {}".format(sorted(name for name in names if names[name] > 1)))
+    for item in items:
+        if not any(bin_type.holds(item) for bin_type in bin_types):
+            raise ValueError("{} fits in no bin type".format(item.partno))
+    if time_limit is not None:
+        deadline = min(time.monotonic() + time_limit, deadline if deadline is not None else float('inf'))
+    if max_bins is None:
+        max_bins = max(len(items), 1)
+
+    def expired():
+        return deadline is not None and time.monotonic() >= deadline
+
+    oracle = FleetOracle(items, options)
+    volume = sum(float(item.get_volume()) for item in items)
+    weight = sum(item.weight for item in items)
+    samples = list(oracle.samples.values())
+    dimension_bounds = {bin_type: dimension_bound(items, bin_type) for bin_type in bin_types}
+
+    best_cost, best_mix = None, None
+    # incumbent: the cheapest type per volume among those holding every item, repeated until the order fits
+    greedy = [bin_type for bin_type in bin_types if all(bin_type.holds(item) for item in samples)]
+    if greedy:
+        bin_type = min(greedy, key=lambda bin_type: bin_type.cost / bin_type.get_volume())
+        mix = [bin_type] * max(1, min_bins([bin_type.get_volume()] * max_bins, volume),
+                               min_bins([bin_type.max_weight] * max_bins, weight), dimension_bounds[bin_type])
+        while len(mix) <= min(max_bins, max_bins if bin_type.count is None else bin_type.count) and not expired():
+            if _bound_ok(mix, volume, weight, samples, dimension_bounds) and oracle.check(mix):
+                best_cost, best_mix = bin_type.cost * len(mix), mix
+                break
+            mix = mix + [bin_type]
+
+    bin_types = sorted(bin_types, key=lambda bin_type: bin_type.cost)
+    heap = [(0.0, ())]
+    while heap and not expired():
+        cost, counts = heapq.heappop(heap)
+        if best_cost is not None and cost >= best_cost:
+            break
+        mix = [bin_types[i] for i in counts]
+        if mix and _bound_ok(mix, volume, weight, samples, dimension_bounds) and oracle.check(mix):
+            best_cost, best_mix = cost, mix
+            break
+        if len(counts) >= max_bins:
+            continue
+        for i in range(counts[-1] if counts else 0, len(bin_types)):
+            bin_type = bin_types[i]
+            if bin_type.count is not None and counts.count(i) >= bin_type.count:
+                continue
+            child = cost + bin_type.cost
+            if best_cost is None or child < best_cost:
+                heapq.heappush(heap, (child, counts + (i,)))
+
+    if best_mix is None:
+        return None, None
+    return best_cost, oracle.build(best_mix)
@@ -0,0 +1,213 @@
+import random
+import time
+
+import numpy as np
+
+from .bin import Bin
+from .bounds import oversized
+from .constants import RotationType, START_POSITION
+from .item import Item
+from .placement import SCORES, best_placement
+from .validator import EPSILON, validate_bin
+
+# what a kept change must increase first, the other measure breaking ties
+OBJECTIVES = ('items', 'volume')
+
+
+def _boxes(items: list[Item]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the lower and upper corners of placed items.
+
+    Args:
+        items (list[Item]): The placed items.
+
+    Returns:
+        tuple: Two (n, 3) arrays with the lower and upper corner of every item.
+    """
+    lo = np.array([item.position for item in items], dtype=float).reshape(-1, 3)
+    hi = lo + np.array([item.get_dimension() for item in items], dtype=float).reshape(-1, 3)
+    return lo, hi
+
+
+def _objective(bin: Bin) -> tuple[int, float]:
+    """
+    Measures a packed bin: the number of items it holds, then their volume, corners excluded.
+
+    Args:
+        bin (Bin): The bin.
+
+    Returns:
+        tuple: The item count and the packed volume.
+    """
+    items = [item for item in bin.items if item.group != 'corner']
+    return len(items), sum(float(item.get_volume()) for item in items)
+
+
+def _rank(measure: tuple[int, float], objective: str) -> tuple:
+    """
+    Orders the measures of a bin by an objective.
+
+    Args:
+        measure (tuple): The item count and packed volume from `_objective`.
+        objective (str): One of `OBJECTIVES`.
+
+    Returns:
+        tuple: A key comparing greater for better bins.
+    """
+    count, volume = measure
+    return (count, volume) if objective == 'items' else (volume, count)
+
+
+def ruin_cluster(bin: Bin, size: int, rng: random.Random) -> list[Item]:
+    """
+    Picks a spatially clustered group of placed items: a random item, its
+    nearest neighbours by center distance, and every item resting on one of
+    them, since it would lose its support once they are taken out.
+
+    Args:
+        bin (Bin): The packed bin.
+        size (int): The number of items picked around the random item.
+        rng (random.Random): The random source.
+
+    Returns:
+        list[Item]: The placed items to take out, corners excluded.
+    """
+    movable = [item for item in bin.items if item.group != 'corner']
+    if not movable:
+        return []
+    lo, hi = _boxes(movable)
+    centers = (lo + hi) / 2
+    distance = ((centers - centers[rng.randrange(len(movable))]) ** 2).sum(axis=1)
+    chosen = np.zeros(len(movable), dtype=bool)
+    chosen[np.argsort(distance, kind='stable')[:size]] = True
+    chosen = _with_resting(lo, hi, chosen)
+    return [item for item, picked in zip(movable, chosen) if picked]
+
+
+def _with_resting(lo: np.ndarray, hi: np.ndarray, chosen: np.ndarray) -> np.ndarray:
+    """
+    Extends a selection of boxes with every box resting on a selected one,
+    directly or through other boxes.
+
+    Args:
+        lo (np.ndarray): (n, 3) lower corners.
+        hi (np.ndarray): (n, 3) upper corners.
+        chosen (np.ndarray): (n,) boolean selection.
+
+    Returns:
+        np.ndarray: The extended selection.
+    """
+    chosen = chosen.copy()
+    # boxes whose bottom face lies on a chosen box, on the height or the depth axis
+    while True:
+        resting = np.zeros(len(chosen), dtype=bool)
+        for axis, others in ((1, (0, 2)), (2, (0, 1))):
+            touching = np.abs(lo[:, None, axis] - hi[None, chosen, axis]) <= EPSILON
+            for other in others:
+                touching &= (lo[:, None, other] < hi[None, chosen, other]) & (lo[None, chosen, other] < hi[:, None, other])
+            resting |= touching.any(axis=1)
+        resting &= ~chosen
+        if not resting.any():
+            return chosen
+        chosen |= resting
+
+
+def unplaced(item: Item) -> Item:
+    """
+    Returns a copy of a placed item back at the start position, as the packer lists unfit items.
+
+    Args:
+        item (Item): The placed item.
+
+    Returns:
+        Item: The unplaced copy.
+    """
+    return item.placed_at(START_POSITION, RotationType.WHD)
+
+
+def ruin_and_recreate(packer, time_limit: float = 1.0, deadline: float = None, cluster_size: int = 6,
+                      score: str = 'height', objective: str = 'items', seed: int = None,
+                      max_iterations: int = None) -> int:
+    """
+    Improves a packed result by ruin and recreate, without repacking whole bins.
+
+    Each iteration takes a cluster of placed items out of a bin (see
+    `ruin_cluster`), then reinserts them together with the unfit items in
+    a shuffled largest-first order, each at its best placement by `score`.
+    The pass ends early once no bin can hold any unfit item, see
+    `bounds.oversized`.
+    The bin is checkpointed before: the new packing is kept if it is better
+    by `objective` without more constraint violations, otherwise it is rolled
+    back. Removed items that are not placed again become unfit.
+
+    Args:
+        packer (Packer): The packer, after `pack`. Its bins, `unfit_items` and the bins' `unfitted_items` are updated.
+        time_limit (float): Seconds the improvement may take.
+        deadline (float, optional): Same as `time_limit`, as an absolute `time.monotonic()` value.
+        cluster_size (int): The number of neighbouring items taken out per iteration.
+        score (str): The placement score, one of `placement.SCORES`.
+        objective (str): 'items' keeps changes packing more items, then more volume. 'volume' keeps changes packing
+            more volume, then more items.
+        seed (int, optional): Seed of the random choices, for reproducible runs.
+        max_iterations (int, optional): Stops after this many iterations. At least one of `time_limit`, `deadline`
+            and `max_iterations` must be given.
+
+    Returns:
+        int: The number of unfit items packed, negative if the 'volume' objective packs fewer items.
+    """
+    if score not in SCORES:
+        raise ValueError("unknown placement score: {}".format(score))
+    if objective not in OBJECTIVES:
+        raise ValueError("unknown objective: {}".format(objective))
+    if time_limit is None and deadline is None and max_iterations is None:
+        raise ValueError("give a time_limit, a deadline or max_iterations")
+    if time_limit is not None:
+        deadline = min(time.monotonic() + time_limit, deadline if deadline is not None else float('inf'))
+    rng = random.Random(seed)
+    unfit = len(packer.unfit_items)
+    iterations = 0
+
+    while deadline is None or time.monotonic() < deadline:
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        candidates = []
+        for bin in packer.bins:
+            packed = {item.id for item in bin.items}
+            pool = [item for item in packer.unfit_items if item.id not in packed]
+            # items the bin cannot hold even alone are never recovered there
+            pool = [item for item, skip in zip(pool, oversized(pool, [bin])) if not skip]
+            if pool and any(item.group != 'corner' for item in bin.items):
+                candidates.append((bin, pool))
+        if not candidates:
+            break
+        iterations += 1
+        bin, pool = rng.choice(candidates)
+
+        before = _objective(bin)
+        violations = len(validate_bin(bin))
+        token = bin.checkpoint()
+        removed = bin.remove_items(ruin_cluster(bin, cluster_size, rng))
+        # largest first, with noise so that every iteration tries a different order
+        order = sorted(removed + pool, key=lambda item: float(item.get_volume()) * rng.uniform(0.7, 1.3),
+                       reverse=True)
+        for item in order:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            found = best_placement(bin, item, score)
+            if found is not None:
+                bin.load_items([item.placed_at(*found)])
+
+        after = _objective(bin)
+        if _rank(after, objective) <= _rank(before, objective) or len(validate_bin(bin)) > violations:
+            bin.rollback(token)
+            bin.commit(token)
+            continue
+        bin.commit(token)
+
+        packed = {item.id for item in bin.items}
+        dropped = [unplaced(item) for item in removed if item.id not in packed]
+        bin.unfitted_items = [item for item in bin.unfitted_items if item.id not in packed] + dropped
+        packer.unfit_items = [item for item in packer.unfit_items if item.id not in packed] + dropped
+        packer.items = packer.unfit_items
+        bin.gravity = packer.gravity_center(bin)
+    return unfit - len(packer.unfit_items)
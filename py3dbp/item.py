@@ -1,3 +1,4 @@
+import copy
 from uuid import uuid4
 
 from .constants import RotationType, START_POSITION, Type
@@ -39,7 +40,7 @@ class Item:
         self.loadbear = loadbear
         self.upsidedown = upsidedown if type==Type.CUBE else False
         self.color = color
-        self.position = START_POSITION
+        self.position = list(START_POSITION)
         self.rotations = self.set_rotations(type, upsidedown, rotations)
         self.stackable = stackable
         self.rotation = RotationType.WHD  # set default rotation type is WHD
@@ -57,6 +58,34 @@ class Item:
             self.position, self.get_volume()
         )
 
+    def placed_at(self, position: list[float], rotation: int):
+        """
+        Creates the placement record of the item: a shallow copy carrying the
+        position and rotation, leaving the item itself unchanged.
+
+        Args:
+            position (list[float]): The x, y, z coordinates of the placement.
+            rotation (int): The rotation type of the placement.
+
+        Returns:
+            Item: The placed copy of the item.
+        """
+        placed = copy.copy(self)
+        placed.position = list(position)
+        placed.rotation = rotation
+        return placed
+
+    def signature(self) -> tuple:
+        """
+        Returns what decides where the item fits: items with the same signature
+        are placed alike, so a search that failed for one fails for the others.
+
+        Returns:
+            tuple: The dimensions, allowed rotations, weight, stackable flag and load bearing.
+        """
+        return (self.width, self.height, self.depth, tuple(self.rotations), self.weight, self.stackable,
+                self.loadbear)
+
     @staticmethod
     def set_rotations(type: str, upsidedown: bool, rotations: list[int]):
         """
@@ -1,11 +1,31 @@
 import copy
+import time
+from bisect import bisect_left, insort
 from collections import Counter
+from typing import Iterable, Iterator
 
-import numpy as np
-
+from .beam import beam_fill
 from .bin import Bin
+from .bounds import is_optimal, lower_bound, oversized
 from .constants import Axis
 from .item import Item
+from .placement import SCORES, best_placement
+
+
+def _free_volume(bin: Bin) -> float:
+    """
+    Returns the volume a bin has left for items, counting the corners it gets once an item is offered to it.
+
+    Args:
+        bin (Bin): The bin.
+
+    Returns:
+        float: The remaining volume.
+    """
+    free = float(bin.get_volume()) - sum(float(item.get_volume()) for item in bin.items)
+    if bin.corner and not bin.items:
+        free -= 8 * float(bin.corner) ** 3
+    return free
 
 
 class Packer:
@@ -18,6 +38,11 @@ class Packer:
             unfit_items (list): List of items that failed to be packed into any bin.
             total_items (int): Total number of items to be packed.
             binding (list): List of binding constraints for item grouping.
+            timed_out (bool): Whether the last packing stopped at its deadline.
+            not_attempted_items (list): Unfit items the last packing had no time to try in every bin.
+            packed_items (list): The items of the last packing, placed or not. Setting it forgets `lower_bound`.
+            lower_bound (int): The fewest bins the items of the last packing need, see `bounds.lower_bound`. Computed
+                on first use.
     """
     def __init__(self):
         self.bins = []
@@ -25,6 +50,43 @@ class Packer:
         self.unfit_items = []
         self.total_items = 0
         self.binding = []
+        self.timed_out = False
+        self.not_attempted_items = []
+        self._packed_items = []
+        self._lower_bound = None
+
+    @property
+    def packed_items(self) -> list[Item]:
+        """
+        Returns the items of the last packing, placed or not.
+
+        Returns:
+            list[Item]: The items of the order.
+        """
+        return self._packed_items
+
+    @packed_items.setter
+    def packed_items(self, items: list[Item]):
+        """
+        Records the items of a packing, forgetting the lower bound of the previous one.
+
+        Args:
+            items (list[Item]): The items of the order.
+        """
+        self._packed_items = list(items)
+        self._lower_bound = None
+
+    @property
+    def lower_bound(self) -> int:
+        """
+        Returns the fewest bins the items of the last packing need, computed once per packing.
+
+        Returns:
+            int: The lower bound, see `bounds.lower_bound`.
+        """
+        if self._lower_bound is None:
+            self._lower_bound = lower_bound(self.packed_items, self.bins)
+        return self._lower_bound
 
     def add_bin(self, bin: Bin):
         """
@@ -64,7 +126,8 @@ class Packer:
         self.items.extend(items)
         self.total_items = len(self.items)
 
-    def pack2bin(self, bin: Bin, new_item: Item, fix_point: bool, check_stable: bool, support_surface_ratio: float):
+    def pack2bin(self, bin: Bin, new_item: Item, fix_point: bool, check_stable: bool, support_surface_ratio: float,
+                 placement: str = 'first', score: str = 'height', pivot_restart: bool = False):
         """
         Packs a single item into the specified bin, considering constraints.
     
@@ -74,6 +137,13 @@ class Packer:
             fix_point (bool): Whether to fix the item at a specific point in the bin.
             check_stable (bool): Whether to check the stability of the item after packing.
             support_surface_ratio (float): Minimum acceptable support surface ratio for stability.
+            placement (str): 'first' to take the first pivot and rotation that fit, 'best' to score all of them.
+            score (str): The score of the 'best' placement, one of `placement.SCORES`.
+            pivot_restart (bool): With 'first', starts the search at the pivot the last item with the same
+                signature was placed at and wraps around, instead of starting at the first pivot.
+
+        Returns:
+            bool: True if the item was placed in the bin, False otherwise.
         """
         fitted = False
         bin.fix_point = fix_point
@@ -85,31 +155,54 @@ class Packer:
             for i, corner in enumerate(corners):
                 bin.put_corner(i, corner)
 
-        elif not bin.items:
-            if not bin.put_item(new_item, new_item.position):
+        elif not bin.items and placement == 'first':
+            fitted = bin.put_item(new_item, new_item.position)
+            if not fitted:
                 bin.unfitted_items.append(new_item)
-            return
+            return fitted
 
-        for axis in Axis.WHD:
-            for item in bin.items:
-                w, h, d = item.get_dimension()
-                if axis == Axis.WIDTH:
-                    pivot = [item.position[0] + w, item.position[1], item.position[2]]
-                elif axis == Axis.HEIGHT:
-                    # prevent stacking non-stackable items
-                    pivot = [item.position[0], item.position[1] + h, item.position[2]]
-                    if not item.stackable:
-                        continue
-                elif axis == Axis.DEPTH:
-                    pivot = [item.position[0], item.position[1], item.position[2] + d]
+        # an item of a type that already failed against the same bin state fails again
+        key = (new_item.signature(), fix_point, check_stable, support_surface_ratio, placement, score)
+        if bin.search_failed(key):
+            bin.unfitted_items.append(new_item)
+            return False
 
-                if bin.put_item(new_item, pivot):
-                    fitted = True
-                    break
-            if fitted:
+        if placement == 'best':
+            found = best_placement(bin, new_item, score)
+            if found is None:
+                bin.fail_search(key)
+                bin.unfitted_items.append(new_item)
+                return False
+            bin.load_items([new_item.placed_at(*found)])
+            return True
+
+        # pivots in search order, rotated to start where the last item of the same type went
+        pivots = [(axis, index) for axis in Axis.WHD for index in range(len(bin.items))]
+        if pivot_restart and key in bin.last_pivots:
+            axis, index = bin.last_pivots[key]
+            start = min(Axis.WHD.index(axis) * len(bin.items) + index, len(pivots))
+            pivots = pivots[start:] + pivots[:start]
+        for axis, index in pivots:
+            item = bin.items[index]
+            w, h, d = item.get_dimension()
+            if axis == Axis.WIDTH:
+                pivot = [item.position[0] + w, item.position[1], item.position[2]]
+            elif axis == Axis.HEIGHT:
+                # prevent stacking non-stackable items
+                pivot = [item.position[0], item.position[1] + h, item.position[2]]
+                if not item.stackable:
+                    continue
+            elif axis == Axis.DEPTH:
+                pivot = [item.position[0], item.position[1], item.position[2] + d]
+
+            if bin.put_item(new_item, pivot):
+                bin.last_pivots[key] = (axis, index)
+                fitted = True
                 break
         if not fitted:
+            bin.fail_search(key)
             bin.unfitted_items.append(new_item)
+        return fitted
 
     def sort_binding(self):
         """
@@ -257,8 +350,254 @@ class Packer:
             return [0, 0, 0, 0]
         return list(map(lambda x: round(x / sum_r * 100, 2), r))
 
+    def iter_pack(self, items: Iterable[Item] = None, bins: Iterable[Bin] = None, max_open_bins: int = 1,
+                  fix_point=True, check_stable=True, support_surface_ratio=0.75) -> Iterator[Bin]:
+        """
+        Packs a stream of items, yielding every bin as soon as it is closed.
+
+        Each item is tried in the open bins, oldest first. An item that fits in
+        none of them opens the next bin, and once more than `max_open_bins` are
+        open the oldest one is closed and yielded with its gravity distribution.
+        An item that does not fit in the next bin even when it is empty leaves it
+        unopened for the following items. When `bins` is given, the packer keeps
+        no reference to closed bins, so memory is bounded by the open bins; the
+        default `self.bins` still holds them. Items are packed in the order
+        given; sort them first for the bigger-first behaviour of `pack`. Items
+        that fit nowhere are collected in `unfit_items`.
+
+        Args:
+            items (Iterable[Item], optional): The items to pack. Defaults to the packer's items.
+            bins (Iterable[Bin], optional): The bins to open, in order. Defaults to the packer's bins.
+            max_open_bins (int): The number of bins kept open at once.
+            fix_point (bool): If True, fixes items at specific points when packing.
+            check_stable (bool): If True, ensures all items are packed stably.
+            support_surface_ratio (float): Minimum acceptable surface support ratio.
+
+        Yields:
+            Bin: The closed bins, in the order they were opened.
+        """
+        items = self.items if items is None else items
+        bins = iter(self.bins if bins is None else bins)
+        self.unfit_items = []
+        open_bins = []
+        # the next bin, opened by the first item it can hold
+        spare = None
+
+        for item in items:
+            if any(self.pack2bin(bin, item, fix_point, check_stable, support_surface_ratio) for bin in open_bins):
+                continue
+
+            if spare is None:
+                spare = next(bins, None)
+            if spare is None or oversized([item], [spare])[0]:
+                self.unfit_items.append(item)
+                continue
+            token = spare.checkpoint()
+            fitted = self.pack2bin(spare, item, fix_point, check_stable, support_surface_ratio)
+            if not fitted:
+                spare.rollback(token)
+            spare.commit(token)
+            if not fitted:
+                self.unfit_items.append(item)
+                continue
+            open_bins.append(spare)
+            spare = None
+
+            if len(open_bins) > max_open_bins:
+                closed = open_bins.pop(0)
+                closed.gravity = self.gravity_center(closed)
+                yield closed
+
+        while open_bins:
+            closed = open_bins.pop(0)
+            closed.gravity = self.gravity_center(closed)
+            yield closed
+
+    def pack_async(self, executor: str = 'thread', progress_interval: float = 0.1, **kwargs):
+        """
+        Packs the items without blocking the running event loop.
+
+        The returned job can be awaited for the packer and iterated with
+        `async for` to receive `(bin_index, attempted, total)` progress events.
+        Cancelling the awaiting task stops the packing.
+
+        Args:
+            executor (str): 'thread' to pack in a worker thread, 'process' to pack in a child process.
+            progress_interval (float): Minimum seconds between two progress events.
+            **kwargs: The `pack` options.
+
+        Returns:
+            PackJob: The running job.
+        """
+        from .aio import PackJob
+        return PackJob(self, executor, progress_interval, kwargs)
+
+    def is_optimal(self) -> bool:
+        """
+        Checks that the last packing provably uses the fewest bins: every item
+        that fits in a bin is packed, in as many bins as `lower_bound`.
+
+        Returns:
+            bool: True if no packing can use fewer bins.
+        """
+        return is_optimal(self.packed_items, self.bins, self.lower_bound)
+
+    def improve(self, time_limit: float = 1.0, **kwargs) -> int:
+        """
+        Tries to pack the unfit items after `pack` by taking out and reinserting
+        clusters of placed items, keeping only the changes that pack more.
+
+        Args:
+            time_limit (float): Seconds the improvement may take.
+            **kwargs: The other `improve.ruin_and_recreate` options.
+
+        Returns:
+            int: The number of unfit items packed, see `improve.ruin_and_recreate`.
+        """
+        from .improve import ruin_and_recreate
+        return ruin_and_recreate(self, time_limit, **kwargs)
+
+    def amend(self, added: list[Item] = None, removed: list = None, quantities: dict = None, **kwargs) -> list[Bin]:
+        """
+        Updates the packed bins for an amended order, keeping the placements
+        still valid and packing only what the change affects.
+
+        Args:
+            added (list[Item], optional): The new items.
+            removed (list, optional): The items to remove, as items or ids.
+            quantities (dict, optional): The new number of instances by part number.
+            **kwargs: The other `delta.repack_delta` options.
+
+        Returns:
+            list[Bin]: The bins that changed.
+        """
+        from .delta import repack_delta
+        return repack_delta(self, added, removed, quantities, **kwargs)
+
+    def _fill_bin(self, idx: int, bin: Bin, fix_point: bool, check_stable: bool, support_surface_ratio: float,
+                  progress=None, deadline: float = None, placement: str = 'first', score: str = 'height',
+                  beam_width: int = 1, pivot_restart: bool = False):
+        """
+        Tries every remaining item in a bin, stopping early at the deadline.
+
+        Args:
+            idx (int): The index of the bin.
+            bin (Bin): The bin to fill.
+            fix_point (bool): Whether to fix the item at a specific point in the bin.
+            check_stable (bool): Whether to check the stability of the item after packing.
+            support_surface_ratio (float): Minimum acceptable support surface ratio for stability.
+            progress (callable, optional): Called as `progress(idx, attempted, total)` after each item.
+            deadline (float, optional): The `time.monotonic()` value to stop at.
+            placement (str): 'first' or 'best', see `pack2bin`.
+            score (str): The score of the 'best' placement.
+            beam_width (int): Above 1, fills the bin with `beam.beam_fill` keeping that many states.
+            pivot_restart (bool): See `pack2bin`.
+        """
+        if beam_width > 1:
+            hook = None if progress is None else lambda attempted, total: progress(idx, attempted, total)
+            attempted = beam_fill(bin, self.items, beam_width, fix_point=fix_point, check_stable=check_stable,
+                                  support_surface_ratio=support_surface_ratio, score=score, deadline=deadline,
+                                  progress=hook)
+            if attempted < len(self.items):
+                self.timed_out = True
+                self.not_attempted_items = self.items[attempted:]
+            return
+
+        free = _free_volume(bin)
+        for attempted, item in enumerate(self.items):
+            # items are only checked against the clock between two placements
+            if deadline is not None and time.monotonic() >= deadline:
+                self.timed_out = True
+                self.not_attempted_items = self.items[attempted:]
+                return
+            # an item larger or heavier than what the bin has left fails without a search
+            if float(item.get_volume()) > free or bin.get_total_weight() + item.weight > bin.max_weight:
+                bin.unfitted_items.append(item)
+            else:
+                count = len(bin.items)
+                if self.pack2bin(bin, item, fix_point, check_stable, support_surface_ratio, placement, score,
+                                 pivot_restart):
+                    free -= sum(float(placed.get_volume()) for placed in bin.items[count:] if placed.group != 'corner')
+            if progress is not None:
+                progress(idx, attempted + 1, len(self.items))
+
+    def _fill_bins(self, fix_point: bool, check_stable: bool, support_surface_ratio: float, progress=None,
+                   deadline: float = None, placement: str = 'first', score: str = 'height',
+                   pivot_restart: bool = False, bin_selection: str = 'best'):
+        """
+        Offers every item to all the bins at once, instead of filling them one after the other.
+
+        For 'best', the bins in use are kept in a capacity index sorted by
+        remaining volume: the fullest bin that can hold the item is tried first,
+        and an empty bin, in order, only when none of them can. For 'first' the
+        bins are tried in order. Bins with less remaining volume or weight than
+        the item, or too small for its dimensions in any rotation, are skipped
+        without a placement search.
+
+        Args:
+            fix_point (bool): Whether to fix the item at a specific point in the bin.
+            check_stable (bool): Whether to check the stability of the item after packing.
+            support_surface_ratio (float): Minimum acceptable support surface ratio for stability.
+            progress (callable, optional): Called as `progress(bin_index, attempted, total)` after each item, with
+                the index of the bin the item went to, None if it fit in none.
+            deadline (float, optional): The `time.monotonic()` value to stop at.
+            placement (str): 'first' or 'best', see `pack2bin`.
+            score (str): The score of the 'best' placement.
+            pivot_restart (bool): See `pack2bin`.
+            bin_selection (str): 'best' or 'first'.
+        """
+        best = bin_selection == 'best'
+        free = [_free_volume(bin) for bin in self.bins]
+        sizes = [sorted([bin.width, bin.height, bin.depth]) for bin in self.bins]
+        # 'best': the bins in use by remaining volume, then the empty bins in order. 'first': all bins in order.
+        # A bin only holding its corners, put in when an item failed, stays with the empty bins.
+        indexed = {i for i, bin in enumerate(self.bins) if best and any(item.group != 'corner' for item in bin.items)}
+        index = sorted((free[i], i) for i in indexed)
+        empty = [i for i in range(len(self.bins)) if i not in indexed]
+        unfit = []
+
+        for attempted, item in enumerate(self.items):
+            if deadline is not None and time.monotonic() >= deadline:
+                self.timed_out = True
+                self.not_attempted_items = self.items[attempted:]
+                unfit.extend(self.not_attempted_items)
+                break
+            volume = float(item.get_volume())
+            size = sorted([item.width, item.height, item.depth])
+            # bins with less room than the item come before `bisect_left` in the index
+            candidates = [i for _, i in index[bisect_left(index, (volume, -1)):]] + empty
+            taken = None
+            for i in candidates:
+                bin = self.bins[i]
+                if (free[i] < volume or bin.get_total_weight() + item.weight > bin.max_weight
+                        or any(a > b for a, b in zip(size, sizes[i]))):
+                    continue
+                count = len(bin.items)
+                if self.pack2bin(bin, item, fix_point, check_stable, support_surface_ratio, placement, score,
+                                 pivot_restart):
+                    if i in indexed:
+                        index.remove((free[i], i))
+                    elif best:
+                        empty.remove(i)
+                        indexed.add(i)
+                    free[i] -= sum(float(placed.get_volume()) for placed in bin.items[count:]
+                                   if placed.group != 'corner')
+                    if best:
+                        insort(index, (free[i], i))
+                    taken = i
+                    break
+            if taken is None:
+                unfit.append(item)
+            if progress is not None:
+                progress(taken, attempted + 1, len(self.items))
+
+        for bin in self.bins:
+            bin.gravity = self.gravity_center(bin)
+        self.items = unfit
+
     def pack(self, bigger_first=False, distribute_items=True, fix_point=True, check_stable=True,
-             support_surface_ratio=0.75, binding=None):
+             support_surface_ratio=0.75, binding=None, progress=None, time_limit=None, deadline=None,
+             placement='first', score='height', beam_width=1, pivot_restart=False, bin_selection='sequential'):
         """
         Packs all the items into the available bins using specified strategies.
     
@@ -269,9 +608,40 @@ class Packer:
             check_stable (bool): If True, ensures all items are packed stably.
             support_surface_ratio (float): Minimum acceptable surface support ratio.
             binding (list): List of binding constraints for grouped packing.
+            progress (callable): Called as `progress(bin_index, attempted, total)` after each item is tried in a bin.
+                Raising from it aborts the packing.
+            time_limit (float): Seconds the packing may take. Once over, packing stops before the next item and
+                keeps what is placed; the untried items stay unfit and are listed in `not_attempted_items`.
+            deadline (float): Same as `time_limit`, as an absolute `time.monotonic()` value.
+            placement (str): 'first' places each item at the first pivot and rotation that fit. 'best' checks every
+                pivot and allowed rotation at once and keeps the best one by `score`.
+            score (str): 'height' (lowest top face, then closest to the left and back walls), 'contact' (most area
+                shared with walls and items) or 'waste' (smallest box enclosing the packed items).
+            beam_width (int): Above 1, each bin is filled by a beam search keeping that many partial packings,
+                expanded with the best-fit placements of each item. Under a time limit the beam narrows to finish
+                in time.
+            pivot_restart (bool): With 'first', each item's search starts at the pivot where the last item with
+                the same signature went. Faster for orders with many identical items, but it can place them
+                differently.
+            bin_selection (str): 'sequential' fills the bins one after the other. With `distribute_items`, 'best'
+                keeps every bin open and puts each item in the fullest bin that can hold it, and 'first' in the
+                first one, skipping the bins without enough room, weight or size left for it.
         """
+        if placement not in ('first', 'best'):
+            raise ValueError("unknown placement: {}".format(placement))
+        if score not in SCORES:
+            raise ValueError("unknown placement score: {}".format(score))
+        if bin_selection not in ('sequential', 'first', 'best'):
+            raise ValueError("unknown bin selection: {}".format(bin_selection))
+        if bin_selection != 'sequential' and beam_width > 1:
+            raise ValueError("the beam search fills one bin at a time, use bin_selection='sequential'")
         if binding is None:
             binding = []
+        if time_limit is not None:
+            deadline = min(time.monotonic() + time_limit, deadline if deadline is not None else float('inf'))
+        self.timed_out = False
+        self.not_attempted_items = []
+        self.packed_items = self.items
 
         # add binding attribute
         self.binding = binding
@@ -300,24 +670,21 @@ class Packer:
         # sorted by binding
         if binding:
             self.sort_binding()
+            # resorted once, before any bin is filled: the stable sorts keep the binding order among equal items
+            self.items.sort(key=lambda item: item.get_volume(), reverse=bigger_first)
+            self.items.sort(key=lambda item: item.loadbear, reverse=True)
+            self.items.sort(key=lambda item: item.priority, reverse=False)
+
+        if distribute_items and bin_selection != 'sequential':
+            self._fill_bins(fix_point, check_stable, support_surface_ratio, progress, deadline, placement, score,
+                            pivot_restart, bin_selection)
+            self.unfit_items = self.items
+            return
 
         for idx, bin in enumerate(self.bins):
             # Pack stackable items first (0 to n)
-            for item in self.items:
-                self.pack2bin(bin, item, fix_point, check_stable, support_surface_ratio)
-
-            if binding:
-                # resorted
-                self.items.sort(key=lambda item: item.get_volume(), reverse=bigger_first)
-                self.items.sort(key=lambda item: item.loadbear, reverse=True)
-                self.items.sort(key=lambda item: item.priority, reverse=False)
-                # clear bin
-                bin.items = []
-                bin.unfitted_items = self.unfit_items
-                bin.fit_items = np.array([[0, bin.width, 0, bin.height, 0, 0]])
-                # repacking
-                for item in self.items:
-                    self.pack2bin(bin, item, fix_point, check_stable, support_surface_ratio)
+            self._fill_bin(idx, bin, fix_point, check_stable, support_surface_ratio, progress, deadline,
+                           placement, score, beam_width, pivot_restart)
 
             # Deviation Of Cargo Gravity Center
             self.bins[idx].gravity = self.gravity_center(bin)
@@ -332,4 +699,12 @@ class Packer:
                             self.items.remove(item)
                             break
 
+            if self.timed_out:
+                if idx + 1 < len(self.bins):
+                    # none of the items left was tried in the bins after this one. Without
+                    # `distribute_items` the items stay listed once placed, so those are left out
+                    placed = {item.id for done in self.bins[:idx + 1] for item in done.items}
+                    self.not_attempted_items = [item for item in self.items if item.id not in placed]
+                break
+
         self.unfit_items = self.items
@@ -0,0 +1,171 @@
+import copy
+import os
+
+import numpy as np
+
+from .bin import Bin
+from .delta import take_out
+from .item import Item
+from .packer import Packer
+from .shared import SharedItemTable, pack_subset
+from .validator import validate_bin
+
+
+def _violations(bin: Bin) -> set:
+    """
+    Lists the constraint violations of a bin in a comparable form.
+
+    Args:
+        bin (Bin): The bin.
+
+    Returns:
+        set: The (kind, item ids) of every violation `validator.validate_bin` finds.
+    """
+    return {(violation.kind, tuple(item.id for item in violation.items)) for violation in validate_bin(bin)}
+
+
+def _drop_invalid(bin: Bin) -> list[Item]:
+    """
+    Takes items out of a bin until `validator.validate_bin` finds nothing:
+    the later placed item of every violation, and the items it supported.
+
+    Args:
+        bin (Bin): The bin.
+
+    Returns:
+        list[Item]: The removed placed items.
+    """
+    removed = []
+    while True:
+        violations = [violation for violation in validate_bin(bin) if violation.items]
+        if not violations:
+            return removed
+        order = {item.id: idx for idx, item in enumerate(bin.items)}
+        culprits = {max(violation.items, key=lambda item: order[item.id]).id for violation in violations}
+        removed.extend(take_out(bin, [item for item in bin.items if item.id in culprits]))
+
+
+def assign_bins(items: list[Item], bins: list[Bin], fill_ratio: float = 0.8) -> np.ndarray:
+    """
+    Assigns items to bins by volume and weight alone, in one vectorized pass.
+
+    The bins are taken in order until their volume, times `fill_ratio`, and
+    their `max_weight` cover the items. The items are then dealt to these
+    bins largest first, back and forth, so that every bin receives a mix of
+    large and small items of about the same total volume.
+
+    Args:
+        items (list[Item]): The items.
+        bins (list[Bin]): The bins, in the order to use them.
+        fill_ratio (float): The share of a bin's volume to count on, below 1 as boxes never fill a bin entirely.
+
+    Returns:
+        np.ndarray: The bin index of every item.
+    """
+    if not bins:
+        raise ValueError("no bins to assign the items to")
+    volumes = np.array([float(item.get_volume()) for item in items])
+    weights = np.array([float(item.weight) for item in items])
+    capacity = np.cumsum([float(bin.get_volume()) * fill_ratio for bin in bins])
+    max_weight = np.cumsum([float(bin.max_weight) for bin in bins])
+    used = min(len(bins), 1 + max(int(np.searchsorted(capacity, volumes.sum())),
+                                  int(np.searchsorted(max_weight, weights.sum()))))
+    order = np.argsort(-volumes, kind='stable')
+    # 0, 1, ..., used - 1, used - 1, ..., 1, 0, 0, 1, ...
+    turn = np.arange(len(items)) % (2 * used)
+    result = np.empty(len(items), dtype=np.intp)
+    result[order] = np.where(turn < used, turn, 2 * used - 1 - turn)
+    return result
+
+
+def pack_pipeline(items: list[Item], bins: list[Bin], workers: int = None, fill_ratio: float = 0.8,
+                  **options) -> Packer:
+    """
+    Packs a large order in two phases: a fast assignment of the items to the
+    bins, then the 3D packing of every bin in parallel processes.
+
+    The items are assigned with `assign_bins` and published once as a
+    `SharedItemTable`, so a worker only receives its bin and the indexes of
+    its items. Placements that break a constraint of `validator.validate_bin`
+    are undone. The items a bin could not hold are then tried, in a repair
+    round, in every other bin once, starting with the next ones, keeping only
+    the placements that leave the bin valid. Wall time
+    scales with the number of workers as long as there are more bins than
+    workers.
+
+    Args:
+        items (list[Item]): The items. They are not modified.
+        bins (list[Bin]): The empty bins, in the order to fill them. They are not modified.
+        workers (int, optional): The number of worker processes, 0 packs in this process. Defaults to the CPU count.
+        fill_ratio (float): See `assign_bins`.
+        **options: The `Packer.pack` options used for every bin and for the repair round.
+
+    Returns:
+        Packer: A packer holding copies of the packed bins and the unfit items.
+    """
+    if any(bin.items for bin in bins):
+        raise ValueError("pipeline bins must be empty")
+    assigned = assign_bins(items, bins, fill_ratio)
+    groups = [np.flatnonzero(assigned == idx) for idx in range(len(bins))]
+    jobs = [(idx, indexes) for idx, indexes in enumerate(groups) if len(indexes)]
+
+    with SharedItemTable.publish(items) as shared:
+        if workers == 0:
+            results = [pack_subset(shared, [bins[idx]], indexes, **options) for idx, indexes in jobs]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, max(len(jobs), 1))) as executor:
+                futures = [executor.submit(pack_subset, shared, [bins[idx]], indexes, **options)
+                           for idx, indexes in jobs]
+                results = [future.result() for future in futures]
+
+    fix_point = options.get('fix_point', True)
+    check_stable = options.get('check_stable', True)
+    support_surface_ratio = options.get('support_surface_ratio', 0.75)
+    placement = options.get('placement', 'first')
+    score = options.get('score', 'height')
+
+    packer = Packer()
+    packer.add_bins(copy.deepcopy(bins))
+    for bin in packer.bins:
+        # the settings the bins were packed with, also checked by the validator
+        bin.fix_point, bin.check_stable, bin.support_surface_ratio = fix_point, check_stable, support_surface_ratio
+    leftovers = [[] for _ in bins]
+    for (idx, _), (placements, unfit) in zip(jobs, results):
+        bin = packer.bins[idx]
+        if bin.corner:
+            for i, corner in enumerate(bin.add_corners()):
+                bin.put_corner(i, corner)
+        bin.load_items([items[row].placed_at(position, rotation) for row, position, rotation in zip(
+            placements['item'].tolist(), placements['position'].tolist(), placements['rotation'].tolist())])
+        # a placement breaking a constraint is undone, its item goes to the repair round
+        dropped = {item.id for item in _drop_invalid(bin)}
+        leftovers[idx] = [items[row] for row in unfit.tolist()] + [item for item in items if item.id in dropped]
+        bin.unfitted_items = list(leftovers[idx])
+
+    # repair round: what a bin could not hold is tried once in each other bin, the next ones first
+    valid = {id(bin): _violations(bin) for bin in packer.bins}
+
+    def repair(bin: Bin, item: Item) -> bool:
+        token = bin.checkpoint()
+        fitted = packer.pack2bin(bin, item, fix_point, check_stable, support_surface_ratio, placement, score)
+        if fitted and not _violations(bin) <= valid[id(bin)]:
+            bin.rollback(token)
+            fitted = False
+        bin.commit(token)
+        return fitted
+
+    unfit = []
+    for idx, left in enumerate(leftovers):
+        others = packer.bins[idx + 1:] + packer.bins[:idx]
+        for item in left:
+            if not any(repair(bin, item) for bin in others):
+                unfit.append(item)
+    for bin in packer.bins:
+        bin.gravity = packer.gravity_center(bin)
+    packer.unfit_items = unfit
+    packer.items = packer.unfit_items
+    packer.total_items = len(items)
+    packer.packed_items = items
+    return packer
@@ -0,0 +1,284 @@
+import numpy as np
+
+from .bin import Bin
+from .item import Item
+
+# candidates checked against the placed boxes at once, bounding the (candidates x boxes) temporaries
+CHUNK_CELLS = 1 << 21
+
+# order of (width, height, depth) for each RotationType, see `Item.get_whd_order`
+WHD_ORDER = np.array([[0, 1, 2], [1, 0, 2], [1, 2, 0], [2, 1, 0], [2, 0, 1], [0, 2, 1]])
+
+# the two other axes of every axis
+_OTHERS = [(1, 2), (0, 2), (0, 1)]
+
+
+def _overlap(lo: np.ndarray, hi: np.ndarray, rows: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Measures the overlap of candidate boxes with placed boxes along one axis.
+
+    Args:
+        lo (np.ndarray): (c, 3) lower corners of the candidates.
+        hi (np.ndarray): (c, 3) upper corners of the candidates.
+        rows (np.ndarray): (n, 6) `fit_items` rows of the placed boxes.
+        axis (int): The axis.
+
+    Returns:
+        np.ndarray: (c, n) overlap lengths, 0 where the boxes are apart.
+    """
+    return np.clip(np.minimum(hi[:, axis, None], rows[None, :, 2 * axis + 1])
+                   - np.maximum(lo[:, axis, None], rows[None, :, 2 * axis]), 0, None)
+
+
+def _collides(lo: np.ndarray, hi: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Tests candidate boxes against placed boxes for a strict intersection, as `box_intersect` does.
+
+    Returns:
+        np.ndarray: (c,) True where a candidate intersects any placed box.
+    """
+    hit = np.ones((len(lo), len(rows)), dtype=bool)
+    for axis in range(3):
+        hit &= (lo[:, axis, None] < rows[None, :, 2 * axis + 1]) & (rows[None, :, 2 * axis] < hi[:, axis, None])
+    return hit.any(axis=1)
+
+
+def _settle(lo: np.ndarray, dims: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Pushes candidate boxes toward the origin along y, x and z, three times over
+    like `Bin._adjust_pivot`, each move stopping at the first box or wall on
+    the way so that a settled candidate never intersects a placed box.
+
+    Returns:
+        np.ndarray: (c, 3) settled lower corners.
+    """
+    lo = lo.copy()
+    for _ in range(3):
+        for axis in (1, 0, 2):
+            hi = lo + dims
+            b, c = _OTHERS[axis]
+            behind = (_overlap(lo, hi, rows, b) > 0) & (_overlap(lo, hi, rows, c) > 0) \
+                & (rows[None, :, 2 * axis + 1] <= lo[:, axis, None])
+            lo[:, axis] = np.where(behind, rows[None, :, 2 * axis + 1], 0).max(axis=1, initial=0)
+    return lo
+
+
+def _stackable(lo: np.ndarray, hi: np.ndarray, rows: np.ndarray, stackable: np.ndarray,
+               item_stackable: bool) -> np.ndarray:
+    """
+    Applies the stacking rules of `Bin._check_overlap` to the candidates.
+
+    Args:
+        stackable (np.ndarray): (n,) whether each placed box can carry another.
+        item_stackable (bool): Whether the item being placed can be stacked.
+
+    Returns:
+        np.ndarray: (c,) True where a candidate respects the rules.
+    """
+    xz = (_overlap(lo, hi, rows, 0) > 0) & (_overlap(lo, hi, rows, 2) > 0)
+    above = lo[:, 1, None] == rows[None, :, 3]
+    bad = above & xz & ~stackable[None, :]
+    if not item_stackable:
+        bad |= (above | (hi[:, 1, None] == rows[None, :, 2])) & xz
+    return ~bad.any(axis=1)
+
+
+def _stable(lo: np.ndarray, hi: np.ndarray, rows: np.ndarray, support_surface_ratio: float) -> np.ndarray:
+    """
+    Applies the support rules of `Bin._check_stability` to the candidates: enough
+    of the bottom face rests on boxes or the floor, or else all four bottom
+    vertices do.
+
+    Returns:
+        np.ndarray: (c,) True where a candidate is stable.
+    """
+    below = lo[:, 2, None] == rows[None, :, 5]
+    area = (np.where(below, _overlap(lo, hi, rows, 0) * _overlap(lo, hi, rows, 1), 0)).sum(axis=1)
+    stable = area / ((hi[:, 0] - lo[:, 0]) * (hi[:, 1] - lo[:, 1])) >= support_surface_ratio
+    vertices = np.ones(len(lo), dtype=bool)
+    for x in (lo[:, 0, None], hi[:, 0, None]):
+        for y in (lo[:, 1, None], hi[:, 1, None]):
+            vertices &= (below & (rows[None, :, 0] <= x) & (x <= rows[None, :, 1])
+                         & (rows[None, :, 2] <= y) & (y <= rows[None, :, 3])).any(axis=1)
+    return stable | vertices
+
+
+def contact_score(bounds: np.ndarray, lo: np.ndarray, hi: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Scores candidates by the area they share with the walls and the placed boxes.
+
+    Args:
+        bounds (np.ndarray): The width, height and depth of the bin.
+        lo (np.ndarray): (c, 3) lower corners of the candidates.
+        hi (np.ndarray): (c, 3) upper corners of the candidates.
+        rows (np.ndarray): (n, 6) `fit_items` rows of the placed boxes, without the floor.
+
+    Returns:
+        np.ndarray: (c,) scores, higher is better.
+    """
+    overlaps = [_overlap(lo, hi, rows, axis) for axis in range(3)]
+    score = np.zeros(len(lo))
+    for axis, (b, c) in enumerate(_OTHERS):
+        touching = (lo[:, axis, None] == rows[None, :, 2 * axis + 1]) | (hi[:, axis, None] == rows[None, :, 2 * axis])
+        score += (np.where(touching, overlaps[b] * overlaps[c], 0)).sum(axis=1)
+        face = (hi[:, b] - lo[:, b]) * (hi[:, c] - lo[:, c])
+        score += face * ((lo[:, axis] == 0).astype(float) + (hi[:, axis] == bounds[axis]))
+    return score
+
+
+def height_score(bounds: np.ndarray, lo: np.ndarray, hi: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Ranks candidates by how low their top face stays along the height axis,
+    then by how close they are to the left and back walls.
+
+    Returns:
+        np.ndarray: (c,) scores, higher is better.
+    """
+    order = np.lexsort((lo[:, 2], lo[:, 0], hi[:, 1]))
+    rank = np.empty(len(lo))
+    rank[order] = np.arange(len(lo))
+    return -rank
+
+
+def waste_score(bounds: np.ndarray, lo: np.ndarray, hi: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Scores candidates by the volume of the box from the origin enclosing every
+    placed item and the candidate, so that the empty space left inside stays small.
+
+    Returns:
+        np.ndarray: (c,) scores, higher is better.
+    """
+    extent = np.maximum(hi, rows[:, 1::2].max(axis=0)) if len(rows) else hi
+    return -extent.prod(axis=1)
+
+
+SCORES = {
+    'contact': contact_score,
+    'height': height_score,
+    'waste': waste_score,
+}
+
+
+def _pivots(rows: np.ndarray, stackable: np.ndarray, start: list[float]) -> np.ndarray:
+    """
+    Lists the right, top and front corners of placed boxes, in `Packer.pack2bin` order.
+
+    Args:
+        rows (np.ndarray): (n, 6) `fit_items` rows of the placed boxes, without the floor.
+        stackable (np.ndarray): (n,) whether each placed box can carry another.
+        start (list[float]): The pivot used when no box is placed.
+
+    Returns:
+        np.ndarray: (p, 3) pivots.
+    """
+    if not len(rows):
+        return np.array([start], dtype=float)
+    lo = rows[:, 0::2]
+    pivots = []
+    for axis in range(3):
+        pivot = lo.copy()
+        pivot[:, axis] = rows[:, 2 * axis + 1]
+        pivots.append(pivot[stackable] if axis == 1 else pivot)
+    return np.concatenate(pivots)
+
+
+def candidate_pivots(bin: Bin, item: Item) -> np.ndarray:
+    """
+    Lists the pivots `Packer.pack2bin` tries for an item, in the same order:
+    the right, top and front corners of every placed item, or the item's own
+    position in an empty bin.
+
+    Args:
+        bin (Bin): The bin.
+        item (Item): The item to place.
+
+    Returns:
+        np.ndarray: (p, 3) pivots.
+    """
+    return _pivots(bin.fit_items[1:], np.array([placed.stackable for placed in bin.items], dtype=bool),
+                   item.position)
+
+
+def rank_placements(rows: np.ndarray, stackable: np.ndarray, bounds: np.ndarray, item: Item, fix_point: bool,
+                    check_stable: bool, support_surface_ratio: float, score: str = 'height',
+                    limit: int = 1) -> list[tuple[list[float], int]]:
+    """
+    Ranks the placements of an item among every candidate pivot and allowed
+    rotation, checked and scored in vectorized passes.
+
+    Candidates that leave the bin or intersect a placed box are dropped. With
+    `fix_point` the remaining ones are settled toward the origin and must
+    follow the stacking rules, and the support rules too with `check_stable`.
+    Ties go to the candidate `pack2bin` would try first. Weight is not checked.
+
+    Args:
+        rows (np.ndarray): (n, 6) `fit_items` rows, the floor first.
+        stackable (np.ndarray): (n,) whether each row can carry another box, True for the floor.
+        bounds (np.ndarray): The width, height and depth of the bin.
+        item (Item): The item to place.
+        fix_point (bool): Whether to settle candidates and apply the stacking rules.
+        check_stable (bool): Whether to apply the support rules.
+        support_surface_ratio (float): Minimum acceptable support surface ratio.
+        score (str): One of `SCORES`.
+        limit (int): The number of placements to return.
+
+    Returns:
+        list: Up to `limit` (position, rotation) pairs, best first.
+    """
+    rotations = np.array(item.rotations)
+    whd = np.array([item.width, item.height, item.depth], dtype=float)
+    pivots = _pivots(rows[1:], stackable[1:], item.position)
+    lo = np.repeat(pivots, len(rotations), axis=0)
+    dims = np.tile(whd[WHD_ORDER[rotations]], (len(pivots), 1))
+    rotations = np.tile(rotations, len(pivots))
+
+    keep = np.all((lo >= 0) & (lo + dims <= bounds), axis=1)
+    lo, dims, rotations = lo[keep], dims[keep], rotations[keep]
+
+    chunk = max(1, CHUNK_CELLS // len(rows))
+    ranked = []
+    for start in range(0, len(lo), chunk):
+        c_lo, c_dims, c_rot = lo[start:start + chunk], dims[start:start + chunk], rotations[start:start + chunk]
+        keep = ~_collides(c_lo, c_lo + c_dims, rows)
+        c_lo, c_dims, c_rot = c_lo[keep], c_dims[keep], c_rot[keep]
+        if fix_point and len(c_lo):
+            c_lo = _settle(c_lo, c_dims, rows)
+            keep = _stackable(c_lo, c_lo + c_dims, rows, stackable, item.stackable)
+            if check_stable:
+                keep &= _stable(c_lo, c_lo + c_dims, rows, support_surface_ratio)
+            c_lo, c_dims, c_rot = c_lo[keep], c_dims[keep], c_rot[keep]
+        if len(c_lo):
+            top = np.argsort(-SCORES[score](bounds, c_lo, c_lo + c_dims, rows[1:]), kind='stable')[:limit]
+            ranked.append((c_lo[top], c_dims[top], c_rot[top]))
+    if not ranked:
+        return []
+
+    lo, dims, rotations = (np.concatenate(column) for column in zip(*ranked))
+    # scores may be ranks within one call, so the leaders of every chunk are scored again together
+    if len(ranked) > 1:
+        top = np.argsort(-SCORES[score](bounds, lo, lo + dims, rows[1:]), kind='stable')[:limit]
+        lo, rotations = lo[top], rotations[top]
+    return [(position, int(rotation)) for position, rotation in zip(lo.tolist(), rotations.tolist())]
+
+
+def best_placement(bin: Bin, item: Item, score: str = 'height'):
+    """
+    Finds the best placement of an item in a bin with `rank_placements`,
+    using the bin's settings and weight limit.
+
+    Args:
+        bin (Bin): The bin, with its `fit_items` rows in the order of its items.
+        item (Item): The item to place.
+        score (str): One of `SCORES`.
+
+    Returns:
+        tuple: The position and rotation of the best placement, None if the item fits nowhere.
+    """
+    if score not in SCORES:
+        raise ValueError("unknown placement score: {}".format(score))
+    if bin.get_total_weight() + item.weight > bin.max_weight:
+        return None
+    stackable = np.array([True] + [placed.stackable for placed in bin.items], dtype=bool)
+    ranked = rank_placements(bin.fit_items, stackable, np.array([bin.width, bin.height, bin.depth], dtype=float),
+                             item, bin.fix_point, bin.check_stable, bin.support_surface_ratio, score)
+    return ranked[0] if ranked else None
@@ -0,0 +1,258 @@
+import json
+import os
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .bin import Bin
+from .item import Item
+from .packer import Packer
+from .serialization import StringTable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# one row per placed item, as stored in a ResultArchive
+PLACEMENT_DTYPE = np.dtype([
+    ('pack', np.int64),
+    ('bin', np.int32),
+    ('item', np.int32),
+    ('x', np.float64),
+    ('y', np.float64),
+    ('z', np.float64),
+    ('w', np.float64),
+    ('h', np.float64),
+    ('d', np.float64),
+    ('rotation', np.int8),
+    ('weight', np.float64),
+    ('group', np.uint32),
+])
+
+ARCHIVE_MAGIC = b'P3DA'
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = 16
+
+
+class PackingResult:
+    """
+    A class to hold the placements of a packing as NumPy columns.
+    """
+
+    def __init__(self, bins: list[Bin], include_corners: bool = True, items: list[Item] = None):
+        """
+        Initializes a PackingResult object from packed bins.
+
+        Args:
+            bins (list[Bin]): The packed bins.
+            include_corners (bool): Whether corner items count as placements, as they do in `bin.items`.
+            items (list[Item], optional): The items of the order, in input order. The 'item' column holds the index
+                of every placed item among them, -1 for corners and for items not among them.
+        """
+        self.bin_names = [bin.name for bin in bins]
+        self.bin_whd = np.array([[bin.width, bin.height, bin.depth] for bin in bins], dtype=float).reshape(-1, 3)
+        self.bin_max_weight = np.array([bin.max_weight for bin in bins], dtype=float)
+        self.strings = StringTable()
+
+        placed = [(idx, item) for idx, bin in enumerate(bins) for item in bin.items
+                  if include_corners or item.group != 'corner']
+        n = len(placed)
+        self.placements = np.zeros(n, dtype=PLACEMENT_DTYPE)
+        self.partno = np.zeros(n, dtype=np.uint32)
+        if not n:
+            return
+
+        position = np.array([item.position for _, item in placed], dtype=float)
+        dimension = np.array([item.get_dimension() for _, item in placed], dtype=float)
+        p = self.placements
+        p['bin'] = [idx for idx, _ in placed]
+        row = {item.id: idx for idx, item in enumerate(items or [])}
+        p['item'] = [row.get(item.id, -1) for _, item in placed]
+        p['x'], p['y'], p['z'] = position.T
+        p['w'], p['h'], p['d'] = dimension.T
+        p['rotation'] = [item.rotation for _, item in placed]
+        p['weight'] = [item.weight for _, item in placed]
+        p['group'] = [self.strings.add(item.group) for _, item in placed]
+        self.partno[:] = [self.strings.add(item.partno) for _, item in placed]
+
+    @classmethod
+    def from_packer(cls, packer: Packer, include_corners: bool = True):
+        """
+        Builds the result of a packer after packing, indexing the items in the order they were added.
+
+        Args:
+            packer (Packer): The packer.
+            include_corners (bool): Whether corner items count as placements.
+
+        Returns:
+            PackingResult: The columnar result.
+        """
+        return cls(packer.bins, include_corners, packer.packed_items)
+
+    def __len__(self):
+        return len(self.placements)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a placement column.
+
+        Args:
+            name (str): The column name, one of `PLACEMENT_DTYPE` fields.
+
+        Returns:
+            np.ndarray: The column.
+        """
+        return self.placements[name]
+
+    def item_volume(self) -> np.ndarray:
+        """
+        Calculates the volume of every placed item.
+
+        Returns:
+            np.ndarray: The item volumes.
+        """
+        p = self.placements
+        return p['w'] * p['h'] * p['d']
+
+    def bin_volume(self) -> np.ndarray:
+        """
+        Calculates the volume of every bin.
+
+        Returns:
+            np.ndarray: The bin volumes.
+        """
+        return self.bin_whd.prod(axis=1)
+
+    def packed_volume(self) -> np.ndarray:
+        """
+        Calculates the volume packed in every bin.
+
+        Returns:
+            np.ndarray: The packed volume per bin.
+        """
+        return np.bincount(self.placements['bin'], weights=self.item_volume(), minlength=len(self.bin_names))
+
+    def packed_weight(self) -> np.ndarray:
+        """
+        Calculates the weight packed in every bin.
+
+        Returns:
+            np.ndarray: The packed weight per bin.
+        """
+        return np.bincount(self.placements['bin'], weights=self.placements['weight'], minlength=len(self.bin_names))
+
+    def utilization(self) -> np.ndarray:
+        """
+        Calculates the space utilization of every bin, in percent.
+
+        Returns:
+            np.ndarray: The utilization per bin.
+        """
+        return self.packed_volume() / self.bin_volume() * 100
+
+    def residual_volume(self) -> np.ndarray:
+        """
+        Calculates the empty volume left in every bin.
+
+        Returns:
+            np.ndarray: The residual volume per bin.
+        """
+        return self.bin_volume() - self.packed_volume()
+
+    def group_summary(self) -> dict:
+        """
+        Summarizes the placements per item group.
+
+        Returns:
+            dict: The group names and, per group, the item count, volume and weight.
+        """
+        codes, inverse = np.unique(self.placements['group'], return_inverse=True)
+        return {
+            'group': [self.strings.strings[code] for code in codes],
+            'count': np.bincount(inverse, minlength=len(codes)),
+            'volume': np.bincount(inverse, weights=self.item_volume(), minlength=len(codes)),
+            'weight': np.bincount(inverse, weights=self.placements['weight'], minlength=len(codes)),
+        }
+
+    def to_dataframe(self) -> 'pd.DataFrame':
+        """
+        Exports the placements to a pandas DataFrame, with partno, group and bin names as strings.
+
+        Returns:
+            pd.DataFrame: One row per placed item.
+        """
+        import pandas as pd
+
+        strings = np.array(self.strings.strings, dtype=object)
+        frame = pd.DataFrame({name: self.placements[name] for name in PLACEMENT_DTYPE.names if name != 'pack'})
+        frame['group'] = strings[self.placements['group']] if len(self) else []
+        frame.insert(2, 'partno', strings[self.partno] if len(self) else [])
+        frame.insert(1, 'bin_name', np.array(self.bin_names, dtype=object)[self.placements['bin']])
+        return frame
+
+
+class ResultArchive:
+    """
+    A class to append packing results to a memory-mapped file of fixed-width placement records.
+
+    Group names are kept in a string table next to the archive (`<path>.groups`, one JSON string per line).
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes a ResultArchive object, creating the file if needed.
+
+        Args:
+            path (str): The archive file.
+        """
+        self.path = path
+        self.groups = StringTable()
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(ARCHIVE_MAGIC + ARCHIVE_VERSION.to_bytes(4, 'little') + bytes(ARCHIVE_HEADER - 8))
+        else:
+            with open(path, 'rb') as f:
+                header = f.read(ARCHIVE_HEADER)
+            if header[:4] != ARCHIVE_MAGIC or int.from_bytes(header[4:8], 'little') != ARCHIVE_VERSION:
+                raise ValueError("not a py3dbp result archive: {}".format(path))
+            if os.path.exists(path + '.groups'):
+                with open(path + '.groups', encoding='utf-8') as f:
+                    self.groups = StringTable([json.loads(line) for line in f])
+
+    def __len__(self):
+        return (os.path.getsize(self.path) - ARCHIVE_HEADER) // PLACEMENT_DTYPE.itemsize
+
+    def append(self, result: PackingResult, pack: int) -> int:
+        """
+        Appends the placements of a result.
+
+        Args:
+            result (PackingResult): The result.
+            pack (int): The id stored in the `pack` column of every record.
+
+        Returns:
+            int: The number of records in the archive.
+        """
+        records = result.placements.copy()
+        records['pack'] = pack
+        known = len(self.groups.strings)
+        used = np.unique(records['group'])
+        codes = np.zeros(len(result.strings.strings), dtype=np.uint32)
+        codes[used] = [self.groups.add(result.strings.strings[code]) for code in used]
+        records['group'] = codes[records['group']]
+        if len(self.groups.strings) > known:
+            with open(self.path + '.groups', 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(name) + '\n' for name in self.groups.strings[known:])
+        with open(self.path, 'ab') as f:
+            f.write(records.tobytes())
+        return len(self)
+
+    def read(self) -> np.ndarray:
+        """
+        Maps the records of the archive without loading them.
+
+        Returns:
+            np.ndarray: A read-only memory-mapped array of `PLACEMENT_DTYPE` records.
+        """
+        if not len(self):
+            return np.zeros(0, dtype=PLACEMENT_DTYPE)
+        return np.memmap(self.path, dtype=PLACEMENT_DTYPE, mode='r', offset=ARCHIVE_HEADER, shape=(len(self),))
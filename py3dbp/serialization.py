@@ -0,0 +1,437 @@
+import json
+import struct
+import zlib
+from uuid import UUID
+
+import numpy as np
+
+from .bin import Bin
+from .item import Item
+from .placement import WHD_ORDER
+
+FORMAT_VERSION = 1
+
+# binary layout: magic, binary version, header length, JSON header, compressed arrays
+MAGIC = b'P3DB'
+BINARY_VERSION = 2
+_PREFIX = struct.Struct('<4sHI')
+
+# fixed-width columns of the binary item table, also the layout of `shared.SharedItemTable`
+ITEM_COLUMNS = [
+    ('dims', np.float64, (3,)),
+    ('position', np.float64, (3,)),
+    ('rotation', np.int8, ()),
+    ('rotations', np.int8, (6,)),
+    ('weight', np.float64, ()),
+    ('priority', np.int64, ()),
+    ('loadbear', np.int64, ()),
+    ('flags', np.uint8, ()),
+    ('strings', np.uint32, (4,)),
+    ('id', np.uint8, (16,)),
+]
+
+# the item table of each binary version, version 1 stored loadbear as a float
+_BINARY_COLUMNS = {
+    1: [(name, np.float64 if name == 'loadbear' else dtype, shape) for name, dtype, shape in ITEM_COLUMNS],
+    2: ITEM_COLUMNS,
+}
+
+_UPSIDEDOWN = 1
+_STACKABLE = 2
+
+_BIN_SETTINGS = ['fix_point', 'check_stable', 'support_surface_ratio', 'gravity']
+
+
+def item_to_dict(item: Item, placed: bool = False) -> dict:
+    """
+    Converts an item to a JSON-compatible dictionary.
+
+    Args:
+        item (Item): The item to convert.
+        placed (bool): Whether to include the position and rotation of the item.
+
+    Returns:
+        dict: The item's attributes.
+    """
+    data = {
+        'id': item.id.hex,
+        'partno': item.partno,
+        'group': item.group,
+        'type': item.type,
+        'whd': [item.width, item.height, item.depth],
+        'weight': item.weight,
+        'priority': item.priority,
+        'loadbear': item.loadbear,
+        'upsidedown': item.upsidedown,
+        'color': item.color,
+        'stackable': item.stackable,
+        'rotations': list(item.rotations),
+    }
+    if placed:
+        data['position'] = list(item.position)
+        data['rotation'] = item.rotation
+    return data
+
+
+def item_from_dict(data: dict) -> Item:
+    """
+    Builds an item from a dictionary created by `item_to_dict` or written by hand.
+
+    Only `partno` and `whd` are required, the other attributes fall back to the
+    defaults used throughout the examples.
+
+    Args:
+        data (dict): The item's attributes.
+
+    Returns:
+        Item: The rebuilt item.
+    """
+    item = Item(
+        partno=data['partno'],
+        group=data.get('group', ''),
+        type=data.get('type', 'cube'),
+        whd=tuple(data['whd']),
+        weight=data.get('weight', 0),
+        priority=data.get('priority', 1),
+        loadbear=data.get('loadbear', 100),
+        upsidedown=data.get('upsidedown', True),
+        color=data.get('color', 'gray'),
+        stackable=data.get('stackable', True),
+        rotations=data.get('rotations')
+    )
+    if data.get('rotations') is not None:
+        item.rotations = list(data['rotations'])
+    if 'id' in data:
+        item.id = UUID(hex=data['id'])
+    if 'position' in data:
+        item.position = list(data['position'])
+    if 'rotation' in data:
+        item.rotation = data['rotation']
+    return item
+
+
+def bin_to_dict(bin: Bin) -> dict:
+    """
+    Converts a bin, its placed items and its unfitted items to a JSON-compatible dictionary.
+
+    Args:
+        bin (Bin): The bin to convert.
+
+    Returns:
+        dict: The bin's attributes and content.
+    """
+    return {
+        'name': bin.name,
+        'whd': [bin.width, bin.height, bin.depth],
+        'max_weight': bin.max_weight,
+        'corner': bin.corner,
+        'put_type': bin.put_type,
+        'fix_point': bin.fix_point,
+        'check_stable': bin.check_stable,
+        'support_surface_ratio': bin.support_surface_ratio,
+        'gravity': list(bin.gravity),
+        'items': [item_to_dict(item, placed=True) for item in bin.items],
+        'unfitted_items': [item_to_dict(item) for item in bin.unfitted_items],
+    }
+
+
+def bin_from_dict(data: dict) -> Bin:
+    """
+    Builds a bin from a dictionary created by `bin_to_dict` or written by hand.
+
+    Placed items are restored together with the bin's `fit_items`, so the bin
+    can be handed to a `Packer` to continue packing.
+
+    Args:
+        data (dict): The bin's attributes and content.
+
+    Returns:
+        Bin: The rebuilt bin.
+    """
+    bin = Bin(
+        name=data['name'],
+        whd=tuple(data['whd']),
+        max_weight=data['max_weight'],
+        corner=data.get('corner', 0),
+        put_type=data.get('put_type', 1)
+    )
+    for key in _BIN_SETTINGS:
+        if key in data:
+            setattr(bin, key, data[key])
+    bin.load_items([item_from_dict(item) for item in data.get('items', [])])
+    bin.unfitted_items = [item_from_dict(item) for item in data.get('unfitted_items', [])]
+    return bin
+
+
+def _fit_rows(table: np.ndarray) -> np.ndarray:
+    """
+    Computes the `fit_items` rows of placed items from their item table.
+
+    Args:
+        table (np.ndarray): The item table of the placed items.
+
+    Returns:
+        np.ndarray: (n, 6) array of [x0, x1, y0, y1, z0, z1] rows.
+    """
+    lower = table['position']
+    upper = lower + np.take_along_axis(table['dims'], WHD_ORDER[table['rotation']], axis=1)
+    return np.stack([lower, upper], axis=2).reshape(-1, 6)
+
+
+def to_dict(bins: list[Bin], unfit_items: list[Item] = ()) -> dict:
+    """
+    Converts a packing result to a JSON-compatible dictionary.
+
+    Args:
+        bins (list[Bin]): The packed bins.
+        unfit_items (list[Item]): The items that were not packed in any bin.
+
+    Returns:
+        dict: The versioned packing result.
+    """
+    return {
+        'version': FORMAT_VERSION,
+        'bins': [bin_to_dict(bin) for bin in bins],
+        'unfit_items': [item_to_dict(item) for item in unfit_items],
+    }
+
+
+def from_dict(data: dict) -> tuple[list[Bin], list[Item]]:
+    """
+    Builds a packing result from a dictionary created by `to_dict`.
+
+    Args:
+        data (dict): The versioned packing result.
+
+    Returns:
+        tuple: The packed bins and the unfit items.
+    """
+    _check_version(data.get('version'))
+    return [bin_from_dict(bin) for bin in data['bins']], [item_from_dict(item) for item in data['unfit_items']]
+
+
+def to_json(bins: list[Bin], unfit_items: list[Item] = ()) -> str:
+    """
+    Serializes a packing result to JSON.
+
+    Args:
+        bins (list[Bin]): The packed bins.
+        unfit_items (list[Item]): The items that were not packed in any bin.
+
+    Returns:
+        str: The JSON document.
+    """
+    return json.dumps(to_dict(bins, unfit_items))
+
+
+def from_json(text: str) -> tuple[list[Bin], list[Item]]:
+    """
+    Deserializes a packing result from JSON.
+
+    Args:
+        text (str): The JSON document created by `to_json`.
+
+    Returns:
+        tuple: The packed bins and the unfit items.
+    """
+    return from_dict(json.loads(text))
+
+
+def _check_version(version: int):
+    """
+    Rejects data written by an unknown format version.
+
+    Args:
+        version (int): The format version of the data.
+    """
+    if version != FORMAT_VERSION:
+        raise ValueError("unsupported serialization format version: {}".format(version))
+
+
+class StringTable:
+    """
+    A class to intern the strings of an item table.
+    """
+
+    def __init__(self, strings: list[str] = None):
+        """
+        Initializes a StringTable object.
+
+        Args:
+            strings (list[str], optional): Strings already in the table, in index order.
+        """
+        self.strings = list(strings or [])
+        self.index = {s: i for i, s in enumerate(self.strings)}
+
+    def add(self, string: str) -> int:
+        """
+        Returns the index of a string, adding it to the table if needed.
+
+        Args:
+            string (str): The string to intern.
+
+        Returns:
+            int: The index of the string.
+        """
+        idx = self.index.get(string)
+        if idx is None:
+            idx = self.index[string] = len(self.strings)
+            self.strings.append(string)
+        return idx
+
+
+def items_to_table(items: list[Item], strings: StringTable) -> np.ndarray:
+    """
+    Encodes items into a structured array of fixed-width columns.
+
+    Partno, group, type and color are stored as indexes into the string table.
+
+    Args:
+        items (list[Item]): The items to encode.
+        strings (StringTable): The string table receiving the item strings.
+
+    Returns:
+        np.ndarray: The item table.
+    """
+    table = np.zeros(len(items), dtype=ITEM_COLUMNS)
+    if not items:
+        return table
+    table['dims'] = [(item.width, item.height, item.depth) for item in items]
+    table['position'] = [item.position for item in items]
+    table['rotation'] = [item.rotation for item in items]
+    table['rotations'] = [list(item.rotations)[:6] + [-1] * (6 - len(item.rotations)) for item in items]
+    table['weight'] = [item.weight for item in items]
+    table['priority'] = [item.priority for item in items]
+    table['loadbear'] = [item.loadbear for item in items]
+    table['flags'] = [(_UPSIDEDOWN if item.upsidedown else 0) | (_STACKABLE if item.stackable else 0)
+                      for item in items]
+    table['strings'] = [(strings.add(item.partno), strings.add(item.group), strings.add(item.type),
+                         strings.add(item.color)) for item in items]
+    table['id'] = np.frombuffer(b''.join(item.id.bytes for item in items), dtype=np.uint8).reshape(-1, 16)
+    return table
+
+
+def items_from_table(table: np.ndarray, strings: list[str]) -> list[Item]:
+    """
+    Decodes items from a structured array created by `items_to_table`.
+
+    Args:
+        table (np.ndarray): The item table.
+        strings (list[str]): The string table, in index order.
+
+    Returns:
+        list[Item]: The decoded items, carrying their position and rotation.
+    """
+    # interned rotation lists are shared by identical items
+    rotation_lists = {}
+    for key in set(map(bytes, table['rotations'])):
+        rotation_lists[key] = [r for r in np.frombuffer(key, dtype=np.int8).tolist() if r >= 0]
+
+    items = []
+    for dims, position, rotation, rotations, weight, priority, loadbear, flags, names, uid in zip(
+            table['dims'].tolist(), table['position'].tolist(), table['rotation'].tolist(),
+            map(bytes, table['rotations']), table['weight'].tolist(), table['priority'].tolist(),
+            table['loadbear'].tolist(), table['flags'].tolist(), table['strings'].tolist(), map(bytes, table['id'])):
+        item = Item(strings[names[0]], strings[names[1]], strings[names[2]], dims, weight, priority, loadbear,
+                    bool(flags & _UPSIDEDOWN), strings[names[3]], stackable=bool(flags & _STACKABLE))
+        item.rotations = list(rotation_lists[rotations])
+        item.position = position
+        item.rotation = rotation
+        item.id = UUID(bytes=uid)
+        items.append(item)
+    return items
+
+
+def to_bytes(bins: list[Bin], unfit_items: list[Item] = ()) -> bytes:
+    """
+    Serializes a packing result to a compact binary form.
+
+    Every item of the result goes into one fixed-width table (positions,
+    dimensions, rotations, weights, ids) with its strings interned in a shared
+    string table. The bins and the table layout are described by a small JSON
+    header.
+
+    Args:
+        bins (list[Bin]): The packed bins.
+        unfit_items (list[Item]): The items that were not packed in any bin.
+
+    Returns:
+        bytes: The serialized result.
+    """
+    strings = StringTable()
+    items = []
+    header_bins = []
+    for bin in bins:
+        header = {key: getattr(bin, key) for key in ['name', 'max_weight', 'corner', 'put_type'] + _BIN_SETTINGS}
+        header['whd'] = [bin.width, bin.height, bin.depth]
+        header['items'] = len(bin.items)
+        header['unfitted_items'] = len(bin.unfitted_items)
+        header_bins.append(header)
+        items.extend(bin.items)
+        items.extend(bin.unfitted_items)
+    items.extend(unfit_items)
+
+    table = items_to_table(items, strings)
+    header = json.dumps({
+        'bins': header_bins,
+        'unfit_items': len(unfit_items),
+        'strings': strings.strings,
+    }).encode()
+    return _PREFIX.pack(MAGIC, BINARY_VERSION, len(header)) + header + zlib.compress(table.tobytes())
+
+
+def load_table(data: bytes) -> tuple[dict, np.ndarray]:
+    """
+    Reads the header and the item table of a serialized result without building
+    any `Bin` or `Item` objects.
+
+    The table holds the placed items of every bin in bin order, each followed
+    by the bin's unfitted items, then the unfit items of the result. The bin
+    entries of the header give the item counts needed to slice it.
+
+    Args:
+        data (bytes): The serialized result created by `to_bytes`.
+
+    Returns:
+        tuple: The header dictionary and the structured item table.
+    """
+    magic, version, size = _PREFIX.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a py3dbp binary packing result")
+    if version not in _BINARY_COLUMNS:
+        raise ValueError("unsupported binary format version: {}".format(version))
+
+    offset = _PREFIX.size
+    header = json.loads(data[offset:offset + size])
+    table = np.frombuffer(zlib.decompress(data[offset + size:]), dtype=_BINARY_COLUMNS[version])
+    if version != BINARY_VERSION:
+        table = table.astype(ITEM_COLUMNS)
+    return header, table
+
+
+def from_bytes(data: bytes) -> tuple[list[Bin], list[Item]]:
+    """
+    Deserializes a packing result created by `to_bytes`.
+
+    Args:
+        data (bytes): The serialized result.
+
+    Returns:
+        tuple: The packed bins and the unfit items.
+    """
+    header, table = load_table(data)
+    items = items_from_table(table, header['strings'])
+
+    bins = []
+    start = 0
+    for spec in header['bins']:
+        bin = Bin(spec['name'], tuple(spec['whd']), spec['max_weight'], spec['corner'], spec['put_type'])
+        for key in _BIN_SETTINGS:
+            setattr(bin, key, spec[key])
+        placed = start + spec['items']
+        unfitted = placed + spec['unfitted_items']
+        bin.load_items(items[start:placed], _fit_rows(table[start:placed]))
+        bin.unfitted_items = items[placed:unfitted]
+        start = unfitted
+        bins.append(bin)
+    return bins, items[start:start + header['unfit_items']]
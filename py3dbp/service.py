@@ -0,0 +1,321 @@
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .batch import pack_chunk
+
+
+def _warm_worker():
+    """
+    Imports the packing modules in a worker process before the first request.
+    """
+    from . import bin, item, packer, serialization  # noqa: F401
+
+
+class PackService:
+    """
+    A class to serve packing requests over HTTP on a local port.
+
+    `POST /pack` takes an order as accepted by `python -m py3dbp` and answers
+    with the serialized bins. Requests are queued, grouped into micro-batches
+    and packed by a pool of warm worker processes. `GET /health` reports the
+    queue state.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, workers: int = None, max_queue: int = 1024,
+                 max_batch: int = 32, batch_wait: float = 0.005, timeout: float = 30.0):
+        """
+        Initializes a PackService object.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 picks a free port.
+            workers (int, optional): The number of worker processes. Defaults to the CPU count.
+            max_queue (int): The number of waiting requests before new ones are rejected with 503.
+            max_batch (int): The maximum number of requests sent to a worker at once.
+            batch_wait (float): Seconds to wait for more requests before dispatching a partial batch.
+            timeout (float): Default seconds a request may wait for its result before a 504.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+        self.requests = queue.Queue(max_queue)
+        self.in_flight = threading.BoundedSemaphore(2 * self.workers)
+        self.executor = None
+        self.running = False
+        self.stats = {'accepted': 0, 'rejected': 0, 'timed_out': 0, 'batches': 0}
+        # the counters are updated from the handler threads and the dispatcher
+        self._stats_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._threads = []
+
+    @property
+    def url(self) -> str:
+        """
+        Returns the base URL the service listens on.
+
+        Returns:
+            str: The base URL.
+        """
+        host, port = self.server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        """
+        Starts the worker pool, the dispatcher and the HTTP server in background threads.
+        """
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        for future in [self.executor.submit(_warm_worker) for _ in range(self.workers)]:
+            future.result()
+        self.running = True
+        self._threads = [
+            threading.Thread(target=self._dispatch, daemon=True),
+            threading.Thread(target=self.server.serve_forever, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """
+        Stops the HTTP server, the dispatcher and the worker pool.
+        """
+        self.running = False
+        self.server.shutdown()
+        self.server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self.executor.shutdown(cancel_futures=True)
+        while not self.requests.empty():
+            self._fail([self.requests.get_nowait()])
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, order: dict) -> Future:
+        """
+        Queues an order for packing.
+
+        Args:
+            order (dict): The order.
+
+        Returns:
+            Future: The future result of the order.
+
+        Raises:
+            queue.Full: If the request queue is full.
+        """
+        future = Future()
+        self.requests.put_nowait((order, future))
+        return future
+
+    def health(self) -> dict:
+        """
+        Reports the state of the service.
+
+        Returns:
+            dict: The queue length, the limits and the request counters.
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return dict(stats, status='ok' if self.running else 'stopped', queued=self.requests.qsize(),
+                    max_queue=self.requests.maxsize, workers=self.workers)
+
+    def _count(self, name: str):
+        """
+        Increments a request counter.
+
+        Args:
+            name (str): The counter, one of the `stats` keys.
+        """
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _next_batch(self) -> list:
+        """
+        Collects the next micro-batch of live requests from the queue.
+
+        Returns:
+            list: (order, future) pairs, empty if no request arrived in time.
+        """
+        try:
+            batch = [self.requests.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait())
+            except queue.Empty:
+                break
+        # requests whose caller already gave up are dropped here
+        return [(order, future) for order, future in batch if future.set_running_or_notify_cancel()]
+
+    def _dispatch(self):
+        """
+        Sends micro-batches to the worker pool until the service stops.
+        """
+        while self.running:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            while not self.in_flight.acquire(timeout=0.1):
+                if not self.running:
+                    self._fail(batch)
+                    return
+            self._count('batches')
+            result = self.executor.submit(pack_chunk, [order for order, _ in batch])
+            result.add_done_callback(lambda result, batch=batch: self._deliver(batch, result))
+
+    def _deliver(self, batch: list, result: Future, release: bool = True):
+        """
+        Hands the results of a finished micro-batch to the waiting requests.
+
+        A batch that failed as a whole is packed again one order at a time,
+        so that an order breaking its worker call only fails its own request.
+
+        Args:
+            batch (list): The (order, future) pairs of the batch.
+            result (Future): The worker's result for the batch.
+            release (bool): Whether the batch holds an `in_flight` slot to release.
+        """
+        if release:
+            self.in_flight.release()
+        if result.cancelled():
+            self._fail(batch)
+        elif result.exception() is not None and len(batch) > 1:
+            for pair in batch:
+                try:
+                    single = self.executor.submit(pack_chunk, [pair[0]])
+                except RuntimeError:
+                    self._fail([pair])
+                    continue
+                single.add_done_callback(lambda single, pair=pair: self._deliver([pair], single, release=False))
+        elif result.exception() is not None:
+            batch[0][1].set_exception(result.exception())
+        else:
+            for (_, future), packed in zip(batch, result.result()):
+                future.set_result(packed)
+
+    def _fail(self, batch: list):
+        """
+        Fails the requests of a batch that will not be packed because the service stopped.
+
+        Args:
+            batch (list): The (order, future) pairs of the batch.
+        """
+        for _, future in batch:
+            if future.running() or future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError('service stopped'))
+
+    def _handler(self):
+        """
+        Builds the HTTP request handler bound to this service.
+
+        Returns:
+            type: The request handler class.
+        """
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, body: dict, headers: dict = None):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if urlparse(self.path).path == '/health':
+                    self._reply(200, service.health())
+                else:
+                    self._reply(404, {'error': 'not found'})
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if url.path != '/pack':
+                    self._reply(404, {'error': 'not found'})
+                    return
+                try:
+                    order = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                    timeout = float(parse_qs(url.query).get('timeout', [service.timeout])[0])
+                except ValueError as e:
+                    self._reply(400, {'error': str(e)})
+                    return
+                # malformed orders are rejected here, before they share a micro-batch with others
+                if not (isinstance(order, dict) and isinstance(order.get('bins'), list)
+                        and isinstance(order.get('items'), list)):
+                    self._reply(400, {'error': 'an order must be an object with bins and items lists'})
+                    return
+
+                try:
+                    future = service.submit(order)
+                except queue.Full:
+                    service._count('rejected')
+                    self._reply(503, {'error': 'too many pending requests'}, {'Retry-After': '1'})
+                    return
+                service._count('accepted')
+
+                try:
+                    result = future.result(timeout)
+                except TimeoutError:
+                    future.cancel()
+                    service._count('timed_out')
+                    self._reply(504, {'error': 'timed out after {}s'.format(timeout)})
+                except Exception as e:
+                    self._reply(500, {'error': str(e)})
+                else:
+                    self._reply(422 if 'error' in result else 200, result)
+
+        return Handler
+
+
+def main(argv: list[str] = None):
+    """
+    Runs the packing service until interrupted.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Defaults to `sys.argv`.
+    """
+    parser = argparse.ArgumentParser(prog='python -m py3dbp.service', description=main.__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-queue', type=int, default=1024)
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    service = PackService(args.host, args.port, args.workers, args.max_queue, args.max_batch, timeout=args.timeout)
+    service.start()
+    print('serving on', service.url)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+
+
+if __name__ == '__main__':
+    main()
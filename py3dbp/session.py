@@ -0,0 +1,64 @@
+import copy
+
+from .bin import Bin
+from .item import Item
+from .packer import Packer
+
+
+class PackSession:
+    """
+    A class to pack many orders into the same set of bins, reusing the bins,
+    their row buffers and corner items and the packer between solves.
+
+    The packer returned by `solve` and its bins are reset by the next solve:
+    read or serialize the result before solving again.
+    """
+
+    def __init__(self, bins: list[Bin], **options):
+        """
+        Initializes a PackSession object.
+
+        Args:
+            bins (list[Bin]): The empty bin templates. They are copied once, the templates themselves are not packed.
+            **options: Default `Packer.pack` options for every solve.
+        """
+        if any(bin.items for bin in bins):
+            raise ValueError("session bins must be empty")
+        self.bins = copy.deepcopy(bins)
+        self.settings = [(bin.fix_point, bin.check_stable, bin.support_surface_ratio) for bin in bins]
+        self.options = options
+        self.packer = Packer()
+        self.solves = 0
+
+    def reset(self):
+        """
+        Empties the bins and the packer without freeing their buffers.
+        """
+        for bin, settings in zip(self.bins, self.settings):
+            bin.clear_bin()
+            bin.unfitted_items = []
+            bin.gravity = []
+            bin.fix_point, bin.check_stable, bin.support_surface_ratio = settings
+        packer = self.packer
+        packer.bins = list(self.bins)
+        packer.items = []
+        packer.unfit_items = []
+        packer.total_items = 0
+        packer.binding = []
+
+    def solve(self, items: list[Item], **options) -> Packer:
+        """
+        Packs an order into the session's bins.
+
+        Args:
+            items (list[Item]): The items of the order. They are not modified.
+            **options: `Packer.pack` options overriding the session defaults.
+
+        Returns:
+            Packer: The session's packer holding the packed bins.
+        """
+        self.reset()
+        self.packer.add_items(items)
+        self.packer.pack(**dict(self.options, **options))
+        self.solves += 1
+        return self.packer
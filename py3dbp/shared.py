@@ -0,0 +1,179 @@
+import copy
+import json
+import struct
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .bin import Bin
+from .item import Item
+from .packer import Packer
+from .serialization import ITEM_COLUMNS, StringTable, items_from_table, items_to_table
+
+# shared block layout: magic, format version, item count, string table size, item table, JSON string table
+SHARED_MAGIC = b'P3DS'
+SHARED_VERSION = 1
+_HEADER = struct.Struct('<4sHxxQQ')
+
+# one row per placed item, as returned by `pack_subset`
+SUBSET_PLACEMENT_DTYPE = np.dtype([
+    ('item', np.int32),
+    ('bin', np.int32),
+    ('position', np.float64, (3,)),
+    ('rotation', np.int8),
+])
+
+# tables attached by this process, by block name
+_attached = {}
+
+
+class SharedItemTable:
+    """
+    A class to publish an item set once in shared memory, as the fixed-width
+    item table of `serialization` followed by its string table.
+
+    Pickling a SharedItemTable only sends the block name: worker processes
+    attach to the same memory and read the table without copying it.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool = False):
+        """
+        Initializes a SharedItemTable object over a shared memory block.
+        Use `publish` or `attach` to build one.
+
+        Args:
+            memory (SharedMemory): The block holding the table.
+            owner (bool): Whether this object created the block and unlinks it on close.
+        """
+        magic, version, count, size = _HEADER.unpack_from(memory.buf)
+        if magic != SHARED_MAGIC:
+            raise ValueError("not a py3dbp shared item table: {}".format(memory.name))
+        if version != SHARED_VERSION:
+            raise ValueError("unsupported shared item table version: {}".format(version))
+        self.memory = memory
+        self.owner = owner
+        self.table = np.ndarray((count,), dtype=ITEM_COLUMNS, buffer=memory.buf, offset=_HEADER.size)
+        start = _HEADER.size + self.table.nbytes
+        self.strings = json.loads(bytes(memory.buf[start:start + size]))
+
+    @classmethod
+    def publish(cls, items: list[Item], name: str = None):
+        """
+        Copies items into a new shared memory block.
+
+        Args:
+            items (list[Item]): The items to share.
+            name (str, optional): The block name. Defaults to a unique name.
+
+        Returns:
+            SharedItemTable: The owning table, to be closed when the workers are done.
+        """
+        strings = StringTable()
+        table = items_to_table(items, strings)
+        text = json.dumps(strings.strings).encode()
+        memory = shared_memory.SharedMemory(name=name, create=True, size=_HEADER.size + table.nbytes + len(text))
+        _HEADER.pack_into(memory.buf, 0, SHARED_MAGIC, SHARED_VERSION, len(table), len(text))
+        start = _HEADER.size
+        memory.buf[start:start + table.nbytes] = table.tobytes()
+        memory.buf[start + table.nbytes:start + table.nbytes + len(text)] = text
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str):
+        """
+        Attaches to a published table. A process attaches once per table and reuses it afterwards.
+
+        Args:
+            name (str): The block name.
+
+        Returns:
+            SharedItemTable: The attached table.
+        """
+        shared = _attached.get(name)
+        if shared is None:
+            shared = _attached[name] = cls(shared_memory.SharedMemory(name=name))
+        return shared
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the name workers attach to.
+
+        Returns:
+            str: The shared memory block name.
+        """
+        return self.memory.name
+
+    def __len__(self):
+        return len(self.table)
+
+    def __reduce__(self):
+        return SharedItemTable.attach, (self.name,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def items(self, indexes: np.ndarray = None) -> list[Item]:
+        """
+        Builds the items of the table.
+
+        Args:
+            indexes (np.ndarray, optional): The rows to build. Defaults to every row.
+
+        Returns:
+            list[Item]: The items, in index order.
+        """
+        return items_from_table(self.table if indexes is None else self.table[indexes], self.strings)
+
+    def close(self):
+        """
+        Releases the table. The owner also frees the shared memory block.
+        """
+        self.table = None
+        if _attached.get(self.name) is self:
+            del _attached[self.name]
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def pack_subset(shared: SharedItemTable, bins: list[Bin], indexes: np.ndarray = None,
+                **options) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Packs some items of a shared table into copies of the given bins.
+
+    Meant to run in a worker process: only the table name, the bins and the
+    indexes are sent to it, and only placement arrays come back.
+
+    Args:
+        shared (SharedItemTable): The item table.
+        bins (list[Bin]): The empty bins to pack, left unchanged.
+        indexes (np.ndarray, optional): The table rows to pack. Defaults to every row.
+        **options: The `Packer.pack` options.
+
+    Returns:
+        tuple: A `SUBSET_PLACEMENT_DTYPE` array of the placed items, with `bin`
+        the index in `bins`, and the table rows of the unfit items.
+    """
+    indexes = np.arange(len(shared)) if indexes is None else np.asarray(indexes)
+    items = shared.items(indexes)
+    row = {item.id: idx for item, idx in zip(items, indexes.tolist())}
+
+    bins = copy.deepcopy(bins)
+    bin_index = {id(bin): idx for idx, bin in enumerate(bins)}
+    packer = Packer()
+    packer.add_bins(bins)
+    packer.add_items(items)
+    packer.pack(**options)
+
+    placed = [(row[item.id], bin_index[id(bin)], item.position, item.rotation)
+              for bin in packer.bins for item in bin.items if item.id in row]
+    placements = np.zeros(len(placed), dtype=SUBSET_PLACEMENT_DTYPE)
+    if placed:
+        placements['item'], placements['bin'], positions, placements['rotation'] = zip(*placed)
+        placements['position'] = positions
+    unfit = np.array([row[item.id] for item in packer.unfit_items], dtype=np.int32)
+    return placements, unfit
@@ -0,0 +1,273 @@
+import numpy as np
+
+from .bin import Bin
+
+# tolerance used when comparing float coordinates of touching faces
+EPSILON = 1e-6
+
+# a box spanning more grid cells than this is checked against every box instead
+MAX_CELLS_PER_BOX = 64
+
+
+class Violation:
+    """
+    A class to represent a broken packing constraint found by the validator.
+    """
+
+    BOUNDS = 'bounds'
+    OVERLAP = 'overlap'
+    WEIGHT = 'weight'
+    STACKABLE = 'stackable'
+    SUPPORT = 'support'
+
+    def __init__(self, kind: str, bin: Bin, items: list, message: str):
+        """
+        Initializes a Violation object.
+
+        Args:
+            kind (str): The kind of violation (one of the class constants).
+            bin (Bin): The bin the violation was found in.
+            items (list): The items involved in the violation.
+            message (str): A human-readable description.
+        """
+        self.kind = kind
+        self.bin = bin
+        self.items = items
+        self.message = message
+
+    def __str__(self):
+        """
+        Returns a string representation of the Violation object.
+
+        Returns:
+            str: A formatted string representation of the violation.
+        """
+        return "%s[%s] %s" % (self.bin.name, self.kind, self.message)
+
+    def __repr__(self):
+        return "Violation(%s)" % self
+
+
+def _item_boxes(items: list) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the lower and upper corners of the placed items.
+
+    Args:
+        items (list): The placed items.
+
+    Returns:
+        tuple: Two (n, 3) arrays with the lower and upper corner of every item.
+    """
+    lo = np.array([[float(v) for v in item.position] for item in items], dtype=float).reshape(-1, 3)
+    dims = np.array([[float(v) for v in item.get_dimension()] for item in items], dtype=float).reshape(-1, 3)
+    return lo, lo + dims
+
+
+def candidate_pairs(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    Finds the pairs of boxes whose closed extents may touch or overlap.
+
+    Boxes are hashed into a uniform grid sized after the median box extent and
+    sorted by cell key, so only boxes sharing a cell are paired. The few boxes
+    covering too many cells are compared against every box directly.
+
+    Args:
+        lo (np.ndarray): (n, 3) lower corners.
+        hi (np.ndarray): (n, 3) upper corners.
+
+    Returns:
+        np.ndarray: (m, 2) array of unique index pairs (i < j).
+    """
+    n = len(lo)
+    if n < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    extent = hi - lo
+    cell = float(np.median(extent[extent > 0])) if np.any(extent > 0) else 1.0
+    origin = lo.min(axis=0)
+    c0 = np.floor((lo - origin) / cell).astype(np.int64)
+    c1 = np.floor((hi - origin) / cell).astype(np.int64)
+    spans = c1 - c0 + 1
+    counts = spans.prod(axis=1)
+
+    large = counts > MAX_CELLS_PER_BOX
+    small = np.flatnonzero(~large)
+    pairs = []
+
+    if len(small) > 1:
+        # expand every small box into the cells it covers
+        s_counts = counts[small]
+        owner = np.repeat(small, s_counts)
+        local = np.arange(s_counts.sum()) - np.repeat(np.cumsum(s_counts) - s_counts, s_counts)
+        sy, sz = spans[owner, 1], spans[owner, 2]
+        dz = local % sz
+        dy = (local // sz) % sy
+        dx = local // (sz * sy)
+        cx, cy, cz = c0[owner, 0] + dx, c0[owner, 1] + dy, c0[owner, 2] + dz
+        ny, nz = c1[:, 1].max() + 2, c1[:, 2].max() + 2
+        keys = (cx * ny + cy) * nz + cz
+
+        order = np.argsort(keys, kind='stable')
+        keys, owner = keys[order], owner[order]
+        # boxes sharing a cell are adjacent after sorting; pair them by offset
+        offset = 1
+        while offset < len(keys):
+            same = np.flatnonzero(keys[offset:] == keys[:-offset])
+            if not len(same):
+                break
+            i, j = owner[same], owner[same + offset]
+            # report a pair only in the cell holding the lower corner of the
+            # intersection, so pairs sharing several cells are not duplicated
+            ref = np.floor((np.maximum(lo[i], lo[j]) - origin) / cell).astype(np.int64)
+            ref = (ref[:, 0] * ny + ref[:, 1]) * nz + ref[:, 2]
+            keep = ref == keys[same]
+            pairs.append(np.stack([i[keep], j[keep]], axis=1))
+            offset += 1
+
+    large = np.flatnonzero(large)
+    for i in large:
+        others = np.flatnonzero(np.all((lo <= hi[i] + EPSILON) & (hi >= lo[i] - EPSILON), axis=1))
+        # pairs of two large boxes are reported by the smaller index only
+        others = others[(others != i) & ~(np.isin(others, large) & (others < i))]
+        pairs.append(np.stack([np.full(len(others), i), others], axis=1))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.sort(np.concatenate(pairs), axis=1)
+
+
+def _rect_area(lo_a, hi_a, lo_b, hi_b, x: int, y: int):
+    """
+    Computes the overlapping area of two sets of boxes projected on a plane,
+    truncating coordinates to integers like `Bin._check_stability` does.
+    """
+    w = np.minimum(np.trunc(hi_a[:, x]), np.trunc(hi_b[:, x])) - np.maximum(np.trunc(lo_a[:, x]), np.trunc(lo_b[:, x]))
+    h = np.minimum(np.trunc(hi_a[:, y]), np.trunc(hi_b[:, y])) - np.maximum(np.trunc(lo_a[:, y]), np.trunc(lo_b[:, y]))
+    return np.clip(w, 0, None) * np.clip(h, 0, None)
+
+
+def validate_bin(bin: Bin, check_stable: bool = None, support_surface_ratio: float = None) -> list[Violation]:
+    """
+    Verifies that the items packed in a bin respect the packing constraints.
+
+    The checks mirror the packer: items stay inside the bin, no two items
+    intersect, the total weight stays within `max_weight`, nothing rests on a
+    non-stackable item (height axis, as in `Bin._check_overlap`) and every item
+    meets the support surface ratio or has its four vertices supported (depth
+    axis, as in `Bin._check_stability`).
+
+    Args:
+        bin (Bin): The packed bin.
+        check_stable (bool, optional): Whether to check support. Defaults to the bin's setting.
+        support_surface_ratio (float, optional): Minimum support ratio. Defaults to the bin's setting.
+
+    Returns:
+        list[Violation]: The violations found, empty if the packing is valid.
+    """
+    if check_stable is None:
+        check_stable = bin.check_stable
+    if support_surface_ratio is None:
+        support_surface_ratio = bin.support_surface_ratio
+
+    items = bin.items
+    violations = []
+
+    # summed from the items, not from the bin's running total, so that a drifted total is caught too
+    total_weight = sum(item.weight for item in items)
+    if total_weight > bin.max_weight:
+        violations.append(Violation(Violation.WEIGHT, bin, [],
+                                    "total weight %s exceeds %s" % (total_weight, bin.max_weight)))
+    if not items:
+        return violations
+
+    lo, hi = _item_boxes(items)
+    size = np.array([float(bin.width), float(bin.height), float(bin.depth)])
+
+    for i in np.flatnonzero(np.any(lo < -EPSILON, axis=1) | np.any(hi > size + EPSILON, axis=1)):
+        violations.append(Violation(Violation.BOUNDS, bin, [items[i]], "%s is out of bounds" % items[i].partno))
+
+    pairs = candidate_pairs(lo, hi)
+    a, b = pairs[:, 0], pairs[:, 1]
+
+    overlap = np.all((lo[a] < hi[b] - EPSILON) & (lo[b] < hi[a] - EPSILON), axis=1)
+    for i, j in pairs[overlap]:
+        violations.append(Violation(Violation.OVERLAP, bin, [items[i], items[j]],
+                                    "%s intersects %s" % (items[i].partno, items[j].partno)))
+
+    # plane overlap on the x-z plane and the x-y plane for touching pairs
+    xz = (lo[a, 0] < hi[b, 0]) & (lo[b, 0] < hi[a, 0]) & (lo[a, 2] < hi[b, 2]) & (lo[b, 2] < hi[a, 2])
+    stackable = np.array([item.stackable for item in items])
+    for lower, upper in ((a, b), (b, a)):
+        on_top = xz & ~stackable[lower] & (np.abs(lo[upper, 1] - hi[lower, 1]) <= EPSILON)
+        for i, j in zip(lower[on_top], upper[on_top]):
+            violations.append(Violation(Violation.STACKABLE, bin, [items[i], items[j]],
+                                        "%s is stacked on non-stackable %s" % (items[j].partno, items[i].partno)))
+
+    if check_stable:
+        violations.extend(_check_support(bin, items, lo, hi, pairs, support_surface_ratio))
+
+    return violations
+
+
+def _check_support(bin: Bin, items: list, lo: np.ndarray, hi: np.ndarray, pairs: np.ndarray,
+                   support_surface_ratio: float) -> list[Violation]:
+    """
+    Checks that every item off the floor is supported by the items below it.
+
+    Args:
+        bin (Bin): The packed bin.
+        items (list): The placed items.
+        lo (np.ndarray): (n, 3) lower corners.
+        hi (np.ndarray): (n, 3) upper corners.
+        pairs (np.ndarray): Candidate pairs from `candidate_pairs`.
+        support_surface_ratio (float): Minimum support ratio.
+
+    Returns:
+        list[Violation]: The support violations found.
+    """
+    n = len(items)
+    # (supported, supporter) pairs: the supporter's top face touches the supported item's bottom face
+    a = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    b = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    touching = np.abs(hi[b, 2] - lo[a, 2]) <= EPSILON
+    a, b = a[touching], b[touching]
+
+    base = (hi[:, 0] - lo[:, 0]) * (hi[:, 1] - lo[:, 1])
+    support = np.bincount(a, weights=_rect_area(lo[a], hi[a], lo[b], hi[b], 0, 1), minlength=n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(base > 0, support / base, 1.0)
+
+    # fall back to the four vertices check for items below the ratio
+    vertices = np.zeros((n, 4), dtype=bool)
+    corners = ((lo[a, 0], lo[a, 1]), (hi[a, 0], lo[a, 1]), (lo[a, 0], hi[a, 1]), (hi[a, 0], hi[a, 1]))
+    for k, (vx, vy) in enumerate(corners):
+        inside = (lo[b, 0] <= vx) & (vx <= hi[b, 0]) & (lo[b, 1] <= vy) & (vy <= hi[b, 1])
+        vertices[:, k] = np.bincount(a[inside], minlength=n) > 0
+
+    on_floor = np.abs(lo[:, 2]) <= EPSILON
+    corner = np.array([item.group == 'corner' for item in items])
+    unstable = ~on_floor & ~corner & (ratio < support_surface_ratio) & ~vertices.all(axis=1)
+
+    return [
+        Violation(Violation.SUPPORT, bin, [items[i]],
+                  "%s is supported on %.2f of its base" % (items[i].partno, ratio[i]))
+        for i in np.flatnonzero(unstable)
+    ]
+
+
+def validate_bins(bins: list[Bin], check_stable: bool = None, support_surface_ratio: float = None) -> list[Violation]:
+    """
+    Verifies a list of packed bins.
+
+    Args:
+        bins (list[Bin]): The packed bins.
+        check_stable (bool, optional): Whether to check support. Defaults to each bin's setting.
+        support_surface_ratio (float, optional): Minimum support ratio. Defaults to each bin's setting.
+
+    Returns:
+        list[Violation]: The violations found across all bins.
+    """
+    violations = []
+    for bin in bins:
+        violations.extend(validate_bin(bin, check_stable, support_surface_ratio))
+    return violations
@@ -1,11 +1,13 @@
-import mpl_toolkits.mplot3d.art3d as art3d
+from typing import TYPE_CHECKING
+
 import numpy as np
-from matplotlib import pyplot as plt
-from matplotlib.axes import Axes
-from matplotlib.patches import Rectangle, Circle
 
 from .constants import Type
 
+# matplotlib is imported on first use so that importing the package stays fast
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
 
 class Visualizer:
     """
@@ -39,6 +41,9 @@ class Visualizer:
             fontsize (int): Font size of the label.
             alpha (float): Transparency of the cube.
         """
+        import mpl_toolkits.mplot3d.art3d as art3d
+        from matplotlib.patches import Rectangle
+
         xx = [x, x, x + dx, x + dx, x]
         yy = [y, y + dy, y + dy, y, y]
 
@@ -88,6 +93,9 @@ class Visualizer:
             fontsize (int): Font size of the label.
             alpha (float): Transparency of the cylinder.
         """
+        import mpl_toolkits.mplot3d.art3d as art3d
+        from matplotlib.patches import Circle
+
         p = Circle((x + dx / 2, y + dy / 2), radius=dx / 2, color=color, alpha=0.5)
         p2 = Circle((x + dx / 2, y + dy / 2), radius=dx / 2, color=color, alpha=0.5)
         ax.add_patch(p)
@@ -120,6 +128,8 @@ class Visualizer:
         Returns:
             matplotlib.figure.Figure: The Matplotlib figure containing the plot.
         """
+        from matplotlib import pyplot as plt
+
         plt.figure()
         ax = plt.axes(projection='3d')
 
@@ -151,7 +161,7 @@ class Visualizer:
         return plt
 
     @staticmethod
-    def set_axes_equal(ax: Axes):
+    def set_axes_equal(ax: 'Axes'):
         """
         Adjusts the axes of a 3D plot to ensure equal scaling.
 
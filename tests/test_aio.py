@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from py3dbp.bin import Bin
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+
+
+def make_packer(count):
+    packer = Packer()
+    packer.add_bins([Bin('b{}'.format(i), (20, 15, 10), 10000) for i in range(count // 40 + 1)])
+    packer.add_items([Item('p{}'.format(i), 'g', 'cube', (2 + i % 4, 3, 2 + i % 3), 1, 1, 100, True, 'red')
+                      for i in range(count)])
+    return packer
+
+
+def packed_count(packer):
+    return sum(len(bin.items) for bin in packer.bins)
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_the_job_reports_progress_and_returns_the_packer(executor):
+    async def run():
+        packer = make_packer(60)
+        job = packer.pack_async(executor, progress_interval=0, bigger_first=True)
+        events = [event async for event in job]
+        return packer, await job, events
+
+    packer, result, events = asyncio.run(run())
+    assert result is packer
+    assert packed_count(packer) + len(packer.unfit_items) == 60
+    assert events and events[-1][1] == events[-1][2]
+
+    expected = make_packer(60)
+    expected.pack(bigger_first=True)
+    assert packed_count(packer) == packed_count(expected)
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_cancelling_stops_the_packing(executor):
+    async def run():
+        packer = make_packer(2000)
+        job = packer.pack_async(executor, progress_interval=0)
+        # wait until the packing is under way
+        await job.__anext__()
+        job.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+        # the iteration ends too
+        return packer, [event async for event in job], job
+
+    packer, _, job = asyncio.run(run())
+    assert job.task.cancelled()
+    if executor == 'thread':
+        # the worker thread stopped at its next progress hook, well before the end
+        assert job.cancelled.is_set()
+        assert packed_count(packer) < 2000
+
+
+def test_unknown_executor():
+    async def run():
+        make_packer(1).pack_async('fiber')
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+
+from py3dbp.batch import pack_order, pack_orders, read_orders
+
+ORDER = {'id': 'a', 'bins': [{'name': 'box', 'whd': [10, 10, 10], 'max_weight': 99}],
+         'items': [{'partno': 'p1', 'whd': [2, 2, 2], 'weight': 1}, {'partno': 'p2', 'whd': [3, 3, 3], 'weight': 1}]}
+
+
+def test_pack_order():
+    result = pack_order(ORDER)
+    assert result['id'] == 'a'
+    assert 'error' not in result
+    assert len(result['bins'][0]['items']) == 2
+
+
+@pytest.mark.parametrize('order', [[1, 2], 'order', None, 3, {'id': 'b'}, {'id': 'c', 'bins': 'x', 'items': []}])
+def test_pack_order_never_raises(order):
+    result = pack_order(order)
+    assert 'error' in result
+    assert result['id'] == (order.get('id') if isinstance(order, dict) else None)
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_pack_orders_keeps_going_after_bad_orders(workers):
+    orders = [ORDER, [1, 2], dict(ORDER, id='d')]
+    results = list(pack_orders(orders, workers=workers, chunksize=1))
+    assert sorted(str(result['id']) for result in results) == ['None', 'a', 'd']
+    assert sum('error' in result for result in results) == 1
+
+
+def test_read_orders_reports_bad_jsonl_lines():
+    lines = [json.dumps(ORDER), '{"id": "t", "items": [', '', json.dumps(dict(ORDER, id='e'))]
+    orders = list(read_orders(io.StringIO('\n'.join(lines) + '\n')))
+    assert [order['id'] for order in orders] == ['a', None, 'e']
+    assert orders[1]['line'] == 2
+    assert 'JSONDecodeError' in orders[1]['error']
+
+    results = list(pack_orders(orders, workers=0))
+    assert results[1] == orders[1]
+    assert 'error' not in results[0] and 'error' not in results[2]
+
+
+def test_read_orders_reports_bad_csv_rows():
+    text = ('id,bins,items,options\n'
+            'a,"{}","{}",\n'.format(json.dumps(ORDER['bins']).replace('"', '""'),
+                                     json.dumps(ORDER['items']).replace('"', '""')) +
+            'b,"[{","[]",\n'
+            'c,"[]","[]","{""bigger_first"": true}"\n')
+    orders = list(read_orders(io.StringIO(text), 'csv'))
+    assert [order['id'] for order in orders] == ['a', 'b', 'c']
+    assert orders[1]['line'] == 3 and 'error' in orders[1]
+    assert 'error' not in orders[0] and 'error' not in orders[2]
@@ -0,0 +1,166 @@
+import random
+
+import numpy as np
+
+from py3dbp.bin import Bin
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+
+
+def cube(partno, size, weight=1):
+    return Item(partno, 'test', 'cube', (size, size, size), weight, 1, 100, True, 'red')
+
+
+def state(bin):
+    return ([item.id for item in bin.items], bin.fit_items.copy(), bin.total_weight, bin.version,
+            set(bin.failed_searches), len(bin.unfitted_items))
+
+
+def assert_state(bin, expected):
+    ids, rows, total_weight, version, failed, unfitted = state(bin)
+    assert ids == expected[0]
+    assert np.array_equal(rows, expected[1])
+    assert (total_weight, version, failed, unfitted) == expected[2:]
+
+
+def fill(bin, items):
+    packer = Packer()
+    for item in items:
+        packer.pack2bin(bin, item, True, True, 0.75)
+
+
+def test_rollback_restores_the_bin_exactly():
+    bin = Bin('b', (10, 10, 10), 100)
+    fill(bin, [cube('a', 4, 2), cube('b', 3, 3)])
+    # a failed search is recorded against the current state
+    fill(bin, [cube('big', 9)])
+    assert bin.failed_searches
+    before = state(bin)
+
+    token = bin.checkpoint()
+    fill(bin, [cube('c', 2), cube('d', 2)])
+    bin.remove_items([bin.items[0]])
+    bin.rollback(token)
+    bin.commit(token)
+
+    assert_state(bin, before)
+    assert bin._log is None
+
+
+def test_nested_checkpoints():
+    bin = Bin('b', (10, 10, 10), 100)
+    fill(bin, [cube('a', 4)])
+    outer_state = state(bin)
+    outer = bin.checkpoint()
+    fill(bin, [cube('b', 3)])
+    inner_state = state(bin)
+    inner = bin.checkpoint()
+    fill(bin, [cube('c', 2)])
+    bin.remove_items([bin.items[0]])
+
+    bin.rollback(inner)
+    bin.commit(inner)
+    assert_state(bin, inner_state)
+    # the outer checkpoint is still open
+    assert bin._log is not None
+
+    fill(bin, [cube('d', 2)])
+    bin.rollback(outer)
+    bin.commit(outer)
+    assert_state(bin, outer_state)
+    assert bin._log is None
+
+
+def test_rollback_after_clear_bin():
+    bin = Bin('b', (10, 10, 10), 100, 1)
+    fill(bin, [cube('a', 4, 5), cube('b', 3, 2)])
+    before = state(bin)
+
+    token = bin.checkpoint()
+    bin.clear_bin()
+    assert bin.items == [] and bin.total_weight == 0 and len(bin.fit_items) == 1
+    fill(bin, [cube('c', 5)])
+    bin.rollback(token)
+    bin.commit(token)
+
+    assert_state(bin, before)
+
+
+def test_commit_keeps_the_changes():
+    bin = Bin('b', (10, 10, 10), 100)
+    token = bin.checkpoint()
+    fill(bin, [cube('a', 4, 5)])
+    bin.commit(token)
+
+    assert [item.partno for item in bin.items] == ['a']
+    assert bin.total_weight == 5
+    assert bin._log is None
+
+
+def settle_uncached(bin, dimension, pivot):
+    pivot = list(pivot)
+    for _ in range(3):
+        w, h, d = dimension
+        pivot[1] = bin.check_height([pivot[0], pivot[0] + w, pivot[1], pivot[1] + h, pivot[2], pivot[2] + d])
+        pivot[0] = bin.check_width([pivot[0], pivot[0] + w, pivot[1], pivot[1] + h, pivot[2], pivot[2] + d])
+        pivot[2] = bin.check_depth([pivot[0], pivot[0] + w, pivot[1], pivot[1] + h, pivot[2], pivot[2] + d])
+    return pivot
+
+
+def test_settle_cache_matches_uncached_settling(monkeypatch):
+    cached = Bin._adjust_pivot
+    mismatches = []
+
+    def checked(self, dimension, pivot):
+        expected = settle_uncached(self, dimension, pivot)
+        result = cached(self, dimension, pivot)
+        if list(result[1]) != expected:
+            mismatches.append((dimension, pivot))
+        return result
+
+    monkeypatch.setattr(Bin, '_adjust_pivot', checked)
+    rng = random.Random(3)
+    items = [Item('i{}'.format(k), 'test', 'cube', (rng.randint(5, 30), rng.randint(5, 30), rng.randint(5, 30)),
+                  1, 1, 100, True, 'red') for k in range(80)]
+    packer = Packer()
+    packer.add_bins([Bin('b0', (80, 60, 70), 1000, 3), Bin('b1', (60, 60, 60), 1000)])
+    packer.add_items(items)
+    packer.pack(bigger_first=True)
+
+    # items taken out and put back, then rolled back: the cache must follow every change
+    bin = packer.bins[0]
+    token = bin.checkpoint()
+    bin.remove_items(bin.items[-5:])
+    for item in packer.unfit_items[:10]:
+        packer.pack2bin(bin, item, True, True, 0.75)
+    bin.rollback(token)
+    bin.commit(token)
+    for item in packer.unfit_items[:10]:
+        packer.pack2bin(bin, item, True, True, 0.75)
+
+    assert bin.settle_stats()['hits'] > 0
+    assert mismatches == []
+
+
+def test_settle_cache_is_dropped_when_the_bin_changes():
+    bin = Bin('b', (10, 10, 10), 100)
+    fill(bin, [cube('a', 4)])
+    assert bin._adjust_pivot([2, 2, 2], [6, 6, 6])[1] == [0, 0, 4]
+    assert bin._adjust_pivot([2, 2, 2], [6, 6, 6])[1] == [0, 0, 4]
+    assert bin.settle_stats()['hits'] == 1
+
+    # an item put in the settled region drops the entry
+    bin.load_items([cube('b', 4).placed_at([0, 0, 4], 0)])
+    assert bin._adjust_pivot([2, 2, 2], [6, 6, 6])[1] == [4, 0, 0]
+
+    token = bin.checkpoint()
+    bin.remove_items([bin.items[-1]])
+    assert bin._adjust_pivot([2, 2, 2], [6, 6, 6])[1] == [0, 0, 4]
+    bin.rollback(token)
+    assert bin.settle_stats()['size'] == 0
+    assert bin._adjust_pivot([2, 2, 2], [6, 6, 6])[1] == [4, 0, 0]
+
+    bin.clear_bin()
+    assert bin.settle_stats()['size'] == 0
+    assert bin._adjust_pivot([2, 2, 2], [6, 6, 6])[1] == [0, 0, 0]
+    assert bin.settle_stats()['hits'] == 1
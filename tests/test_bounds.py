@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from py3dbp.bin import Bin
+from py3dbp.bounds import (dimension_bound, is_optimal, lower_bound, min_bins, oversized, volume_bound,
+                           volume_upper_bound, weight_bound)
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+
+
+def box(partno, whd, weight=1, rotations=None):
+    return Item(partno, 'test', 'cube', whd, weight, 1, 100, True, 'red', rotations=rotations)
+
+
+def bins(count, whd=(50, 50, 50), max_weight=1000):
+    return [Bin('b{}'.format(i), whd, max_weight) for i in range(count)]
+
+
+def test_min_bins():
+    assert min_bins(np.array([5, 10, 5]), 0) == 0
+    assert min_bins(np.array([5, 10, 5]), 10) == 1
+    assert min_bins(np.array([5, 10, 5]), 12) == 2
+    assert min_bins(np.array([5, 10, 5]), 21) == 4
+
+
+def test_flat_items_stack_on_the_depth_axis():
+    # two of them side by side need more than the bin on both width and height
+    items = [box('p{}'.format(i), (30, 30, 20), rotations=[0]) for i in range(7)]
+    assert volume_bound(items, bins(4)) == 2
+    assert dimension_bound(items, bins(1)[0]) == 3
+    assert lower_bound(items, bins(4)) == 3
+
+    # standing on another face, they no longer have to stack
+    turnable = [box('p{}'.format(i), (30, 30, 20)) for i in range(7)]
+    assert dimension_bound(turnable, bins(1)[0]) == 0
+    assert lower_bound(turnable, bins(4)) == 2
+
+
+def test_items_longer_than_half_the_bin_take_a_bin_each():
+    items = [box('p{}'.format(i), (30, 30, 30)) for i in range(3)]
+    assert volume_bound(items, bins(3)) == 1
+    assert dimension_bound(items, bins(1)[0]) == 3
+
+
+def test_weight_bound():
+    items = [box('p{}'.format(i), (1, 1, 1), weight=60) for i in range(5)]
+    assert weight_bound(items, bins(5, max_weight=100)) == 3
+    assert lower_bound(items, bins(5, max_weight=100)) == 3
+
+
+def test_lower_bound_skips_oversized_items_and_mixed_bins():
+    items = [box('p{}'.format(i), (30, 30, 30)) for i in range(3)] + [box('long', (60, 1, 1))]
+    assert list(oversized(items, bins(1))) == [False, False, False, True]
+    # the dimension bound needs bins of one size
+    assert lower_bound(items, bins(3) + [Bin('small', (40, 40, 40), 1000)]) == 1
+    assert lower_bound(items, bins(3)) == 3
+    assert lower_bound(items, []) == 1
+    assert lower_bound([], []) == 0
+
+
+def test_oversized():
+    items = [box('standing', (10, 60, 10), rotations=[0]), box('lying', (10, 60, 10)), box('heavy', (1, 1, 1), 2000)]
+    assert list(oversized(items, [Bin('b', (70, 50, 70), 1000)])) == [True, False, True]
+    assert list(oversized(items, [Bin('b', (70, 50, 70), 1000), Bin('tall', (10, 60, 10), 5000)])) == \
+        [False, False, False]
+
+
+def test_volume_upper_bound():
+    items = [box('a', (10, 10, 10), 2), box('b', (10, 10, 20), 5), box('c', (10, 15, 20), 10)]
+    # by volume per weight: a and b whole, then 3 of the 10 weight of c
+    assert volume_upper_bound(items, Bin('b', (20, 20, 20), 10)) == pytest.approx(1000 + 2000 + 900)
+    assert volume_upper_bound(items, Bin('b', (20, 20, 20), 100)) == pytest.approx(6000)
+
+    # a partly packed bin only has its free volume left
+    bin = Bin('b', (20, 20, 20), 100)
+    bin.load_items([box('packed', (10, 15, 20)).placed_at([0, 0, 0], 0)])
+    assert volume_upper_bound(items, bin) == pytest.approx(5000)
+    assert volume_upper_bound([], bin) == 0
+
+
+@pytest.mark.parametrize('count, optimal', [(6, True), (7, False)])
+def test_is_optimal(count, optimal):
+    packer = Packer()
+    packer.add_bins(bins(4))
+    packer.add_items([box('p{}'.format(i), (30, 30, 20), rotations=[0]) for i in range(count)])
+    packer.pack()
+
+    assert packer.lower_bound == 3
+    assert not packer.unfit_items
+    # seven need four bins, one more than the bound can prove
+    assert sum(1 for bin in packer.bins if bin.items) == (count + 1) // 2
+    assert packer.is_optimal() is optimal
+
+
+def test_an_unpacked_item_is_not_optimal():
+    items = [box('p{}'.format(i), (30, 30, 20), rotations=[0]) for i in range(3)]
+    packed = bins(2)
+    packed[0].load_items([item.placed_at([0, 0, 20 * k], 0) for k, item in enumerate(items[:2])])
+    assert not is_optimal(items, packed)
+    packed[1].load_items([items[2].placed_at([0, 0, 0], 0)])
+    assert is_optimal(items, packed)
+
+
+def test_setting_the_packed_items_forgets_the_lower_bound():
+    packer = Packer()
+    packer.add_bins(bins(4))
+    packer.add_items([box('p{}'.format(i), (30, 30, 20), rotations=[0]) for i in range(6)])
+    packer.pack()
+    assert packer.lower_bound == 3
+
+    packer.packed_items = packer.packed_items[:2]
+    assert packer.lower_bound == 1
@@ -0,0 +1,79 @@
+import random
+
+from py3dbp.bin import Bin
+from py3dbp.cache import PackCache
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+from py3dbp.validator import validate_bins
+
+SIZES = [(2 + i % 4, 3, 2 + i % 3) for i in range(40)]
+
+
+def order(prefix, seed=None, sizes=SIZES):
+    sizes = list(sizes)
+    if seed is not None:
+        random.Random(seed).shuffle(sizes)
+    packer = Packer()
+    packer.add_bins([Bin('{}-bin{}'.format(prefix, i), (12, 10, 8), 500) for i in range(2)])
+    packer.add_items([Item('{}-{}'.format(prefix, i), 'g', 'cube', whd, 1, 1, 100, True, 'red')
+                      for i, whd in enumerate(sizes)])
+    return packer
+
+
+def placements(packer):
+    return sorted((bin.width, (item.width, item.height, item.depth), [float(x) for x in item.position],
+                   item.rotation) for bin in packer.bins for item in bin.items)
+
+
+def test_a_hit_is_remapped_onto_the_new_items():
+    cache = PackCache()
+    first = order('a')
+    cache.pack(first, bigger_first=True)
+    assert cache.stats['misses'] == 1
+
+    # same order, other part numbers and another item order
+    second = order('b', seed=1)
+    given = list(second.items)
+    cache.pack(second, bigger_first=True)
+
+    assert cache.stats['hits'] == 1
+    assert cache.hit_rate == 0.5
+    placed = [item for bin in second.bins for item in bin.items]
+    # placements are copies of the given items, as after a fresh packing
+    assert {item.id for item in placed} <= {item.id for item in given}
+    assert all(item.partno.startswith('b-') for item in placed + second.unfit_items)
+    assert {bin.name for bin in second.bins} <= {'b-bin0', 'b-bin1'}
+    assert placements(second) == placements(first)
+    assert len(placed) + len(second.unfit_items) == len(given)
+    assert validate_bins(second.bins) == []
+
+
+def test_other_options_and_orders_miss():
+    cache = PackCache()
+    cache.pack(order('a'), bigger_first=True)
+    cache.pack(order('b'), bigger_first=False)
+    cache.pack(order('c', sizes=SIZES[1:]), bigger_first=True)
+    assert cache.stats == {'hits': 0, 'disk_hits': 0, 'misses': 3, 'evictions': 0, 'bypassed': 0}
+
+
+def test_time_limited_packings_bypass_the_cache():
+    cache = PackCache()
+    cache.pack(order('a'), time_limit=10)
+    cache.pack(order('b'), time_limit=10)
+    assert cache.stats['bypassed'] == 2
+    assert not cache.entries
+
+
+def test_eviction_and_disk_hits(tmp_path):
+    cache = PackCache(max_size=1, directory=str(tmp_path))
+    first = order('a')
+    cache.pack(first)
+    cache.pack(order('b', sizes=SIZES[1:]))
+    assert cache.stats['evictions'] == 1
+
+    # a fresh cache finds the evicted order on disk
+    other = PackCache(directory=str(tmp_path))
+    packer = order('c', seed=2)
+    other.pack(packer)
+    assert other.stats['disk_hits'] == 1
+    assert placements(packer) == placements(first)
@@ -0,0 +1,99 @@
+import random
+
+from py3dbp.bin import Bin
+from py3dbp.delta import take_out
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+from py3dbp.validator import validate_bins
+
+
+def box(partno, whd, weight=1):
+    return Item(partno, 'test', 'cube', whd, weight, 1, 100, True, 'red')
+
+
+def packed(seed=0, count=60):
+    rng = random.Random(seed)
+    packer = Packer()
+    packer.add_bins([Bin('b{}'.format(i), (30, 30, 30), 1000) for i in range(3)])
+    packer.add_items([box('p{}'.format(rng.randrange(8)), (rng.randint(4, 12), rng.randint(4, 12), rng.randint(4, 12)))
+                      for _ in range(count)])
+    packer.pack(bigger_first=True)
+    return packer
+
+
+def placements(packer):
+    return {item.id: (bin.name, tuple(item.position), item.rotation) for bin in packer.bins for item in bin.items}
+
+
+def ids(packer):
+    return sorted([item.id for bin in packer.bins for item in bin.items if item.group != 'corner'] +
+                  [item.id for item in packer.unfit_items], key=str)
+
+
+def test_remove_keeps_surviving_placements():
+    packer = packed()
+    before = placements(packer)
+    removed = packer.bins[0].items[-3:]
+    changed = packer.amend(removed=removed)
+
+    after = placements(packer)
+    assert validate_bins(packer.bins) == []
+    assert not {item.id for item in removed} & set(after)
+    # untouched bins are not packed again
+    for bin in packer.bins:
+        if bin not in changed:
+            assert {item.id: after[item.id] for item in bin.items} == {item.id: before[item.id] for item in bin.items}
+    # items placed before keep their placement unless they moved into the freed space
+    kept = [key for key in after if key in before and after[key] == before[key]]
+    assert len(kept) >= len(before) - len(removed) - len(packer.bins[0].items)
+
+
+def test_add_items():
+    packer = packed()
+    total = len(ids(packer))
+    added = [box('new{}'.format(i), (3, 3, 3)) for i in range(5)]
+    packer.amend(added=added)
+
+    assert validate_bins(packer.bins) == []
+    assert len(ids(packer)) == total + 5
+    assert {item.id for item in added} <= {item.id for bin in packer.bins for item in bin.items}
+
+
+def test_quantities():
+    packer = packed()
+    counts = {}
+    for item in [item for bin in packer.bins for item in bin.items] + packer.unfit_items:
+        counts[item.partno] = counts.get(item.partno, 0) + 1
+    partno = max(counts, key=counts.get)
+    other = min(counts, key=counts.get)
+    packer.amend(quantities={partno: 1, other: counts[other] + 2})
+
+    assert validate_bins(packer.bins) == []
+    after = {}
+    for item in [item for bin in packer.bins for item in bin.items] + packer.unfit_items:
+        after[item.partno] = after.get(item.partno, 0) + 1
+    assert after[partno] == 1
+    assert after[other] == counts[other] + 2
+
+
+def test_unfit_items_are_recorded_once():
+    packer = packed(count=120)
+    assert packer.unfit_items
+    packer.amend(added=[box('huge{}'.format(i), (29, 29, 29)) for i in range(3)], removed=packer.bins[1].items[:2])
+
+    listed = [item.id for bin in packer.bins for item in bin.unfitted_items]
+    assert not {item.id for item in packer.unfit_items if item.partno.startswith('huge')} & set(listed)
+
+
+def test_take_out_removes_what_loses_its_support():
+    bin = Bin('b', (10, 10, 10), 100)
+    bin.check_stable = True
+    bin.support_surface_ratio = 0.75
+    base, top, side = box('base', (10, 10, 4)), box('top', (6, 6, 3)), box('side', (2, 2, 2))
+    bin.load_items([base.placed_at([0, 0, 0], 0), top.placed_at([0, 0, 4], 0)])
+    assert validate_bins([bin]) == []
+
+    taken = take_out(bin, [base])
+    assert [item.partno for item in taken] == ['base', 'top']
+    assert bin.items == []
+    assert side.id not in {item.id for item in taken}
@@ -0,0 +1,22 @@
+import pytest
+
+from py3dbp.fleet import BinType, select_fleet
+from py3dbp.item import Item
+
+
+def order(count):
+    return [Item('c{}'.format(i), 'test', 'cube', (5, 5, 5), 1, 1, 100, True, 'red') for i in range(count)]
+
+
+def test_unavailable_type_is_never_used():
+    cheap = BinType('cheap', (10, 10, 10), 100, 1, count=0)
+    dear = BinType('dear', (10, 10, 10), 100, 5)
+    cost, packer = select_fleet(order(8), [cheap, dear], time_limit=5)
+
+    assert cost == 5
+    assert [bin.name for bin in packer.bins] == ['dear-1']
+
+
+def test_duplicate_type_names_are_rejected():
+    with pytest.raises(ValueError):
+        select_fleet(order(1), [BinType('box', (10, 10, 10), 100, 1), BinType('box', (20, 20, 20), 100, 2)])
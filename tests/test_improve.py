@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from py3dbp.bin import Bin
+from py3dbp.improve import ruin_and_recreate
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+from py3dbp.validator import validate_bins
+
+
+def packed(seed, count=80):
+    rng = random.Random(seed)
+    packer = Packer()
+    packer.add_bins([Bin('b{}'.format(i), (15, 12, 10), 1000) for i in range(2)])
+    packer.add_items([Item('p{}'.format(i), 'g', 'cube', (rng.randint(2, 6), rng.randint(2, 5), rng.randint(2, 5)),
+                           1, 1, 100, True, 'red') for i in range(count)])
+    packer.pack(bigger_first=True)
+    return packer
+
+
+def measures(packer):
+    return {bin.name: (len(bin.items), sum(float(item.get_volume()) for item in bin.items)) for bin in packer.bins}
+
+
+def check_accounted(packer, count=80):
+    ids = [item.id for bin in packer.bins for item in bin.items] + [item.id for item in packer.unfit_items]
+    assert len(set(ids)) == len(ids) == count
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_improve_never_packs_fewer_items(seed):
+    packer = packed(seed)
+    assert packer.unfit_items
+    before, unfit, violations = measures(packer), len(packer.unfit_items), len(validate_bins(packer.bins))
+
+    recovered = packer.improve(time_limit=None, max_iterations=10, seed=seed)
+
+    after = measures(packer)
+    assert recovered == unfit - len(packer.unfit_items) >= 0
+    assert all(after[name] >= before[name] for name in before)
+    assert len(validate_bins(packer.bins)) <= violations
+    check_accounted(packer)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_improve_by_volume_never_packs_less_volume(seed):
+    packer = packed(seed)
+    before = measures(packer)
+
+    packer.improve(time_limit=None, max_iterations=10, seed=seed, objective='volume')
+
+    after = measures(packer)
+    assert all((after[name][1], after[name][0]) >= (before[name][1], before[name][0]) for name in before)
+    check_accounted(packer)
+
+
+def test_improve_needs_a_limit_and_known_options():
+    packer = packed(0)
+    with pytest.raises(ValueError):
+        ruin_and_recreate(packer, time_limit=None)
+    with pytest.raises(ValueError):
+        ruin_and_recreate(packer, objective='weight')
+    with pytest.raises(ValueError):
+        ruin_and_recreate(packer, score='luck')
@@ -0,0 +1,85 @@
+import pytest
+
+from py3dbp.bin import Bin
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+
+
+def cube(partno, size):
+    return Item(partno, 'test', 'cube', (size, size, size), 1, 1, 100, True, 'red')
+
+
+@pytest.mark.parametrize('bin_selection', ['first', 'best'])
+def test_bin_selection_with_corners(bin_selection):
+    # the large item fails once the corners are in, the small one goes to the same bin
+    packer = Packer()
+    packer.add_bin(Bin('b0', (10, 10, 10), 100, 1))
+    packer.add_items([cube('large', 10), cube('small', 2)])
+    packer.pack(bigger_first=True, bin_selection=bin_selection)
+
+    placed = [item.partno for item in packer.bins[0].items if item.group != 'corner']
+    assert placed == ['small']
+    assert [item.partno for item in packer.unfit_items] == ['large']
+
+
+def test_iter_pack_skips_bins_for_oversized_items():
+    packer = Packer()
+    bins = [Bin('b{}'.format(i), (10, 10, 10), 100) for i in range(3)]
+    items = [cube('s1', 6), cube('x1', 12), cube('s2', 6), cube('x2', 12), cube('s3', 3), cube('x3', 12), cube('s4', 3)]
+    closed = list(packer.iter_pack(items, bins, max_open_bins=1))
+
+    assert [[item.partno for item in bin.items] for bin in closed] == [['s1'], ['s2', 's3', 's4']]
+    assert [item.partno for item in packer.unfit_items] == ['x1', 'x2', 'x3']
+
+
+class Clock:
+    """A monotonic clock moving one second every time it is read."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.mark.parametrize('bin_selection', ['sequential', 'best'])
+@pytest.mark.parametrize('deadline', [5, 20, 35])
+def test_time_limit_reports_items_not_tried_in_every_bin(monkeypatch, bin_selection, deadline):
+    monkeypatch.setattr('py3dbp.packer.time', Clock())
+    items = [cube('c{}'.format(i), 3 + i % 4) for i in range(40)]
+    packer = Packer()
+    packer.add_bins([Bin('b{}'.format(i), (10, 10, 10), 1000) for i in range(3)])
+    packer.add_items(items)
+    packer.pack(bigger_first=True, bin_selection=bin_selection, deadline=deadline)
+
+    assert packer.timed_out
+    placed = {item.id for bin in packer.bins for item in bin.items if item.group != 'corner'}
+    unfit = {item.id for item in packer.unfit_items}
+    not_attempted = {item.id for item in packer.not_attempted_items}
+    assert not placed & unfit
+    assert placed | unfit == {item.id for item in items}
+    assert not_attempted and not_attempted <= unfit
+    if bin_selection == 'sequential':
+        # an unfit item reported as attempted was tried, and failed, in every bin
+        for item in packer.unfit_items:
+            if item.id not in not_attempted:
+                assert all(item.id in {failed.id for failed in bin.unfitted_items} for bin in packer.bins)
+
+
+@pytest.mark.parametrize('deadline', [5, 20])
+def test_time_limit_without_distributing_items(monkeypatch, deadline):
+    monkeypatch.setattr('py3dbp.packer.time', Clock())
+    items = [cube('c{}'.format(i), 3 + i % 4) for i in range(40)]
+    packer = Packer()
+    packer.add_bins([Bin('b{}'.format(i), (10, 10, 10), 1000) for i in range(3)])
+    packer.add_items(items)
+    packer.pack(bigger_first=True, distribute_items=False, deadline=deadline)
+
+    assert packer.timed_out
+    placed = {item.id for bin in packer.bins for item in bin.items if item.group != 'corner'}
+    not_attempted = {item.id for item in packer.not_attempted_items}
+    assert placed and not_attempted
+    # an item placed in a bin before the deadline was attempted
+    assert not placed & not_attempted
+    assert placed | not_attempted == {item.id for item in items}
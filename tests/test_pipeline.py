@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from py3dbp.bin import Bin
+from py3dbp.item import Item
+from py3dbp.pipeline import assign_bins, pack_pipeline
+from py3dbp.validator import validate_bins
+
+
+def make_order(seed, count=150):
+    rng = random.Random(seed)
+    return [Item('i{}'.format(k), 'test', 'cube', (rng.randint(5, 25), rng.randint(5, 25), rng.randint(5, 25)),
+                 rng.randint(1, 5), 1, 100, True, 'red') for k in range(count)]
+
+
+def make_bins(count=12):
+    return [Bin('b{}'.format(j), (50, 40, 50), 1000) for j in range(count)]
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_pipeline_output_is_valid(seed):
+    items = make_order(seed)
+    packer = pack_pipeline(items, make_bins(), workers=0, bigger_first=True)
+
+    assert validate_bins(packer.bins) == []
+    ids = [item.id for bin in packer.bins for item in bin.items] + [item.id for item in packer.unfit_items]
+    assert sorted(ids) == sorted(item.id for item in items)
+
+
+def test_pipeline_in_worker_processes():
+    items = make_order(7, count=60)
+    packer = pack_pipeline(items, make_bins(6), workers=2, bigger_first=True)
+
+    assert validate_bins(packer.bins) == []
+    assert sum(len(bin.items) for bin in packer.bins) + len(packer.unfit_items) == len(items)
+
+
+def test_assign_bins_without_bins():
+    with pytest.raises(ValueError):
+        assign_bins(make_order(0, count=3), [])
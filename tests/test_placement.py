@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from py3dbp.bin import Bin
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+from py3dbp.placement import SCORES, best_placement
+from py3dbp.validator import validate_bins
+
+
+def make_packer(seed, count=50):
+    rng = random.Random(seed)
+    packer = Packer()
+    packer.add_bins([Bin('b{}'.format(i), (20, 15, 12), 300) for i in range(2)])
+    packer.add_items([Item('p{}'.format(i), 'g', 'cube', (rng.randint(2, 7), rng.randint(2, 6), rng.randint(2, 6)),
+                           rng.randint(1, 8), 1, 100, rng.random() < 0.8, 'red', stackable=rng.random() < 0.8)
+                      for i in range(count)])
+    return packer
+
+
+def check(packer, count=50):
+    assert validate_bins(packer.bins) == []
+    ids = [item.id for bin in packer.bins for item in bin.items] + [item.id for item in packer.unfit_items]
+    # every item is placed once or listed unfit
+    assert len(set(ids)) == len(ids) == count
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('score', sorted(SCORES))
+def test_best_placement_packs_valid_bins(seed, score):
+    packer = make_packer(seed)
+    packer.pack(bigger_first=True, placement='best', score=score)
+    check(packer)
+    assert any(bin.items for bin in packer.bins)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_beam_packs_valid_bins(seed):
+    packer = make_packer(seed)
+    packer.pack(bigger_first=True, beam_width=4)
+    check(packer)
+    assert any(bin.items for bin in packer.bins)
+
+
+def test_best_placement_without_room():
+    bin = Bin('b', (5, 5, 5), 100)
+    assert best_placement(bin, Item('big', 'g', 'cube', (6, 1, 1), 1, 1, 100, True, 'red')) is None
+
+
+def test_unknown_placement_options():
+    with pytest.raises(ValueError):
+        make_packer(0).pack(placement='last')
+    with pytest.raises(ValueError):
+        make_packer(0).pack(placement='best', score='luck')
@@ -0,0 +1,47 @@
+import numpy as np
+
+from py3dbp.bin import Bin
+from py3dbp.cache import PackCache
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+from py3dbp.results import PackingResult
+
+
+def make_packer(items):
+    packer = Packer()
+    packer.add_bins([Bin('b0', (10, 10, 10), 100, 1), Bin('b1', (8, 8, 8), 100)])
+    packer.add_items(items)
+    return packer
+
+
+def order():
+    return [Item('p{}'.format(i), 'test', 'cube', (1 + i % 5, 2, 3), 1, 1, 100, True, 'red') for i in range(30)]
+
+
+def check_item_column(packer, items):
+    result = PackingResult.from_packer(packer)
+    placed = [item for bin in packer.bins for item in bin.items]
+    column = result.column('item')
+    for row, item in zip(column, placed):
+        if item.group == 'corner':
+            assert row == -1
+        else:
+            assert items[row].id == item.id
+    assert len(set(column[column >= 0].tolist())) == np.count_nonzero(column >= 0)
+
+
+def test_item_column_indexes_the_order():
+    items = order()
+    packer = make_packer(items)
+    packer.pack(bigger_first=True)
+    check_item_column(packer, items)
+
+
+def test_item_column_after_cache_hit():
+    cache = PackCache()
+    cache.pack(make_packer(order()))
+    items = order()
+    packer = make_packer(items)
+    cache.pack(packer)
+    assert cache.stats['hits'] == 1
+    check_item_column(packer, items)
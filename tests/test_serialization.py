@@ -0,0 +1,94 @@
+import json
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from py3dbp import serialization
+from py3dbp.bin import Bin
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+from py3dbp.serialization import from_bytes, from_json, to_bytes, to_json
+from py3dbp.validator import validate_bins
+
+
+def packed(count=30):
+    packer = Packer()
+    packer.add_bins([Bin('b0', (10, 10, 10), 100, 1), Bin('b1', (6, 6, 6), 50)])
+    packer.add_items([Item('p{}'.format(i), 'g{}'.format(i % 2), 'cube', (2 + i % 3, 3, 4), 1 + i, i % 3, 100 + i,
+                           i % 2 == 0, 'red', stackable=i % 4 != 0) for i in range(count)])
+    packer.pack(bigger_first=True)
+    return packer
+
+
+def describe(item):
+    return (item.id, item.partno, item.group, item.type, item.color, (item.width, item.height, item.depth),
+            item.weight, item.priority, item.loadbear, type(item.loadbear), item.upsidedown, item.stackable,
+            list(item.rotations), [float(x) for x in item.position], item.rotation)
+
+
+def check_round_trip(packer, bins, unfit):
+    assert [bin.name for bin in bins] == [bin.name for bin in packer.bins]
+    for loaded, original in zip(bins, packer.bins):
+        assert [describe(item) for item in loaded.items] == [describe(item) for item in original.items]
+        assert [item.id for item in loaded.unfitted_items] == [item.id for item in original.unfitted_items]
+        assert np.array_equal(loaded.fit_items, original.fit_items)
+        assert loaded.get_total_weight() == original.get_total_weight()
+    assert [describe(item) for item in unfit] == [describe(item) for item in packer.unfit_items]
+
+
+def test_json_round_trip():
+    packer = packed()
+    check_round_trip(packer, *from_json(to_json(packer.bins, packer.unfit_items)))
+
+
+def test_binary_round_trip():
+    packer = packed()
+    bins, unfit = from_bytes(to_bytes(packer.bins, packer.unfit_items))
+    check_round_trip(packer, bins, unfit)
+    assert all(isinstance(item.loadbear, int) for bin in bins for item in bin.items)
+
+
+@pytest.mark.parametrize('dump, load', [(to_json, from_json), (to_bytes, from_bytes)])
+def test_packing_continues_in_a_loaded_bin(dump, load):
+    packer = packed(count=6)
+    bins, _ = load(dump(packer.bins, []))
+    before = {bin.name: [item.id for item in bin.items] for bin in bins}
+
+    more = Packer()
+    more.add_bins(bins)
+    more.add_items([Item('extra{}'.format(i), 'g', 'cube', (1, 1, 1), 0.5, 1, 100, True, 'blue') for i in range(10)])
+    more.pack()
+
+    assert validate_bins(more.bins) == []
+    for bin in more.bins:
+        # the loaded placements stay, the new items go around them
+        assert [item.id for item in bin.items][:len(before[bin.name])] == before[bin.name]
+    assert sum(item.partno.startswith('extra') for bin in more.bins for item in bin.items) == 10
+
+
+def test_unknown_versions_are_rejected():
+    packer = packed()
+    data = json.loads(to_json(packer.bins, packer.unfit_items))
+    data['version'] = 99
+    with pytest.raises(ValueError):
+        from_json(json.dumps(data))
+
+    binary = to_bytes(packer.bins, packer.unfit_items)
+    with pytest.raises(ValueError):
+        from_bytes(binary[:4] + struct.pack('<H', 99) + binary[6:])
+    with pytest.raises(ValueError):
+        from_bytes(b'XXXX' + binary[4:])
+
+
+def test_binary_version_1_is_still_read():
+    packer = packed()
+    binary = to_bytes(packer.bins, packer.unfit_items)
+    _, _, size = struct.unpack_from('<4sHI', binary)
+    start = struct.calcsize('<4sHI') + size
+    table = np.frombuffer(zlib.decompress(binary[start:]), dtype=serialization.ITEM_COLUMNS)
+    old = table.astype(serialization._BINARY_COLUMNS[1])
+    legacy = binary[:4] + struct.pack('<H', 1) + binary[6:start] + zlib.compress(old.tobytes())
+
+    check_round_trip(packer, *from_bytes(legacy))
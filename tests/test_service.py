@@ -0,0 +1,103 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from py3dbp.service import PackService
+
+BINS = [{'name': 'box', 'whd': [10, 10, 10], 'max_weight': 99}]
+
+
+def order(id, count=3):
+    return {'id': id, 'bins': BINS, 'items': [{'partno': 'p{}'.format(i), 'whd': [2, 2, 2], 'weight': 1}
+                                              for i in range(count)]}
+
+
+def post(url, body, timeout=None):
+    path = '/pack' if timeout is None else '/pack?timeout={}'.format(timeout)
+    request = urllib.request.Request(url + path, data=json.dumps(body).encode(), method='POST')
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+@pytest.fixture(scope='module')
+def service():
+    # a long batch wait puts concurrent requests in the same micro-batch
+    with PackService(port=0, workers=1, batch_wait=0.2) as service:
+        yield service
+
+
+def test_bad_orders_are_rejected_before_batching(service):
+    for body in ([1, 2], 'order', {'id': 'x'}, {'id': 'y', 'bins': BINS, 'items': 'p1'}):
+        status, result = post(service.url, body)
+        assert status == 400
+        assert 'error' in result
+
+
+def test_failing_order_does_not_fail_its_batch(service):
+    bad = dict(order('bad'), items=[{'partno': 'p1'}])
+    with ThreadPoolExecutor(3) as pool:
+        replies = list(pool.map(lambda body: post(service.url, body), [order('a'), bad, order('b')]))
+    assert [status for status, _ in replies] == [200, 422, 200]
+    assert [result['id'] for _, result in replies] == ['a', 'bad', 'b']
+
+
+def test_failed_batch_is_packed_again_order_by_order(service):
+    failed = Future()
+    failed.set_exception(MemoryError('worker call failed'))
+    batch = [(order('a'), Future()), (order('b'), Future())]
+    for _, future in batch:
+        future.set_running_or_notify_cancel()
+    service._deliver(batch, failed, release=False)
+    assert [future.result(30)['id'] for _, future in batch] == ['a', 'b']
+
+
+def test_health(service):
+    with urllib.request.urlopen(service.url + '/health', timeout=30) as response:
+        health = json.load(response)
+    assert response.status == 200
+    assert health['status'] == 'ok'
+    assert health['workers'] == 1
+    assert {'accepted', 'rejected', 'timed_out', 'batches', 'queued', 'max_queue'} <= set(health)
+
+
+def test_concurrent_orders(service):
+    orders = [order('o{}'.format(i), count=i + 1) for i in range(6)]
+    with ThreadPoolExecutor(len(orders)) as pool:
+        replies = list(pool.map(lambda body: post(service.url, body), orders))
+    for (status, result), sent in zip(replies, orders):
+        assert status == 200
+        assert result['id'] == sent['id']
+        assert len(result['bins'][0]['items']) == len(sent['items'])
+        assert result['unfit_items'] == []
+
+
+def test_timeout_and_back_pressure():
+    # without a dispatcher the queued request is never packed: it times out and keeps the only queue slot
+    service = PackService(port=0, workers=1, max_queue=1)
+    thread = threading.Thread(target=service.server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        status, result = post(service.url, order('slow'), timeout=0.2)
+        assert status == 504
+        assert 'timed out' in result['error']
+
+        request = urllib.request.Request(service.url + '/pack', data=json.dumps(order('full')).encode(),
+                                         method='POST')
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request, timeout=30)
+        assert error.value.code == 503
+        assert error.value.headers['Retry-After'] == '1'
+
+        health = service.health()
+        assert (health['accepted'], health['rejected'], health['timed_out']) == (1, 1, 1)
+    finally:
+        service.server.shutdown()
+        service.server.server_close()
+        thread.join()
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from py3dbp.bin import Bin
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+from py3dbp.session import PackSession
+
+
+def make_order(seed, count=40):
+    rng = random.Random(seed)
+    return [Item('p{}'.format(rng.randrange(6)), 'test', 'cube',
+                 (rng.randint(1, 6), rng.randint(1, 6), rng.randint(1, 6)), rng.randint(1, 5), 1, 100, True, 'red')
+            for _ in range(count)]
+
+
+def make_bins():
+    return [Bin('b0', (12, 12, 12), 500), Bin('b1', (10, 10, 10), 300, 1)]
+
+
+def placements(packer):
+    return [[(item.partno, tuple(item.position), item.rotation) for item in bin.items] for bin in packer.bins]
+
+
+@pytest.mark.parametrize('pivot_restart', [False, True])
+def test_reused_session_matches_fresh_packer(pivot_restart):
+    session = PackSession(make_bins(), pivot_restart=pivot_restart)
+    for seed in range(4):
+        order = make_order(seed)
+        reused = placements(session.solve(order))
+
+        packer = Packer()
+        packer.add_bins(make_bins())
+        packer.add_items(order)
+        packer.pack(pivot_restart=pivot_restart)
+        assert reused == placements(packer)
+
+
+def test_reset_clears_search_caches():
+    session = PackSession(make_bins(), pivot_restart=True)
+    session.solve(make_order(0, count=80))
+    session.reset()
+    for bin in session.bins:
+        assert not bin.failed_searches
+        assert not bin.last_pivots
@@ -0,0 +1,91 @@
+import numpy as np
+
+from py3dbp.bin import Bin
+from py3dbp.item import Item
+from py3dbp.packer import Packer
+from py3dbp.validator import Violation, candidate_pairs, validate_bin, validate_bins
+
+
+def box(partno, whd, position, weight=1, stackable=True):
+    item = Item(partno, 'test', 'cube', whd, weight, 1, 100, True, 'red', stackable=stackable)
+    item.position = list(position)
+    return item
+
+
+def loaded(items, whd=(10, 10, 10), max_weight=100):
+    bin = Bin('b', whd, max_weight)
+    bin.items = items
+    return bin
+
+
+def kinds(violations):
+    return sorted((v.kind, tuple(item.partno for item in v.items)) for v in violations)
+
+
+def test_a_valid_packing_has_no_violations():
+    bin = loaded([box('a', (5, 5, 5), (0, 0, 0)), box('b', (5, 5, 5), (5, 0, 0)), box('c', (5, 5, 5), (0, 0, 5))])
+    assert validate_bin(bin, check_stable=True, support_surface_ratio=0.75) == []
+
+
+def test_overlap():
+    bin = loaded([box('a', (5, 5, 5), (0, 0, 0)), box('b', (5, 5, 5), (4, 4, 4)), box('c', (1, 1, 1), (9, 9, 9))])
+    assert kinds(validate_bin(bin)) == [(Violation.OVERLAP, ('a', 'b'))]
+
+
+def test_touching_faces_do_not_overlap():
+    bin = loaded([box('a', (2.5, 5, 5), (0, 0, 0)), box('b', (2.5, 5, 5), (2.5, 0, 0))])
+    assert validate_bin(bin) == []
+
+
+def test_bounds():
+    bin = loaded([box('a', (5, 5, 5), (6, 0, 0)), box('b', (5, 5, 5), (0, -1, 0)), box('c', (5, 5, 5), (0, 5, 5))])
+    assert kinds(validate_bin(bin)) == [(Violation.BOUNDS, ('a',)), (Violation.BOUNDS, ('b',))]
+
+
+def test_weight_is_summed_from_the_items():
+    bin = loaded([box('a', (2, 2, 2), (0, 0, 0), weight=60), box('b', (2, 2, 2), (2, 0, 0), weight=50)])
+    # the running total drifting below the limit must not hide the excess
+    bin.total_weight = 0
+    assert kinds(validate_bin(bin)) == [(Violation.WEIGHT, ())]
+
+
+def test_stackable():
+    bin = loaded([box('a', (5, 5, 5), (0, 0, 0), stackable=False), box('b', (5, 5, 5), (0, 5, 0))])
+    assert kinds(validate_bin(bin)) == [(Violation.STACKABLE, ('a', 'b'))]
+
+
+def test_support():
+    floating = box('b', (4, 4, 4), (0, 0, 6))
+    partial = box('c', (4, 4, 4), (6, 0, 4))
+    bin = loaded([box('a', (8, 8, 4), (0, 0, 0)), floating, partial])
+    assert kinds(validate_bin(bin, check_stable=True, support_surface_ratio=0.75)) == \
+        [(Violation.SUPPORT, ('b',)), (Violation.SUPPORT, ('c',))]
+    # half of c rests on a, enough for a lower ratio; b still floats
+    assert kinds(validate_bin(bin, check_stable=True, support_surface_ratio=0.5)) == [(Violation.SUPPORT, ('b',))]
+    # support is only checked when asked for
+    assert validate_bin(bin) == []
+
+
+def test_candidate_pairs_match_brute_force():
+    rng = np.random.default_rng(3)
+    lo = rng.integers(0, 40, (200, 3)).astype(float)
+    hi = lo + rng.integers(1, 8, (200, 3))
+    # a few large boxes take the direct path
+    hi[:3] = lo[:3] + 30
+
+    touching = np.all((lo[:, None] <= hi[None]) & (lo[None] <= hi[:, None]), axis=2)
+    expected = {(i, j) for i, j in zip(*np.nonzero(np.triu(touching, 1)))}
+    pairs = candidate_pairs(lo, hi)
+    found = {(int(i), int(j)) for i, j in pairs}
+
+    assert len(found) == len(pairs)
+    assert expected <= found
+
+
+def test_packer_output_is_valid():
+    packer = Packer()
+    packer.add_bins([Bin('b{}'.format(i), (20, 15, 10), 500) for i in range(2)])
+    packer.add_items([Item('p{}'.format(i), 'g', 'cube', (2 + i % 4, 3, 2 + i % 3), 1, 1, 100, True, 'red')
+                      for i in range(60)])
+    packer.pack(bigger_first=True, fix_point=True, check_stable=True, support_surface_ratio=0.75)
+    assert validate_bins(packer.bins) == []